@@ -0,0 +1,286 @@
+"""
+Benchmark of calibrations.
+
+Compares the batched `OnePort.run`, and `EightTerm.apply_cal` and `embed`
+with the former loops over the frequency points, which solved one small
+linear system at a time, and the bulk correction of many DUTs with a loop
+of `apply_cal`. The batched `NISTMultilineTRL.run` is timed alone, and
+against loading its results from a `CalibrationCache`. The incremental
+updates of a `OnePort` calibration are compared with running it again,
+and the streaming statistics of a `CalibrationSet` with the statistics
+of the stored corrected Networks.
+
+Run with::
+
+    python benchmarks/bench_calibration.py [n_freqs] [n_duts]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from copy import copy
+from itertools import product
+
+import numpy as npy
+
+import skrf as rf
+from skrf.media import CPW
+from skrf.calibration.calibrationSet import Cartesian
+
+
+def apply_cal_loop(cal, ntwk):
+    caled = ntwk.copy()
+    inv = npy.linalg.inv
+    T1, T2, T3, T4 = cal.T_matrices
+    ntwk = ntwk.copy()
+    ntwk.s[:, 1, 0] -= cal.coefs['forward isolation']
+    ntwk.s[:, 0, 1] -= cal.coefs['reverse isolation']
+    ntwk = cal.unterminate(ntwk)
+    for f in range(len(ntwk.s)):
+        t1, t2, t3, t4, m = T1[f], T2[f], T3[f], T4[f], ntwk.s[f]
+        caled.s[f] = inv(-1*m.dot(t3)+t1).dot(m.dot(t4)-t2)
+    return caled
+
+
+def embed_loop(cal, ntwk):
+    embedded = ntwk.copy()
+    inv = npy.linalg.inv
+    T1, T2, T3, T4 = cal.T_matrices
+    for f in range(len(ntwk.s)):
+        t1, t2, t3, t4, a = T1[f], T2[f], T3[f], T4[f], ntwk.s[f]
+        embedded.s[f] = (t1.dot(a)+t2).dot(inv(t3.dot(a)+t4))
+    embedded = cal.terminate(embedded)
+    embedded.s[:, 1, 0] += cal.coefs['forward isolation']
+    embedded.s[:, 0, 1] += cal.coefs['reverse isolation']
+    return embedded
+
+
+def one_port_run_loop(cal):
+    n_stds = cal.nstandards
+    m_list = [cal.measured[k].s.reshape(-1) for k in range(n_stds)]
+    i_list = [cal.ideals[k].s.reshape(-1) for k in range(n_stds)]
+    abc = npy.zeros((len(m_list[0]), 3), dtype=complex)
+    for f in range(len(m_list[0])):
+        m = npy.array([m_list[k][f] for k in range(n_stds)]).reshape(-1, 1)
+        i = npy.array([i_list[k][f] for k in range(n_stds)]).reshape(-1, 1)
+        Q = npy.hstack([i, npy.ones((n_stds, 1)), i*m])
+        abc_f, residuals_f = npy.linalg.lstsq(Q, m, rcond=None)[0:2]
+        if n_stds > 3:
+            npy.linalg.inv(npy.dot(Q.T, Q))
+        abc[f] = abc_f.flatten()
+    return abc
+
+
+def bench_one_port(n_freqs):
+    wg = rf.RectangularWaveguide(rf.F(75, 100, n_freqs), a=100*rf.mil, z0=50)
+    E = wg.random(n_ports=2, name='E')
+    ideals = [wg.short(name='short'), wg.delay_short(45., 'deg', name='ew'),
+              wg.delay_short(90., 'deg', name='qw'), wg.match(name='load')]
+    cal = rf.OnePort(ideals=ideals, measured=[E ** k for k in ideals])
+
+    t_ref = min(timeit.repeat(lambda: one_port_run_loop(cal), number=1, repeat=3))
+    t = min(timeit.repeat(cal.run, number=1, repeat=3))
+    error = npy.max(npy.abs(one_port_run_loop(cal)[:, 1] - cal.coefs['directivity']))
+    print('OnePort calibration, 4 standards, %i points' % n_freqs)
+    print('    %-10s loop %8.4f s  batched %8.4f s  (x%.0f, max difference %.1e)'
+          % ('run', t_ref, t, t_ref / t, error))
+
+
+def eight_term_cal(n_freqs):
+    wg = rf.RectangularWaveguide(rf.F(75, 100, n_freqs), a=100*rf.mil, z0=50)
+    X = wg.random(n_ports=2, name='X')
+    Y = wg.random(n_ports=2, name='Y')
+    gamma_f = wg.random(n_ports=1, name='gamma_f')
+    gamma_r = wg.random(n_ports=1, name='gamma_r')
+
+    def measure(ntwk):
+        out = rf.terminate(X ** ntwk ** Y, gamma_f, gamma_r)
+        out.name = ntwk.name
+        return out
+
+    ideals = [wg.short(nports=2, name='short'), wg.open(nports=2, name='open'),
+              wg.match(nports=2, name='load'), wg.thru(name='thru')]
+    cal = rf.EightTerm(ideals=ideals, measured=[measure(k) for k in ideals],
+                       switch_terms=(gamma_f, gamma_r))
+    cal.run()
+    return cal, wg, measure
+
+
+def bench_eight_term(n_freqs):
+    cal, wg, measure = eight_term_cal(n_freqs)
+    dut = wg.random(n_ports=2, name='dut')
+    meas = measure(dut)
+
+    print('EightTerm calibration, %i points' % n_freqs)
+    for label, func, ref in [
+            ('apply_cal', lambda: cal.apply_cal(meas), lambda: apply_cal_loop(cal, meas)),
+            ('embed', lambda: cal.embed(dut), lambda: embed_loop(cal, dut)),
+            ]:
+        t_ref = min(timeit.repeat(ref, number=1, repeat=3))
+        t = min(timeit.repeat(func, number=1, repeat=3))
+        error = npy.max(npy.abs(func().s - ref().s))
+        print('    %-10s loop %8.4f s  batched %8.4f s  (x%.0f, max difference %.1e)'
+              % (label, t_ref, t, t_ref / t, error))
+
+
+def bench_bulk(n_freqs, n_duts):
+    cal, wg, measure = eight_term_cal(n_freqs)
+    ns = rf.NetworkSet([measure(wg.random(n_ports=2, name='dut%i' % k))
+                        for k in range(n_duts)])
+    s = npy.array([ntwk.s for ntwk in ns])
+
+    print('EightTerm calibration of %i DUTs, %i points' % (n_duts, n_freqs))
+    t_ref = min(timeit.repeat(lambda: [cal.apply_cal(k) for k in ns],
+                              number=1, repeat=3))
+    for label, func in [
+            ('network set', lambda: cal.apply_cal_to_network_set(ns)),
+            ('array', lambda: cal.apply_cal_to_array(s)),
+            ('array, no chunks', lambda: cal.apply_cal_to_array(s, chunk_size=len(s))),
+            ]:
+        t = min(timeit.repeat(func, number=1, repeat=3))
+        print('    %-20s loop of apply_cal %8.4f s  bulk %8.4f s  (x%.1f)'
+              % (label, t_ref, t, t_ref / t))
+
+
+def bench_multiline(n_freqs, n_lines=6):
+    freq = rf.F(1, 100, n_freqs, 'GHz')
+    cpw = CPW(freq, w=40e-6, s=25e-6, ep_r=12.9, t=5e-6, rho=2e-8)
+    wg = rf.RectangularWaveguide(freq, a=100*rf.mil, z0=50)
+    X = wg.random(n_ports=2, name='X')
+    Y = wg.random(n_ports=2, name='Y')
+    l = [0, 100e-6, 200e-6, 500e-6, 900e-6, 1500e-6, 2500e-6, 4000e-6][:n_lines]
+    actuals = [cpw.line(l[0], 'm'), rf.two_port_reflect(cpw.short(), cpw.short())] + \
+              [cpw.line(k, 'm') for k in l[1:]]
+    measured = [X ** k ** Y for k in actuals]
+    cal = rf.NISTMultilineTRL(measured=measured, Grefls=[-1], l=l, er_est=7)
+    t = min(timeit.repeat(cal.run, number=1, repeat=3))
+    print('NISTMultilineTRL calibration, %i lines, %i points' % (n_lines, n_freqs))
+    print('    %-10s %8.4f s' % ('run', t))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = rf.CalibrationCache(cache_dir)
+
+        def cached_run():
+            cal = rf.NISTMultilineTRL(measured=measured, Grefls=[-1], l=l, er_est=7)
+            cal.coefs_cache = cache
+            cal.run()
+        cached_run()
+        t_cache = min(timeit.repeat(cached_run, number=1, repeat=3))
+    print('    %-10s %8.4f s  (x%.0f)' % ('cached', t_cache, t / t_cache))
+
+
+def remove_and_cal_rerun(cal, std):
+    measured, ideals = copy(cal.measured), copy(cal.ideals)
+    i, m = cal.pop(std)
+    cal.run()
+    c = cal.apply_cal(m)
+    cal.measured = measured
+    cal.ideals = ideals
+    cal.run()
+    return c, i
+
+
+def bench_incremental(n_freqs, n_repeats=5):
+    wg = rf.RectangularWaveguide(rf.F(75, 100, n_freqs), a=100*rf.mil, z0=50)
+    E = wg.random(n_ports=2, name='E')
+    ideals = [wg.short(name='short'), wg.delay_short(45., 'deg', name='ew'),
+              wg.delay_short(90., 'deg', name='qw'), wg.match(name='load')]
+
+    def measure(ntwk):
+        out = wg.random(n_ports=1, name=ntwk.name)
+        out.s = 1e-3*out.s + (E ** ntwk).s
+        return out
+
+    cal = rf.OnePort(ideals=ideals, measured=[measure(k) for k in ideals])
+    cal.run()
+    load = measure(ideals[-1])
+
+    def rebuild():
+        rf.OnePort(ideals=ideals, measured=cal.measured[:-1] + [load]).run()
+
+    print('OnePort calibration, 4 standards, %i points' % n_freqs)
+    for label, func, ref in [
+            ('update_measured', lambda: copy(cal).update_measured(-1, load), rebuild),
+            ('remove_and_cal', lambda: cal.remove_and_cal(1),
+             lambda: remove_and_cal_rerun(cal, 1)),
+            ]:
+        t_ref = min(timeit.repeat(ref, number=1, repeat=3))
+        t = min(timeit.repeat(func, number=1, repeat=3))
+        print('    %-16s run again %8.4f s  incremental %8.4f s  (x%.0f)'
+              % (label, t_ref, t, t_ref / t))
+
+    measured_sets = [rf.NetworkSet([measure(k) for l in range(n_repeats)])
+                     for k in ideals]
+
+    def run_all():
+        for measured in product(*[list(k) for k in measured_sets]):
+            rf.OnePort(ideals=ideals, measured=measured).run()
+    t_ref = min(timeit.repeat(run_all, number=1, repeat=1))
+    t = min(timeit.repeat(lambda: Cartesian(rf.OnePort, ideals, measured_sets),
+                          number=1, repeat=1))
+    print('    %-16s run again %8.4f s  incremental %8.4f s  (x%.0f)'
+          % ('%i calibrations' % n_repeats**len(ideals), t_ref, t, t_ref / t))
+
+
+def bench_calibration_set(n_freqs, n_repeats=5):
+    wg = rf.RectangularWaveguide(rf.F(75, 100, n_freqs), a=100*rf.mil, z0=50)
+    E = wg.random(n_ports=2, name='E')
+    ideals = [wg.short(name='short'), wg.delay_short(45., 'deg', name='ew'),
+              wg.delay_short(90., 'deg', name='qw'), wg.match(name='load')]
+
+    def measure(ntwk):
+        out = wg.random(n_ports=1, name=ntwk.name)
+        out.s = 1e-3*out.s + (E ** ntwk).s
+        return out
+
+    measured_sets = [rf.NetworkSet([measure(k) for l in range(n_repeats)])
+                     for k in ideals]
+    dut = measure(wg.random(n_ports=1))
+
+    def stored():
+        ns = Cartesian(rf.OnePort, ideals, measured_sets).apply_cal(dut)
+        return ns.mean_s, ns.std_s
+
+    def streamed(workers):
+        calset = Cartesian(rf.OnePort, ideals, measured_sets, lazy=True)
+        stats = calset.apply_cal_statistics(dut, workers=workers,
+                                            properties=['s'])
+        return stats.mean_s, stats.std_s
+
+    print('Cartesian CalibrationSet of %i OnePort calibrations, %i points'
+          % (n_repeats**len(ideals), n_freqs))
+    t_ref = min(timeit.repeat(stored, number=1, repeat=1))
+    for workers in sorted({1, os.cpu_count() or 1}):
+        t = min(timeit.repeat(lambda: streamed(workers), number=1, repeat=1))
+        print('    %-16s stored %8.4f s  streamed %8.4f s  (x%.1f)'
+              % ('%i workers' % workers, t_ref, t, t_ref / t))
+
+
+def bench_monte_carlo(n_freqs, n_trials=1000):
+    cal, wg, measure = eight_term_cal(n_freqs)
+    dut = measure(wg.random(n_ports=2, name='dut'))
+    kwargs = dict(noise=(1e-3, .1), repeatability=(1e-2, 1.), duts=[dut],
+                  seed=0, properties=['s', 's_mag', 's_deg'])
+
+    print('EightTerm Monte-Carlo of %i trials, %i points' % (n_trials, n_freqs))
+    t_ref = min(timeit.repeat(lambda: cal.monte_carlo(n_trials, chunk_size=1,
+                                                      **kwargs),
+                              number=1, repeat=1))
+    t = min(timeit.repeat(lambda: cal.monte_carlo(n_trials, **kwargs),
+                          number=1, repeat=1))
+    print('    %-10s loop %8.4f s  batched %8.4f s  (x%.0f)'
+          % ('trials', t_ref, t, t_ref / t))
+
+
+def main(n_freqs=20001, n_duts=100):
+    bench_one_port(n_freqs)
+    bench_eight_term(n_freqs)
+    bench_bulk(n_freqs // 10, n_duts)
+    bench_multiline(n_freqs // 2)
+    bench_incremental(n_freqs // 20)
+    bench_calibration_set(n_freqs // 20)
+    bench_monte_carlo(n_freqs // 200)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,159 @@
+"""
+Benchmarks of the Circuit solver.
+
+Times the assembly of the intersection matrix [X] of a chain of
+transmission lines, and the computation of the resulting Network, for
+a large number of frequency points, and the external s-parameters,
+voltages and currents of the same circuit, with and without the cache of
+the solved matrices, and a sweep of the length of one of the lines,
+solved as a batch or by building a Circuit for each length. Finally,
+a ladder of series resistors and shunt capacitors is solved with the
+dense and the sparse solvers, and a wideband circuit is evaluated at once
+and by chunks of frequency points, with one or several threads.
+
+Run with::
+
+    python benchmarks/bench_circuit.py [n_freqs] [n_lines]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+import skrf as rf
+
+
+def line_chain(n_freqs, n_lines):
+    freq = rf.Frequency(1, 10, n_freqs, 'GHz')
+    line = rf.media.DefinedGammaZ0(frequency=freq, z0=50)
+    ntwks = [line.line(10 + k, unit='deg', name='line%i' % k)
+             for k in range(n_lines)]
+    port1 = rf.Circuit.Port(freq, name='port1')
+    port2 = rf.Circuit.Port(freq, name='port2')
+    connections = [[(port1, 0), (ntwks[0], 0)]]
+    for k in range(n_lines - 1):
+        connections.append([(ntwks[k], 1), (ntwks[k + 1], 0)])
+    connections.append([(ntwks[-1], 1), (port2, 0)])
+    return rf.Circuit(connections), ntwks
+
+
+def bench_X(n_freqs, n_lines):
+    circuit, ntwks = line_chain(n_freqs, n_lines)
+    # each access is solved again
+    circuit.use_cache = False
+    print('Circuit of %i lines, %i points' % (n_lines, n_freqs))
+    for label, func in [('X', lambda: circuit.X),
+                        ('network', lambda: circuit.network)]:
+        t = min(timeit.repeat(func, number=1, repeat=3))
+        print('    %-10s %8.4f s' % (label, t))
+
+
+def quantities(circuit, power, phase):
+    circuit.s_external
+    circuit.voltages(power, phase)
+    circuit.currents(power, phase)
+    circuit.voltages_external(power, phase)
+    circuit.currents_external(power, phase)
+
+
+def bench_cache(n_freqs, n_lines):
+    power, phase = [1, 0], [0, 0]
+    print('s_external, voltages and currents of %i lines, %i points'
+          % (n_lines, n_freqs))
+    for use_cache in [False, True]:
+        def run():
+            circuit, ntwks = line_chain(n_freqs, n_lines)
+            circuit.use_cache = use_cache
+            quantities(circuit, power, phase)
+        t = min(timeit.repeat(run, number=1, repeat=3))
+        print('    %-10s %8.4f s' % ('cached' if use_cache else 'uncached', t))
+
+
+def bench_sweep(n_freqs, n_lines, n_variants):
+    circuit, ntwks = line_chain(n_freqs, n_lines)
+    line = rf.media.DefinedGammaZ0(frequency=circuit.frequency, z0=50)
+    variants = [line.line(k, unit='deg', name='line0') for k in range(n_variants)]
+
+    def rebuild():
+        out = []
+        for variant in variants:
+            connections = [[(variant if ntw is ntwks[0] else ntw, port)
+                            for (ntw, port) in cnx] for cnx in circuit.connections]
+            out.append(rf.Circuit(connections).network)
+        return out
+
+    print('Sweep of %i variants of %i lines, %i points'
+          % (n_variants, n_lines, n_freqs))
+    t_ref = min(timeit.repeat(rebuild, number=1, repeat=3))
+    t = min(timeit.repeat(lambda: circuit.sweep({'line0': variants}),
+                          number=1, repeat=3))
+    print('    %-10s loop %8.4f s  batched %8.4f s  (x%.1f)'
+          % ('sweep', t_ref, t, t_ref / t))
+
+
+def ladder(n_freqs, n_elements):
+    freq = rf.Frequency(1, 10, n_freqs, 'GHz')
+    media = rf.media.DefinedGammaZ0(frequency=freq, z0=50)
+    ntwks = []
+    for k in range(n_elements):
+        if k % 2:
+            ntwk = media.shunt_capacitor(1e-13)
+        else:
+            ntwk = media.resistor(1)
+        ntwk.name = 'element%i' % k
+        ntwks.append(ntwk)
+    port1 = rf.Circuit.Port(freq, name='port1')
+    port2 = rf.Circuit.Port(freq, name='port2')
+    connections = [[(port1, 0), (ntwks[0], 0)]]
+    for k in range(n_elements - 1):
+        connections.append([(ntwks[k], 1), (ntwks[k + 1], 0)])
+    connections.append([(ntwks[-1], 1), (port2, 0)])
+    return rf.Circuit(connections)
+
+
+def bench_sparse(n_freqs, n_elements):
+    circuit = ladder(n_freqs, n_elements)
+    circuit.use_cache = False
+    print('Ladder of %i elements (dim %i), %i points'
+          % (n_elements, circuit.dim, n_freqs))
+    times = {}
+    for solver in ['dense', 'sparse']:
+        circuit.solver = solver
+        times[solver] = min(timeit.repeat(lambda: circuit.s_external,
+                                          number=1, repeat=1))
+    circuit.solver = 'dense'
+    s = circuit.s_external
+    circuit.solver = 'sparse'
+    error = abs(circuit.s_external - s).max()
+    print('    %-10s dense %8.4f s  sparse %8.4f s  (x%.0f, max difference %.1e)'
+          % ('s_external', times['dense'], times['sparse'],
+             times['dense'] / times['sparse'], error))
+
+
+def bench_chunks(n_freqs, n_lines, chunk_size=4096):
+    circuit, ntwks = line_chain(n_freqs, n_lines)
+    circuit.use_cache = False
+    print('Network of %i lines, %i points' % (n_lines, n_freqs))
+    for (size, workers) in [(None, 1), (chunk_size, 1),
+                            (chunk_size, os.cpu_count() or 1)]:
+        circuit.chunk_size = size
+        circuit.workers = workers
+        t = min(timeit.repeat(lambda: circuit.network, number=1, repeat=3))
+        tracemalloc.start()
+        circuit.network
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('    chunks of %-6s %i workers %8.4f s  peak memory %6.1f MB'
+              % (size, workers, t, peak / 2**20))
+
+
+def main(n_freqs=100000, n_lines=4):
+    bench_X(n_freqs, n_lines)
+    bench_cache(n_freqs // 10, n_lines)
+    bench_sweep(n_freqs // 100, n_lines, 100)
+    bench_sparse(11, 500)
+    bench_chunks(n_freqs, n_lines)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
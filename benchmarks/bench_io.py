@@ -0,0 +1,70 @@
+"""
+Benchmarks of the input/output of Networks.
+
+Compares the time to write and read a set of Networks as touchstone files,
+as pickles and in the native binary format, as well as a partial read of
+the native format.
+
+Run with::
+
+    python benchmarks/bench_io.py [n_ports] [n_freqs] [n_ntwks]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import numpy as npy
+
+import skrf as rf
+
+
+def make_networks(n_ports, n_freqs, n_ntwks):
+    freq = rf.Frequency(1, 10, n_freqs, 'GHz')
+    ntwks = []
+    for k in range(n_ntwks):
+        s = npy.random.randn(n_freqs, n_ports, n_ports) \
+            + 1j * npy.random.randn(n_freqs, n_ports, n_ports)
+        ntwks.append(rf.Network(frequency=freq, s=s, name='ntwk%i' % k))
+    return ntwks
+
+
+def bench(label, func, number=3):
+    t = min(timeit.repeat(func, number=1, repeat=number))
+    print('%-32s %10.4f s' % (label, t))
+    return t
+
+
+def main(n_ports=4, n_freqs=10001, n_ntwks=10):
+    ntwks = make_networks(n_ports, n_freqs, n_ntwks)
+    ns = rf.NetworkSet(ntwks)
+    tmp = tempfile.mkdtemp()
+    native_file = os.path.join(tmp, 'ntwks.npz')
+    pickle_file = os.path.join(tmp, 'ntwks.p')
+    print('%i networks, %i ports, %i frequency points'
+          % (n_ntwks, n_ports, n_freqs))
+    try:
+        bench('write touchstone', lambda: [n.write_touchstone(dir=tmp) for n in ntwks])
+        bench('write pickle', lambda: rf.write(pickle_file, ns))
+        bench('write native', lambda: ns.write_native(native_file))
+
+        bench('read touchstone', lambda: rf.read_all_networks(tmp, contains='.s%ip' % n_ports))
+        bench('read pickle', lambda: rf.read(pickle_file))
+        bench('read native', lambda: rf.NetworkSet.from_native(native_file))
+        bench('read native, no mmap',
+              lambda: rf.NetworkSet.from_native(native_file, mmap=False))
+        bench('read native, 1 network', lambda: rf.read_native(native_file, index=n_ntwks // 2))
+        bench('read native, 1 GHz slice',
+              lambda: rf.NetworkSet.from_native(native_file, f_slice='2-3ghz'))
+
+        for filename in [native_file, pickle_file,
+                         os.path.join(tmp, ntwks[0].name + '.s%ip' % n_ports)]:
+            print('%-32s %10.1f MB' % ('size of ' + os.path.basename(filename),
+                                        os.path.getsize(filename) / 1e6))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+"""
+Micro-benchmarks of the creation and modification of Networks.
+
+Times a loop which creates many small Networks and assigns their
+s-parameters, as done by calibrations, `connect` or Monte-Carlo analyses,
+repeated accesses to derived matrices, with and without the cache of
+derived matrices, and the slicing of a large Network, with copies and
+with views.
+
+Run with::
+
+    python benchmarks/bench_network.py [n_ntwks] [n_freqs] [n_ports]
+"""
+import sys
+import timeit
+
+import numpy as npy
+
+import skrf as rf
+
+
+def create_and_assign(n_ntwks, freq, s):
+    for k in range(n_ntwks):
+        ntwk = rf.Network(frequency=freq, s=s)
+        ntwk.s = s
+        ntwk.s11
+
+
+def access_derived(ntwk):
+    for prop in ['z_re', 'z_im', 'z_db', 'y_re', 'y_im', 'y_mag', 'z', 'y']:
+        getattr(ntwk, prop)
+
+
+def main(n_ntwks=100000, n_freqs=10001, n_ports=16):
+    freq = rf.Frequency(1, 2, 11, 'GHz')
+    s = npy.random.randn(11, 2, 2) + 1j * npy.random.randn(11, 2, 2)
+    t = min(timeit.repeat(lambda: create_and_assign(n_ntwks, freq, s),
+                          number=1, repeat=3))
+    print('create and assign %i 2-port networks  %10.3f s' % (n_ntwks, t))
+
+    freq = rf.Frequency(1, 2, n_freqs, 'GHz')
+    s = npy.random.randn(n_freqs, 4, 4) + 1j * npy.random.randn(n_freqs, 4, 4)
+    ntwk = rf.Network(frequency=freq, s=s)
+    for cache_size in [0, 32]:
+        ntwk.cache_size = cache_size
+        ntwk.clear_cache()
+        t = min(timeit.repeat(lambda: access_derived(ntwk), number=10, repeat=3))
+        print('10 x 8 derived properties, cache_size=%-3i %10.3f s %s'
+              % (cache_size, t, ntwk.cache_info()))
+
+    freq = rf.Frequency(1, 10, 5 * n_freqs, 'GHz')
+    s = npy.ones((5 * n_freqs, n_ports, n_ports), dtype=complex)
+    ntwk = rf.Network(frequency=freq, s=s)
+    for label, func in [
+            ('copy_subset of a 5 GHz band', lambda: ntwk.copy_subset(slice(0, 5 * n_freqs // 2))),
+            ('view of a 5 GHz band', lambda: ntwk.view(slice(0, 5 * n_freqs // 2))),
+            ('cropped 5 GHz band', lambda: ntwk.cropped(2, 7)),
+            ('cropped 5 GHz band, view', lambda: ntwk.cropped(2, 7, view=True)),
+            ('s21 sub-network', lambda: ntwk.s21),
+            ('s21 sub-network view', lambda: ntwk.view(m=1, n=0)),
+            ]:
+        t = min(timeit.repeat(func, number=1, repeat=3))
+        print('%i-port, %i points: %-28s %10.4f s' % (n_ports, 5 * n_freqs, label, t))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
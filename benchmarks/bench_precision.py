@@ -0,0 +1,61 @@
+"""
+Benchmark of the single precision (complex64) storage of Networks.
+
+Compares the memory used, the time taken and the accuracy of common
+operations with Networks stored in single and in double precision.
+The relative error is the largest error relative to the largest magnitude
+of the double precision result.
+
+Run with::
+
+    python benchmarks/bench_precision.py [n_ntwks] [n_ports] [n_freqs]
+"""
+import sys
+import timeit
+
+import numpy as npy
+
+import skrf as rf
+
+
+def relative_error(x, x_ref):
+    return npy.max(npy.abs(x - x_ref)) / npy.max(npy.abs(x_ref))
+
+
+def main(n_ntwks=100, n_ports=4, n_freqs=10001):
+    freq = rf.Frequency(1, 10, n_freqs, 'GHz')
+    # passive networks, like measured DUTs
+    s = (npy.random.rand(n_ntwks, n_freqs, n_ports, n_ports) *
+         npy.exp(2j * npy.pi * npy.random.rand(n_ntwks, n_freqs, n_ports, n_ports))) / n_ports
+    ntwks = [rf.Network(frequency=freq, s=s_k, name='ntwk%i' % k)
+             for k, s_k in enumerate(s)]
+    results = {}
+    for dtype in [npy.complex128, npy.complex64]:
+        ns = rf.NetworkSet([ntwk.copy() for ntwk in ntwks], dtype=dtype)
+        ntwk = ns[0]
+        two_port = rf.subnetwork(ntwk, [0, 1])
+        name = npy.dtype(dtype).name
+        print('%s: NetworkSet of %i %i-port networks, %i points: %.1f MB'
+              % (name, n_ntwks, n_ports, n_freqs,
+                 sum(n.s.nbytes + n.z0.nbytes for n in ns) / 1e6))
+        operations = [
+            ('s', lambda: ntwk.s),
+            ('z', lambda: ntwk.z),
+            ('y', lambda: ntwk.y),
+            ('cascade', lambda: (two_port ** two_port ** two_port).s),
+            ('interpolate', lambda: ntwk.interpolate(2 * n_freqs - 1).s),
+            ('mean_s', lambda: ns.mean_s.s),
+            ]
+        for label, func in operations:
+            t = min(timeit.repeat(func, number=1, repeat=3))
+            results[(name, label)] = func()
+            print('    %-12s %8.4f s' % (label, t))
+
+    print('relative error of complex64 against complex128:')
+    for label in ['s', 'z', 'y', 'cascade', 'interpolate', 'mean_s']:
+        print('    %-12s %8.1e' % (label, relative_error(results[('complex64', label)],
+                                                       results[('complex128', label)])))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,72 @@
+"""
+Benchmarks of the vector fitting.
+
+Times one iteration of the pole relocation of
+:meth:`skrf.vectorFitting.VectorFitting.vector_fit` against the number of
+ports, of frequency samples and of poles, on the responses of a random
+rational model. The time of a fit, including the final calculation of the
+residues, is divided by its number of iterations. The fit of a network
+with many ports is also timed with a pool of threads reducing the
+responses.
+
+Run with::
+
+    python benchmarks/bench_vector_fitting.py [n_iterations]
+"""
+import logging
+import sys
+import timeit
+
+import numpy as np
+
+import skrf as rf
+
+
+def rational_network(n_ports, n_samples, n_poles, seed=0):
+    """
+    Network whose responses are sums of `n_poles` complex-conjugate pole
+    pairs with random residues
+    """
+    rng = np.random.RandomState(seed)
+    freq = rf.Frequency(1, 100, n_samples, 'GHz')
+    s = 2j * np.pi * freq.f
+    omega = 2 * np.pi * np.linspace(freq.f[0], freq.f[-1], n_poles)
+    poles = (-0.01 + 1j) * omega
+    residues = (rng.randn(n_ports, n_ports, n_poles)
+                + 1j * rng.randn(n_ports, n_ports, n_poles)) * omega / 100
+    h = residues[None] / (s[:, None, None, None] - poles) \
+        + np.conjugate(residues[None]) / (s[:, None, None, None] - np.conjugate(poles))
+    return rf.Network(frequency=freq, s=h.sum(axis=-1) + 0.1, name='rational')
+
+
+def bench_iteration(n_ports, n_samples, n_poles, n_iterations=2, workers=1):
+    ntwk = rational_network(n_ports, n_samples, n_poles)
+    vf = rf.VectorFitting(ntwk)
+    vf.max_iterations = n_iterations
+    vf.workers = workers
+
+    def run():
+        vf.vector_fit(n_poles_real=0, n_poles_cmplx=n_poles)
+
+    t = min(timeit.repeat(run, number=1, repeat=3))
+    print('    %6i %8i %6i %8s %10.4f s' % (n_ports, n_samples, n_poles, workers,
+                                             t / len(vf.d_res_history)))
+
+
+def main(n_iterations=2):
+    # the fits are stopped before they converge
+    logging.getLogger().setLevel(logging.ERROR)
+    print('Time per iteration of the pole relocation')
+    print('    %6s %8s %6s %8s %12s' % ('nports', 'nsamples', 'npoles', 'workers', 'iteration'))
+    for n_ports in [1, 2, 4, 8, 12]:
+        bench_iteration(n_ports, 1000, 10, n_iterations)
+    for n_samples in [100, 500, 2000, 5000]:
+        bench_iteration(2, n_samples, 10, n_iterations)
+    for n_poles in [5, 10, 20, 40]:
+        bench_iteration(2, 1000, n_poles, n_iterations)
+    for workers in [1, 2, 4, None]:
+        bench_iteration(12, 2000, 40, n_iterations, workers)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,35 @@
+"""
+Benchmark of Network.write_touchstone.
+
+Times the export of a large Network to a touchstone string, in the RI, MA
+and DB formats, with and without the port impedances.
+
+Run with::
+
+    python benchmarks/bench_write_touchstone.py [n_ports] [n_freqs]
+"""
+import sys
+import timeit
+
+import numpy as npy
+
+import skrf as rf
+
+
+def main(n_ports=24, n_freqs=10000):
+    freq = rf.Frequency(1, 10, n_freqs, 'GHz')
+    s = npy.random.randn(n_freqs, n_ports, n_ports) \
+        + 1j * npy.random.randn(n_freqs, n_ports, n_ports)
+    ntwk = rf.Network(frequency=freq, s=s, name='bench')
+    print('%i ports, %i frequency points' % (n_ports, n_freqs))
+    for form in ['ri', 'ma', 'db']:
+        for write_z0 in [False, True]:
+            t = min(timeit.repeat(
+                lambda: ntwk.write_touchstone(return_string=True, form=form,
+                                              write_z0=write_z0),
+                number=1, repeat=3))
+            print('form=%s, write_z0=%-5s %10.3f s' % (form, write_z0, t))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
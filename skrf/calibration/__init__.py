@@ -11,6 +11,7 @@ calibration algorithms. Most functionality is in the :mod:`calibration`
 module.
 
 .. automodule:: skrf.calibration.calibration
+.. automodule:: skrf.calibration.calibrationCache
 
 '''
 
@@ -18,6 +19,8 @@ module.
 #from parametricStandard import *
 from . import calibration
 from . import calibrationSet
+from . import calibrationCache
 
 from .calibration import *
 from .calibrationSet import *
+from .calibrationCache import *
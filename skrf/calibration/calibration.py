@@ -61,6 +61,10 @@ Generic Methods
 
    terminate
    unterminate
+   unterminate_s
+   correct_T_matrices
+   embed_T_matrices
+   lstsq_stacked
    determine_line
 
 PNA interaction
@@ -78,11 +82,14 @@ from numpy import linalg
 from numpy.linalg import det
 from numpy import mean, std, angle, real, imag, exp, ones, zeros, poly1d, invert, einsum, sqrt, unwrap,log,log10
 import json
+import cmath
+import math
 from numbers import Number
 from collections import OrderedDict
 import os
 from copy import deepcopy, copy
 import itertools
+from functools import wraps
 from warnings import warn
 import six.moves.cPickle as pickle
 
@@ -91,7 +98,7 @@ from ..mathFunctions import complex_2_db, sqrt_phase_unwrap, \
 from ..frequency import *
 from ..network import *
 from ..networkSet import func_on_networks as fon
-from ..networkSet import NetworkSet
+from ..networkSet import NetworkSet, NetworkStatistics
 from .. import util
 from ..io.touchstone import read_zipped_touchstones
 from .. import __version__ as skrf__version__
@@ -150,6 +157,27 @@ coefs_list_3term = [
     ]
 
 
+def _cached_run(run):
+    '''
+    Decorator of the `run()` methods, which loads the results from
+    `coefs_cache` when it is set.
+
+    Only the outermost `run()` is cached, not the one of a parent
+    class called by a subclass.
+    '''
+    @wraps(run)
+    def wrapper(self):
+        cache = self.coefs_cache
+        if cache is None or self.__dict__.get('_running', False):
+            return run(self)
+        self._running = True
+        try:
+            return cache.cached_run(self, run)
+        finally:
+            del self._running
+    return wrapper
+
+
 class Calibration(object):
     '''
     Base class for all Calibration objects.
@@ -166,8 +194,26 @@ class Calibration(object):
     `coefs..ntwks`  returns error coefficients. If the property coefs
     is accessed and empty, then :func:`Calibration.run` is called.
 
+    The results of :func:`Calibration.run` can be stored on disk, and
+    loaded when a calibration with the same standards is run again, by
+    setting `coefs_cache` to a
+    :class:`~skrf.calibration.calibrationCache.CalibrationCache`, either
+    on an instance or on the class to cache all the calibrations.
+
     '''
     family = ''
+    coefs_cache = None
+    # if True, the calibration is solved independently at each frequency
+    _pointwise = True
+
+    def __init_subclass__(cls, **kwargs):
+        '''
+        Wrap the `run()` method of the subclasses to use `coefs_cache`
+        '''
+        super().__init_subclass__(**kwargs)
+        if 'run' in cls.__dict__:
+            cls.run = _cached_run(cls.__dict__['run'])
+
     def __init__(self, measured, ideals, sloppy_input=False,
         is_reciprocal=True,name=None, self_calibration=False,*args, **kwargs):
         '''
@@ -313,14 +359,29 @@ class Calibration(object):
         '''
         raise NotImplementedError('The Subclass must implement this')
 
-    def apply_cal_to_list(self,ntwk_list):
+    def apply_cal_to_list(self, ntwk_list, chunk_size=None):
         '''
         Apply correction to list of dict of Networks.
+
+        Networks sharing the frequency of the calibration are corrected
+        together, see :func:`apply_cal_to_array`.
+
+        Parameters
+        -----------
+        ntwk_list : list or dict of :class:`~skrf.network.Network` objects
+            raw measurements
+        chunk_size : int or None
+            maximum number of Networks corrected together. If None (default),
+            it is chosen from the number of frequency points, see
+            :func:`apply_cal_to_array`.
         '''
         if hasattr(ntwk_list, 'keys'):
-            return dict([(k, self.apply_cal(ntwk_list[k])) for k in ntwk_list])
+            keys = list(ntwk_list)
+            caled = self._apply_cal_to_networks([ntwk_list[k] for k in keys],
+                                                chunk_size)
+            return dict(zip(keys, caled))
         else:
-            return [self.apply_cal(k) for k in ntwk_list]
+            return self._apply_cal_to_networks(list(ntwk_list), chunk_size)
 
     def apply_cal_to_all_in_dir(self, *args, **kwargs):
         '''
@@ -332,21 +393,156 @@ class Calibration(object):
         ntwkDict = read_all_networks(*args, **kwargs)
         return self.apply_cal_to_list(ntwkDict)
 
-    def apply_cal_to_network_set(self, ntwk_set):
+    def apply_cal_to_network_set(self, ntwk_set, chunk_size=None):
         '''
         Apply correction to a NetworkSet.
-        '''
-        cal_ns = NetworkSet([self.apply_cal(ntwk) for ntwk in ntwk_set])
+
+        The Networks are corrected together, see :func:`apply_cal_to_array`.
+
+        Parameters
+        -----------
+        ntwk_set : :class:`~skrf.networkSet.NetworkSet`
+            raw measurements
+        chunk_size : int or None
+            maximum number of Networks corrected together. If None (default),
+            it is chosen from the number of frequency points, see
+            :func:`apply_cal_to_array`.
+        '''
+        cal_ns = NetworkSet(self._apply_cal_to_networks(list(ntwk_set), chunk_size))
         if hasattr(ntwk_set, 'name'):
             cal_ns.name = ntwk_set.name
         return cal_ns
 
+    def apply_cal_to_array(self, s, chunk_size=None):
+        '''
+        Apply correction to a stack of raw s-parameters.
+
+        The quantities derived from the error coefficients, like the
+        T matrices of :class:`EightTerm`, are computed once, and all the
+        measurements are corrected in one vectorized pass for the
+        calibrations which support it. The others correct each measurement
+        with :func:`apply_cal`.
+
+        Parameters
+        -----------
+        s : numpy.ndarray
+            raw s-parameters, of shape (n_dut, nfreq, nports, nports), at
+            the frequencies of the calibration
+        chunk_size : int or None
+            maximum number of measurements corrected together, to bound the
+            memory used by the intermediate arrays. If None (default),
+            chunks of about 32768 frequency points are corrected together,
+            which keeps the intermediate arrays in the processor caches.
+
+        Returns
+        --------
+        caled : numpy.ndarray
+            corrected s-parameters, of the same shape as `s`
+
+        Examples
+        ---------
+        >>> s = npy.array([ntwk.s for ntwk in raw_ntwks])
+        >>> caled_s = cal.apply_cal_to_array(s, chunk_size=100)
+        '''
+        s = npy.asarray(s)
+        if s.ndim != 4 or s.shape[-1] != s.shape[-2]:
+            raise ValueError('s must be of shape (n_dut, nfreq, nports, nports)')
+        frequency = self.frequency
+        if s.shape[1] != len(frequency):
+            raise ValueError('s has %i frequency points, the calibration has %i'
+                             % (s.shape[1], len(frequency)))
+
+        correct = self._array_corrector()
+        if correct is None:
+            correct = self._apply_cal_each
+
+        chunk_size = self._chunk_size(chunk_size, len(frequency))
+        caled = npy.empty(s.shape, dtype=npy.result_type(s.dtype, complex))
+        for start in range(0, len(s), chunk_size):
+            caled[start:start+chunk_size] = correct(s[start:start+chunk_size])
+        return caled
+
+    def _array_corrector(self):
+        '''
+        Function correcting stacked raw s-parameters, or None.
+
+        Calibrations whose correction can be vectorized return a function
+        of an array of shape (n_dut, nfreq, nports, nports), with the
+        quantities it needs computed beforehand. By default, None is
+        returned, and :func:`apply_cal` is called for each measurement.
+        '''
+        return None
+
+    @staticmethod
+    def _chunk_size(chunk_size, npoints):
+        '''
+        Number of measurements corrected together by the bulk corrections.
+        '''
+        if chunk_size is None:
+            chunk_size = 2**15 // npoints
+        return max(int(chunk_size), 1)
+
+    def _apply_cal_each(self, s):
+        '''
+        Correct stacked raw s-parameters one measurement at a time, with
+        :func:`apply_cal`.
+        '''
+        frequency = self.frequency
+        return npy.array([self.apply_cal(Network(frequency=frequency, s=s_k)).s
+                          for s_k in s])
+
+    def _apply_cal_to_networks(self, ntwks, chunk_size=None):
+        '''
+        Apply correction to a list of Networks, through the vectorized
+        correction when the Networks can be stacked.
+        '''
+        correct = self._array_corrector()
+        if correct is None or len(ntwks) == 0:
+            return [self.apply_cal(k) for k in ntwks]
+        frequency = self.frequency
+        for ntwk in ntwks:
+            if not isinstance(ntwk, Network) or \
+                    ntwk.s.shape != ntwks[0].s.shape or \
+                    ntwk.frequency != frequency:
+                return [self.apply_cal(k) for k in ntwks]
+
+        chunk_size = self._chunk_size(chunk_size, len(frequency))
+        caled = []
+        for start in range(0, len(ntwks), chunk_size):
+            chunk = ntwks[start:start+chunk_size]
+            s = correct(npy.array([ntwk.s for ntwk in chunk]))
+            for ntwk, s_k in zip(chunk, s):
+                caled_k = ntwk.copy()
+                caled_k.s = s_k
+                caled.append(caled_k)
+        return caled
+
     def embed(self,ntwk):
         '''
         Embed an ideal response in the estimated error network[s]
         '''
         raise NotImplementedError('The Subclass must implement this')
 
+    def _std_index(self, std):
+        '''
+        Index of a calibration standard, given by its index or by the name
+        of its ideal or measured Network.
+        '''
+        if isinstance(std, str):
+            for idx,ideal in enumerate(self.ideals):
+                if std  == ideal.name:
+                    std = idx
+
+        if isinstance(std, str):
+            for idx,measured in enumerate(self.measured):
+                if std  == measured.name:
+                    std = idx
+
+        if isinstance(std, str):
+            raise (ValueError('standard %s not found in ideals'%std))
+        # normalize negative indices
+        return range(len(self.measured))[std]
+
     def pop(self,std=-1):
         '''
         Remove and return tuple of (ideal, measured) at index.
@@ -366,21 +562,68 @@ class Calibration(object):
             calibration
 
         '''
+        std = self._std_index(std)
+        return (self.ideals.pop(std),  self.measured.pop(std))
 
-        if isinstance(std, str):
-            for idx,ideal in enumerate(self.ideals):
-                if std  == ideal.name:
-                    std = idx
+    def update_measured(self, std, measured, ideal=None):
+        '''
+        Replace the measurement of a calibration standard.
 
-        if isinstance(std, str):
-            for idx,measured in enumerate(self.measured):
-                if std  == measured.name:
-                    std = idx
+        Useful when a single standard, like a drifting load, is measured
+        again. If the calibration was already run, only what depends on
+        the replaced standard is recomputed: the least squares solutions
+        of :class:`OnePort` and :class:`TwelveTerm` are updated, the other
+        calibrations are run again.
 
-        if isinstance(std, str):
-            raise (ValueError('standard %s not found in ideals'%std))
+        The lists of measured and ideal Networks are replaced, not
+        modified, so a shallow copy of the calibration can be updated
+        without changing the original.
 
-        return (self.ideals.pop(std),  self.measured.pop(std))
+        Parameters
+        -------------
+        std : int or str
+            the integer of calibration standard to replace, or the name
+            of its ideal or measured Network.
+        measured : :class:`~skrf.network.Network`
+            new raw measurement of the standard
+        ideal : :class:`~skrf.network.Network` or None
+            new ideal response of the standard. If None (default), the
+            ideal is kept.
+
+        Examples
+        ----------
+        >>> cal = rf.OnePort(measured=measured, ideals=ideals)
+        >>> cal.run()
+        >>> cal.update_measured('load', rf.Network('load_remeasured.s1p'))
+        '''
+        k = self._std_index(std)
+        frequency = self.measured[0].frequency
+        if measured.frequency != frequency:
+            raise(ValueError('measured Network doesnt match the frequency of the calibration.'))
+        if ideal is not None and ideal.frequency != frequency:
+            raise(ValueError('ideal Network doesnt match the frequency of the calibration.'))
+
+        old_measured = self.measured[k]
+        # self-calibrations have less ideals than measurements
+        old_ideal = self.ideals[k] if k < len(self.ideals) else None
+        self.measured = list(self.measured)
+        self.measured[k] = measured.copy()
+        if ideal is not None:
+            self.ideals = list(self.ideals)
+            self.ideals[k] = ideal.copy()
+
+        self._residual_ntwks = None
+        self._caled_ntwks = None
+        self._caled_ntwk_sets = None
+        if '_coefs' in self.__dict__:
+            self._update(k, old_measured, old_ideal)
+
+    def _update(self, k, old_measured, old_ideal):
+        '''
+        Update the results of :func:`run` after the standard `k` was
+        replaced. Subclasses with an incremental solution override this.
+        '''
+        self.run()
 
     def remove_and_cal(self, std):
         '''
@@ -389,6 +632,8 @@ class Calibration(object):
         This requires requires overdetermination. Useful in 
         troubleshooting a calibration in which one standard is junk, but 
         you dont know which. 
+
+        The calibration itself is not modified.
         
         Parameters
         -------------
@@ -403,18 +648,190 @@ class Calibration(object):
             calibration
             
         '''
-        measured, ideals = copy(self.measured), copy(self.ideals)
-        i,m  = self.pop(std)
-        self.run()
-        c = self.apply_cal(m)
-        self.measured = measured
-        self.ideals = ideals
-        self.run()
+        k = self._std_index(std)
+        i, m = self.ideals[k], self.measured[k]
+        c = self._removed(k).apply_cal(m)
         return c,i
 
+    def _removed(self, k):
+        '''
+        Copy of the calibration without the standard `k`, already run
+        '''
+        cal = copy(self)
+        cal.measured = self.measured[:k] + self.measured[k+1:]
+        cal.ideals = self.ideals[:k] + self.ideals[k+1:]
+        for attr in ['_coefs', '_output_from_run']:
+            cal.__dict__.pop(attr, None)
+        cal.run()
+        return cal
 
+    def monte_carlo(self, n_trials, noise=None, repeatability=None, duts=None,
+                    chunk_size=None, seed=None,
+                    properties=('s', 's_mag', 's_db', 's_deg')):
+        '''
+        Monte-Carlo uncertainty of the calibration.
 
+        The measurements of the standards are perturbed by random errors
+        in `n_trials` trials, and the calibration is solved for each
+        trial. The statistics of the resulting error coefficients, and of
+        the DUTs corrected by each trial, are accumulated.
 
+        As the calibrations are solved independently at each frequency,
+        the trials are solved together, as a single calibration over the
+        frequencies of all the trials, by chunks of `chunk_size` trials.
+        The calibrations which are not independent over frequency, like
+        :class:`NISTMultilineTRL`, are solved one trial at a time.
+
+        Parameters
+        -------------
+        n_trials : int
+            number of trials
+        noise : tuple of 2 floats or None
+            standard deviations of the magnitude and of the phase [in
+            degrees] of a gaussian noise added at each frequency, as
+            :func:`~skrf.network.Network.add_noise_polar`. None means no
+            noise.
+        repeatability : tuple of 2 floats or None
+            standard deviations of the magnitude and of the phase [in
+            degrees] of a gaussian error constant over frequency, drawn
+            for each standard and trial, like the connection repeatability,
+            as :func:`~skrf.network.Network.add_noise_polar_flatband`. None
+            means no such error.
+        duts : list of :class:`~skrf.network.Network` or None
+            raw measurements to correct with each trial
+        chunk_size : int or None
+            maximum number of trials solved together, to bound the memory
+            used. If None (default), chunks of about 32768 frequency points
+            are solved together, see :func:`apply_cal_to_array`.
+        seed : int or None
+            seed of the random generator, for reproducible results
+        properties : list of str
+            Network properties whose statistics are computed, see
+            :class:`~skrf.networkSet.NetworkStatistics`
+
+        Returns
+        ---------
+        coefs_stats : dict of :class:`~skrf.networkSet.NetworkStatistics`
+            statistics of each error coefficient of :attr:`coefs`, as
+            one-port Networks
+        duts_stats : list of :class:`~skrf.networkSet.NetworkStatistics`
+            statistics of each corrected DUT
+
+        Examples
+        ----------
+        >>> coefs_stats, duts_stats = cal.monte_carlo(
+        ...     1000, noise=(1e-3, .1), repeatability=(1e-2, 1.), duts=[dut])
+        >>> coefs_stats['directivity'].std_s_mag.plot_s_db()
+        >>> duts_stats[0].std_s_deg.plot_s_re()
+        '''
+        duts = [] if duts is None else list(duts)
+        frequency = self.frequency
+        for dut in duts:
+            if dut.frequency != frequency:
+                raise(ValueError('DUT doesnt match the frequency of the calibration.'))
+        rng = npy.random.default_rng(seed)
+        measured = npy.array([ntwk.s for ntwk in self.measured])
+
+        if self._pointwise:
+            chunk_size = self._chunk_size(chunk_size, len(frequency))
+        else:
+            chunk_size = 1
+
+        coefs_stats = {}
+        duts_stats = [NetworkStatistics(properties=properties) for dut in duts]
+        for start in range(0, n_trials, chunk_size):
+            n = min(chunk_size, n_trials - start)
+            s = self._perturbed(measured, n, noise, repeatability, rng)
+            cal = self._trials_copy(s)
+            for k, coef in cal.coefs.items():
+                if k not in coefs_stats:
+                    coefs_stats[k] = NetworkStatistics(properties=properties,
+                                                       name=k)
+                coef_ntwk = Network(frequency=frequency, s=coef[:len(frequency)],
+                                    name=k)
+                coefs_stats[k].add_stacked(coef.reshape(n, -1, 1, 1), coef_ntwk)
+            for dut, stats in zip(duts, duts_stats):
+                raw = npy.tile(dut.s, (n, 1, 1))
+                caled = cal.apply_cal_to_array(raw[None])[0]
+                stats.add_stacked(caled.reshape((n,) + dut.s.shape), dut)
+        return coefs_stats, duts_stats
+
+    @staticmethod
+    def _perturbed(measured, n, noise, repeatability, rng):
+        '''
+        `n` random perturbations of the stacked measured s-parameters
+        '''
+        shape = (n,) + measured.shape
+        mag = npy.broadcast_to(abs(measured), shape).copy()
+        phase = npy.broadcast_to(npy.angle(measured, deg=True), shape).copy()
+        # the repeatability errors are drawn once per trial, standard and
+        # s-parameter, and are constant over frequency
+        flat = shape[:2] + (1,) + shape[3:]
+        devs = [(dev, size) for dev, size in [(noise, shape), (repeatability, flat)]
+                if dev is not None]
+        # the random numbers of each trial are drawn together, so that the
+        # trials do not depend on how they are chunked
+        sizes = [2*int(npy.prod(size[1:])) for dev, size in devs]
+        rv = rng.standard_normal((n, sum(sizes)))
+        for (dev, size), rv_k in zip(devs, npy.split(rv, npy.cumsum(sizes)[:-1], axis=1)):
+            mag_dev, phase_dev = dev
+            mag_rv, phase_rv = npy.split(rv_k, 2, axis=1)
+            mag += mag_dev*mag_rv.reshape(size)
+            phase += phase_dev*phase_rv.reshape(size)
+        return mag*npy.exp(1j*npy.pi/180.*phase)
+
+    def _trials_copy(self, measured):
+        '''
+        Copy of the calibration, not run, with the measured standards of
+        several trials.
+
+        `measured` has the shape (n_trials, n_stds, nfreq, nports, nports).
+        For more than one trial, the frequency axis of the calibration is
+        repeated for each trial, so that the trials are solved together.
+        '''
+        n, n_stds, nfreq = measured.shape[:3]
+        frequency = self.measured[0].frequency
+        tiled_frequency = Frequency.from_f(npy.tile(frequency.f, n), unit='hz')
+        tiled_frequency.unit = frequency.unit
+
+        def tiled(ntwk):
+            if n == 1:
+                return ntwk.copy()
+            return Network(frequency=tiled_frequency,
+                           s=npy.tile(ntwk.s, (n, 1, 1)),
+                           z0=npy.tile(ntwk.z0, (n, 1)),
+                           name=ntwk.name, s_def=ntwk.s_def)
+
+        def tile(obj):
+            if isinstance(obj, Network):
+                if len(obj) == nfreq and obj.frequency == frequency:
+                    return tiled(obj)
+                return obj
+            elif isinstance(obj, (list, tuple)):
+                return type(obj)(tile(k) for k in obj)
+            elif isinstance(obj, dict):
+                return type(obj)((k, tile(v)) for k, v in obj.items())
+            return obj
+
+        cal = copy(self)
+        for k, v in list(vars(cal).items()):
+            if k.startswith('_') and not isinstance(v, Network):
+                # results of run(), and caches of the corrected standards
+                del cal.__dict__[k]
+            else:
+                setattr(cal, k, tile(v))
+        cal._residual_ntwks = None
+        cal._caled_ntwks = None
+        cal._caled_ntwk_sets = None
+        # the trials are not stored
+        cal.coefs_cache = None
+
+        cal.measured = []
+        for k, ntwk in enumerate(self.measured):
+            trials = tiled(ntwk)
+            trials.s = measured[:, k].reshape((n*nfreq,) + measured.shape[3:])
+            cal.measured.append(trials)
+        return cal
 
     @classmethod
     def from_coefs_ntwks(cls, coefs_ntwks, **kwargs):
@@ -1021,7 +1438,7 @@ class OnePort(Calibration):
 
         Notes
         -----
-        This uses numpy.linalg.lstsq() for least squares calculation
+        This uses :func:`lstsq_stacked` for least squares calculation
 
         See Also
         ---------
@@ -1036,44 +1453,56 @@ class OnePort(Calibration):
         numStds = self.nstandards
         numCoefs=3
 
-        mList = [self.measured[k].s.reshape((-1,1)) for k in list(range(numStds))]
-        iList = [self.ideals[k].s.reshape((-1,1)) for k in list(range(numStds))]
+        # m and i are fLength x numStds matrices of the measured and ideal
+        # reflection coefficients
+        m = npy.array([self.measured[k].s.reshape(-1) for k in range(numStds)]).T
+        i = npy.array([self.ideals[k].s.reshape(-1) for k in range(numStds)]).T
 
-        # ASSERT: mList and aList are now kx1x1 matrices, where k in frequency
-        fLength = len(mList[0])
+        # form the matrices Q at all frequencies, where Q = i1, 1, i1*m1
+        #                                                   i2, 1, i2*m2
+        #                                                           ...etc
+        # and solve them in the least squares sense
+        Q = npy.stack([i, npy.ones(i.shape), i*m], axis=-1)
+        abc, residualsTmp, rank = lstsq_stacked(Q, m[:,:,None])
+
+        if numStds > 3:
+            if npy.any(rank < numCoefs):
+                raise(ValueError('matrix has singular values. ensure standards are far enough away on smith chart'))
+
+        # normal equations, kept to update the solution when a standard
+        # is replaced or removed
+        Qh = Q.conj().transpose(0,2,1)
+        self._normal_equations = {
+            'Q': Q, 'm': m,
+            'QhQ': npy.matmul(Qh, Q),
+            'Qhm': npy.matmul(Qh, m[:,:,None]),
+            'QtQ': npy.matmul(Q.transpose(0,2,1), Q),
+            }
+        self._set_solution(abc[:,:,0], self._normal_equations)
+
+    def _set_solution(self, abc, eqs):
+        '''
+        Set the error coefficients and the output of :func:`run` from the
+        least squares solution `abc` of the equations `eqs`.
+        '''
+        Q, m = eqs['Q'], eqs['m']
+        numStds = m.shape[1]
+        numCoefs = 3
+        fLength = len(m)
 
         #initialize outputs
-        abc = npy.zeros((fLength,numCoefs),dtype=complex)
         residuals =     npy.zeros((fLength,\
                 npy.sign(numStds-numCoefs)),dtype=complex)
         parameter_variance = npy.zeros((fLength, 3,3),dtype=complex)
-        measurement_variance = npy.zeros((fLength, 1),dtype=complex)
-        # loop through frequencies and form m, a vectors and
-        # the matrix M. where M = i1, 1, i1*m1
-        #                         i2, 1, i2*m2
-        #                                 ...etc
-        for f in list(range(fLength)):
-            #create  m, i, and 1 vectors
-            one = npy.ones(shape=(numStds,1))
-            m = npy.array([ mList[k][f] for k in list(range(numStds))]).reshape(-1,1)# m-vector at f
-            i = npy.array([ iList[k][f] for k in list(range(numStds))]).reshape(-1,1)# i-vector at f
-
-            # construct the matrix
-            Q = npy.hstack([i, one, i*m])
-            # calculate least squares
-            abcTmp, residualsTmp = npy.linalg.lstsq(Q,m,rcond=None)[0:2]
-            if numStds > 3:
-                measurement_variance[f,:]= residualsTmp/(numStds-numCoefs)
-                parameter_variance[f,:] = \
-                        abs(measurement_variance[f,:])*\
-                        npy.linalg.inv(npy.dot(Q.T,Q))
-
-
-            abc[f,:] = abcTmp.flatten()
-            try:
-                residuals[f,:] = residualsTmp
-            except(ValueError):
-                raise(ValueError('matrix has singular values. ensure standards are far enough away on smith chart'))
+
+        if numStds > 3:
+            residualsTmp = npy.sum(abs(npy.matmul(Q, abc[:,:,None])[:,:,0] - m)**2,
+                                   axis=1)[:,None]
+            residuals[:] = residualsTmp
+            measurement_variance = residualsTmp/(numStds-numCoefs)
+            parameter_variance[:] = \
+                    abs(measurement_variance)[:,:,None]*\
+                    npy.linalg.inv(eqs['QtQ'])
 
         # convert the abc vector to standard error coefficients
         a,b,c = abc[:,0], abc[:,1],abc[:,2]
@@ -1095,6 +1524,74 @@ class OnePort(Calibration):
 
         return None
 
+    def _updated_equations(self, k, measured=None, ideal=None):
+        '''
+        Normal equations of the calibration with the row of the standard
+        `k` replaced by `measured` and `ideal`, or removed if they are None.
+
+        The arrays are updated with rank-one corrections, without
+        modifying the current ones.
+        '''
+        eqs = self._normal_equations
+        Q, m = eqs['Q'], eqs['m']
+        q_old, m_old = Q[:,k], m[:,k]
+        QhQ = eqs['QhQ'] - q_old.conj()[:,:,None]*q_old[:,None,:]
+        Qhm = eqs['Qhm'] - (q_old.conj()*m_old[:,None])[:,:,None]
+        QtQ = eqs['QtQ'] - q_old[:,:,None]*q_old[:,None,:]
+        if measured is None:
+            Q = npy.delete(Q, k, axis=1)
+            m = npy.delete(m, k, axis=1)
+        else:
+            m_new = measured.s.reshape(-1)
+            i_new = ideal.s.reshape(-1)
+            q_new = npy.stack([i_new, npy.ones(i_new.shape), i_new*m_new], axis=-1)
+            QhQ += q_new.conj()[:,:,None]*q_new[:,None,:]
+            Qhm += (q_new.conj()*m_new[:,None])[:,:,None]
+            QtQ += q_new[:,:,None]*q_new[:,None,:]
+            Q = Q.copy()
+            m = m.copy()
+            Q[:,k], m[:,k] = q_new, m_new
+        return {'Q': Q, 'm': m, 'QhQ': QhQ, 'Qhm': Qhm, 'QtQ': QtQ}
+
+    def _solve_equations(self, eqs):
+        '''
+        Solve the normal equations `eqs` and set the solution
+        '''
+        if eqs['m'].shape[1] < 3:
+            raise(ValueError('at least three standards are needed'))
+        try:
+            abc = npy.linalg.solve(eqs['QhQ'], eqs['Qhm'])[:,:,0]
+        except npy.linalg.LinAlgError:
+            raise(ValueError('matrix has singular values. ensure standards are far enough away on smith chart'))
+        self._normal_equations = eqs
+        self._set_solution(abc, eqs)
+
+    def _incremental(self):
+        '''
+        True if the results of :func:`run` can be updated from the normal
+        equations, which is not the case for the subclasses solving
+        some standards in their own `run()`.
+        '''
+        return type(self).run is OnePort.run and \
+            '_normal_equations' in self.__dict__
+
+    def _update(self, k, old_measured, old_ideal):
+        if not self._incremental():
+            return super(OnePort, self)._update(k, old_measured, old_ideal)
+        self._solve_equations(self._updated_equations(
+            k, self.measured[k], self.ideals[k]))
+
+    def _removed(self, k):
+        if type(self).run is not OnePort.run or self.nstandards <= 3:
+            return super(OnePort, self)._removed(k)
+        if not self._incremental():
+            self.run()
+        cal = copy(self)
+        cal.measured = self.measured[:k] + self.measured[k+1:]
+        cal.ideals = self.ideals[:k] + self.ideals[k+1:]
+        cal._solve_equations(self._updated_equations(k))
+        return cal
+
     def apply_cal(self, ntwk):
         er_ntwk = Network(frequency = self.frequency, name=ntwk.name)
         tracking  = self.coefs['reflection tracking']
@@ -1106,6 +1603,18 @@ class OnePort(Calibration):
         er_ntwk.s = npy.array([[s11, s21],[s12,s22]]).transpose().reshape(-1,2,2)
         return er_ntwk.inv**ntwk
 
+    def _array_corrector(self):
+        e00 = self.coefs['directivity']
+        e01e10 = self.coefs['reflection tracking']
+        e11 = self.coefs['source match']
+
+        def correct(m):
+            if m.shape[-1] != 1:
+                return self._apply_cal_each(m)
+            d = m[...,0,0] - e00
+            return (d/(e01e10 + e11*d))[...,None,None]
+        return correct
+
     def embed(self,ntwk):
         embedded = ntwk.copy()
         embedded = self.error_ntwk**embedded
@@ -1491,6 +2000,19 @@ class TwelveTerm(Calibration):
         # create one port calibration for reflective standards
         port1_cal = OnePort(measured = p1_m, ideals = p1_i)
         port2_cal = OnePort(measured = p2_m, ideals = p2_i)
+        port1_cal.run(), port2_cal.run()
+        self._port_cals = (port1_cal, port2_cal)
+        self._solve_thrus()
+
+    def _solve_thrus(self):
+        '''
+        Compute the error coefficients from the one port calibrations
+        of the reflective standards and from the transmissive standards.
+        '''
+        n_thrus = self.n_thrus
+        thrus = self.measured[-n_thrus:]
+        ideal_thrus = self.ideals[-n_thrus:]
+        port1_cal, port2_cal = self._port_cals
 
         # cal coefficient dictionaries
         p1_coefs = dict(port1_cal.coefs)
@@ -1550,16 +2072,54 @@ class TwelveTerm(Calibration):
             ['forward switch term','reverse switch term','k'] ]))
         self._coefs = coefs
 
+    def _incremental(self):
+        '''
+        True if the results of :func:`run` can be updated from the one
+        port calibrations of the reflective standards.
+        '''
+        return type(self).run is TwelveTerm.run and \
+            '_port_cals' in self.__dict__
+
+    def _update(self, k, old_measured, old_ideal):
+        if not self._incremental():
+            return super(TwelveTerm, self)._update(k, old_measured, old_ideal)
+        if k < self.nstandards - self.n_thrus:
+            # only the one port calibration of the reflect is updated
+            port_cals = [copy(cal) for cal in self._port_cals]
+            port_cals[0].update_measured(k, self.measured[k].s11,
+                                         self.ideals[k].s11)
+            port_cals[1].update_measured(k, self.measured[k].s22,
+                                         self.ideals[k].s22)
+            self._port_cals = tuple(port_cals)
+        self._solve_thrus()
+
+    def _removed(self, k):
+        n_reflects = self.nstandards - self.n_thrus
+        if type(self).run is not TwelveTerm.run or \
+                (k < n_reflects and n_reflects <= 3) or \
+                (k >= n_reflects and self.n_thrus == 1):
+            return super(TwelveTerm, self)._removed(k)
+        if not self._incremental():
+            self.run()
+        cal = copy(self)
+        cal.measured = self.measured[:k] + self.measured[k+1:]
+        cal.ideals = self.ideals[:k] + self.ideals[k+1:]
+        if k < n_reflects:
+            cal._port_cals = tuple(port_cal._removed(k)
+                                   for port_cal in self._port_cals)
+        else:
+            cal.n_thrus = self.n_thrus - 1
+        cal._solve_thrus()
+        return cal
+
     def apply_cal(self,ntwk):
         '''
         '''
         caled = ntwk.copy()
+        caled.s = TwelveTerm._array_corrector(self)(ntwk.s)
+        return caled
 
-        s11 = ntwk.s[:,0,0]
-        s12 = ntwk.s[:,0,1]
-        s21 = ntwk.s[:,1,0]
-        s22 = ntwk.s[:,1,1]
-
+    def _array_corrector(self):
         Edf = self.coefs['forward directivity']
         Esf = self.coefs['forward source match']
         Erf = self.coefs['forward reflection tracking']
@@ -1574,26 +2134,33 @@ class TwelveTerm(Calibration):
         Esr = self.coefs['reverse source match']
         Eir = self.coefs.get('reverse isolation',0)
 
+        def correct(m):
+            caled = npy.array(m, dtype=npy.result_type(m, complex))
 
-        D = (1+(s11-Edf)/(Erf)*Esf)*(1+(s22-Edr)/(Err)*Esr) -\
-            ((s21-Eif)/(Etf))*((s12-Eir)/(Etr))*Elf*Elr
+            s11 = m[...,0,0]
+            s12 = m[...,0,1]
+            s21 = m[...,1,0]
+            s22 = m[...,1,1]
 
+            D = (1+(s11-Edf)/(Erf)*Esf)*(1+(s22-Edr)/(Err)*Esr) -\
+                ((s21-Eif)/(Etf))*((s12-Eir)/(Etr))*Elf*Elr
 
-        caled.s[:,0,0] = \
-            (((s11-Edf)/(Erf))*(1+(s22-Edr)/(Err)*Esr)-\
-            Elf*((s21-Eif)/(Etf))*(s12-Eir)/(Etr)) /D
+            caled[...,0,0] = \
+                (((s11-Edf)/(Erf))*(1+(s22-Edr)/(Err)*Esr)-\
+                Elf*((s21-Eif)/(Etf))*(s12-Eir)/(Etr)) /D
 
-        caled.s[:,1,1] = \
-            (((s22-Edr)/(Err))*(1+(s11-Edf)/(Erf)*Esf)-\
-            Elr*((s21-Eif)/(Etf))*(s12-Eir)/(Etr)) /D
+            caled[...,1,1] = \
+                (((s22-Edr)/(Err))*(1+(s11-Edf)/(Erf)*Esf)-\
+                Elr*((s21-Eif)/(Etf))*(s12-Eir)/(Etr)) /D
 
-        caled.s[:,1,0] = \
-            ( ((s21 -Eif)/(Etf))*(1+((s22-Edr)/(Err))*(Esr-Elf)) )/D
+            caled[...,1,0] = \
+                ( ((s21 -Eif)/(Etf))*(1+((s22-Edr)/(Err))*(Esr-Elf)) )/D
 
-        caled.s[:,0,1] = \
-            ( ((s12 -Eir)/(Etr))*(1+((s11-Edf)/(Erf))*(Esf-Elr)) )/D
+            caled[...,0,1] = \
+                ( ((s12 -Eir)/(Etr))*(1+((s11-Edf)/(Erf))*(Esf-Elr)) )/D
 
-        return caled
+            return caled
+        return correct
 
     def embed(self, ntwk):
         measured = ntwk.copy()
@@ -1943,6 +2510,11 @@ class TwoPortOnePath(TwelveTerm):
 
             return out
 
+    def _array_corrector(self):
+        # a single measurement orientation is only partially corrected
+        return None
+
+
 class EnhancedResponse(TwoPortOnePath):
     '''
     Enhanced Response Partial Calibration
@@ -2094,45 +2666,41 @@ class EightTerm(Calibration):
         numCoefs = 7
 
 
-        mList = [k.s  for k in self.measured_unterminated]
-        iList = [k.s for k in self.ideals]
+        m = npy.array([k.s  for k in self.measured_unterminated])
+        i = npy.array([k.s for k in self.ideals])
 
-        fLength = len(mList[0])
+        fLength = m.shape[1]
         #initialize outputs
-        error_vector = npy.zeros(shape=(fLength,numCoefs),dtype=complex)
         residuals = npy.zeros(shape=(fLength,4*numStds-numCoefs),dtype=complex)
-        Q = npy.zeros((numStds*4, 7),dtype=complex)
-        M = npy.zeros((numStds*4, 1),dtype=complex)
-        # loop through frequencies and form m, a vectors and
-        # the matrix M. where M =       e00 + S11i
-        #                                                       i2, 1, i2*m2
-        #                                                                       ...etc
-        for f in list(range(fLength)):
-            # loop through standards and fill matrix
-            for k in list(range(numStds)):
-                m,i  = mList[k][f,:,:],iList[k][f,:,:] # 2x2 s-matrices
-                Q[k*4:k*4+4,:] = npy.array([\
-                        [ 1, i[0,0]*m[0,0], -i[0,0],    0,  i[1,0]*m[0,1],        0,         0   ],\
-                        [ 0, i[0,1]*m[0,0], -i[0,1],    0,  i[1,1]*m[0,1],        0,     -m[0,1] ],\
-                        [ 0, i[0,0]*m[1,0],     0,      0,  i[1,0]*m[1,1],   -i[1,0],        0   ],\
-                        [ 0, i[0,1]*m[1,0],     0,      1,  i[1,1]*m[1,1],   -i[1,1],    -m[1,1] ],\
-                        ])
-                #pdb.set_trace()
-                M[k*4:k*4+4,:] = npy.array([\
-                        [ m[0,0]],\
-                        [       0       ],\
-                        [ m[1,0]],\
-                        [       0       ],\
-                        ])
-
-            # calculate least squares
-            error_vector_at_f, residuals_at_f = npy.linalg.lstsq(Q,M,rcond=None)[0:2]
-            #if len (residualsTmp )==0:
-            #       raise ValueError( 'matrix has singular values, check standards')
-
 
-            error_vector[f,:] = error_vector_at_f.flatten()
-            residuals[f,:] = residuals_at_f
+        # form the matrices Q at all frequencies, with the 4 rows of each
+        # standard
+        #   [ 1, i00*m00, -i00, 0, i10*m01,    0,    0 ]
+        #   [ 0, i01*m00, -i01, 0, i11*m01,    0, -m01 ]
+        #   [ 0, i00*m10,    0, 0, i10*m11, -i10,    0 ]
+        #   [ 0, i01*m10,    0, 1, i11*m11, -i11, -m11 ]
+        # and the vector M = [m00, 0, m10, 0] of each standard, then solve
+        # them in the least squares sense
+        Q = npy.zeros((numStds, fLength, 4, numCoefs), dtype=complex)
+        Q[:,:,0,0] = 1
+        Q[:,:,3,3] = 1
+        Q[:,:,0:2,1] = i[:,:,0,:]*m[:,:,0,0,None]
+        Q[:,:,2:4,1] = i[:,:,0,:]*m[:,:,1,0,None]
+        Q[:,:,0:2,2] = -i[:,:,0,:]
+        Q[:,:,0:2,4] = i[:,:,1,:]*m[:,:,0,1,None]
+        Q[:,:,2:4,4] = i[:,:,1,:]*m[:,:,1,1,None]
+        Q[:,:,2:4,5] = -i[:,:,1,:]
+        Q[:,:,1,6] = -m[:,:,0,1]
+        Q[:,:,3,6] = -m[:,:,1,1]
+        M = npy.zeros((numStds, fLength, 4), dtype=complex)
+        M[:,:,0] = m[:,:,0,0]
+        M[:,:,2] = m[:,:,1,0]
+
+        Q = Q.transpose(1,0,2,3).reshape(fLength, 4*numStds, numCoefs)
+        M = M.transpose(1,0,2).reshape(fLength, 4*numStds, 1)
+        error_vector, residualsTmp, rank = lstsq_stacked(Q, M)
+        error_vector = error_vector[:,:,0]
+        residuals[:] = residualsTmp
 
         e = error_vector
         # put the error vector into human readable dictionary
@@ -2169,33 +2737,38 @@ class EightTerm(Calibration):
 
     def apply_cal(self, ntwk):
         caled = ntwk.copy()
-        inv = linalg.inv
 
-        T1,T2,T3,T4 = self.T_matrices
+        caled.s[:,1,0] -= self.coefs['forward isolation']
+        caled.s[:,0,1] -= self.coefs['reverse isolation']
 
-        ntwk.s[:,1,0] -= self.coefs['forward isolation']
-        ntwk.s[:,0,1] -= self.coefs['reverse isolation']
-
-        ntwk = self.unterminate(ntwk)
-        
-        for f in list(range(len(ntwk.s))):
-            t1,t2,t3,t4,m = T1[f,:,:],T2[f,:,:],T3[f,:,:],\
-                            T4[f,:,:],ntwk.s[f,:,:]
-            caled.s[f,:,:] = inv(-1*m.dot(t3)+t1).dot(m.dot(t4)-t2)
+        caled = self.unterminate(caled)
+        caled.s = correct_T_matrices(caled.s, *self.T_matrices)
         return caled
 
+    def _array_corrector(self):
+        if self.ut_hook is not None:
+            return None
+
+        T = self.T_matrices
+        isolation_f = self.coefs['forward isolation']
+        isolation_r = self.coefs['reverse isolation']
+        switch_terms = self.switch_terms
+
+        def correct(m):
+            m = npy.array(m, dtype=npy.result_type(m, complex))
+            m[...,1,0] -= isolation_f
+            m[...,0,1] -= isolation_r
+            if switch_terms is not None:
+                m = unterminate_s(m, switch_terms[0].s[:,0,0],
+                                  switch_terms[1].s[:,0,0])
+            return correct_T_matrices(m, *T)
+        return correct
+
     def embed(self, ntwk):
         '''
         '''
         embedded = ntwk.copy()
-        inv = linalg.inv
-
-        T1,T2,T3,T4 = self.T_matrices
-
-        for f in list(range(len(ntwk.s))):
-            t1,t2,t3,t4,a = T1[f,:,:],T2[f,:,:],T3[f,:,:],\
-                            T4[f,:,:],ntwk.s[f,:,:]
-            embedded.s[f,:,:] = (t1.dot(a)+t2).dot(inv(t3.dot(a)+t4))
+        embedded.s = embed_T_matrices(ntwk.s, *self.T_matrices)
 
         embedded = self.terminate(embedded)
 
@@ -2521,6 +3094,8 @@ class NISTMultilineTRL(EightTerm):
     .. [1] K. Yau "On the metrology of nanoscale Silicon transistors above 100 GHz" Ph.D. dissertation, Dept. Elec. Eng. and Comp. Eng., University of Toronto, Toronto, Canada, 2011.
     '''
     family = 'TRL'
+    # the propagation constant is solved over the whole frequency band
+    _pointwise = False
     def __init__(self, measured, Grefls, l,
                  er_est=1, refl_offset=None, ref_plane=0,
                  gamma_root_choice='estimate', k_method='multical', c0=None,
@@ -2664,16 +3239,23 @@ class NISTMultilineTRL(EightTerm):
             self_calibration=True,
             *args, **kwargs)
 
-        m_sw = [k for k in self.measured_unterminated]
-
-        n_reflects = len(self.Grefls)
+        if len(l) != len(self.measured) - len(self.Grefls):
+            raise ValueError("Different amount of lines and line lengths found")
 
-        self.measured_reflects = m_sw[1:1+n_reflects]
-        self.measured_lines = [m_sw[0]]
-        self.measured_lines.extend(m_sw[1+n_reflects:])
+    @property
+    def measured_reflects(self):
+        '''
+        Switch term corrected measurements of the reflects
+        '''
+        return self.measured_unterminated[1:1+len(self.Grefls)]
 
-        if len(l) != len(self.measured_lines):
-            raise ValueError("Different amount of lines and line lengths found")
+    @property
+    def measured_lines(self):
+        '''
+        Switch term corrected measurements of the lines
+        '''
+        m_sw = self.measured_unterminated
+        return [m_sw[0]] + m_sw[1+len(self.Grefls):]
 
     def run(self):
         c = 299792458.0
@@ -2681,46 +3263,30 @@ class NISTMultilineTRL(EightTerm):
 
         inv = linalg.inv
         exp = npy.exp
-        log = npy.log
-        abs = npy.abs
-        det = linalg.det
+        matmul = npy.matmul
 
         gamma_est_user = self.kwargs.get('gamma_est', None)
 
-        measured_reflects = self.measured_reflects
-        measured_lines = self.measured_lines
-        measured_lines_t = list(map(lambda x: s2t(x.s), self.measured_lines))
+        m_sw = self.measured_unterminated
+        measured_reflects = m_sw[1:1+len(self.Grefls)]
+        measured_lines = [m_sw[0]] + m_sw[1+len(self.Grefls):]
         l = self.l
         er_est = self.er_est
 
         freqs = measured_lines[0].f
         fpoints = len(freqs)
         lines = len(l)
-        gamma = npy.zeros(fpoints, dtype=npy.complex)
-        z0 = npy.zeros(fpoints, dtype=npy.complex)
-
-        gamma_est = (1j*2*pi*freqs[0]/c)*npy.sqrt(er_est.real + 1j*er_est.imag/(freqs[0]*1e-9))
-
-        line_c = npy.zeros(fpoints, dtype=int)
-        er_eff = npy.zeros(fpoints, dtype=npy.complex)
-
-        Tmat1 = npy.ones(shape=(fpoints, 2, 2), dtype=npy.complex)
-        Tmat2 = npy.ones(shape=(fpoints, 2, 2), dtype=npy.complex)
 
-        Smat1 = npy.ones(shape=(fpoints, 2, 2), dtype=npy.complex)
-        Smat2 = npy.ones(shape=(fpoints, 2, 2), dtype=npy.complex)
+        if self.k_method not in ['marks', 'multical']:
+            raise ValueError('Unknown k_method: {}'.format(self.k_method))
 
-        e = npy.zeros(shape=(fpoints, 7), dtype=npy.complex)
-        nstd = npy.zeros(shape=(fpoints), dtype=npy.float)
+        # s and T-matrices of all the lines, of shape (lines, fpoints, 2, 2)
+        lines_s = npy.array([k.s for k in measured_lines])
+        lines_t = s2t(lines_s.reshape(-1, 2, 2)).reshape(lines_s.shape)
 
-        def t2s_single(t):
-            return t2s(t[npy.newaxis,:,:])[0]
-
-        def s2t_single(s):
-            return s2t(s[npy.newaxis,:,:])[0]
+        gamma_est = (1j*2*pi*freqs[0]/c)*npy.sqrt(er_est.real + 1j*er_est.imag/(freqs[0]*1e-9))
 
-        def root_choice(Mij, dl, gamma_est):
-            e_val = linalg.eigvals(Mij)
+        def root_choice(e_val, dl, gamma_est):
             Da = [0,0]
             Db = [0,0]
             ga = [0,0]
@@ -2733,13 +3299,13 @@ class NISTMultilineTRL(EightTerm):
                     eij1 = e_val[1]
                     eij2 = e_val[0]
                 ea = (eij1 + 1/eij2)/2
-                periods = npy.round(((gamma_est*dl).imag - (-log(ea)).imag)/(2*pi))
-                ga[i] = (-log(ea) + 1j*2*pi*periods)/dl
+                periods = round(((gamma_est*dl).imag - (-cmath.log(ea)).imag)/(2*pi))
+                ga[i] = (-cmath.log(ea) + 1j*2*pi*periods)/dl
                 Da[i] = abs(ga[i]*dl - gamma_est*dl)/abs(gamma_est*dl)
 
                 eb = (eij2 + 1/eij1)/2
-                periods = npy.round(((gamma_est*dl).imag - (-log(eb)).imag)/(2*pi))
-                gb[i] = (-log(eb) + 1j*2*pi*periods)/dl
+                periods = round(((gamma_est*dl).imag - (-cmath.log(eb)).imag)/(2*pi))
+                gb[i] = (-cmath.log(eb) + 1j*2*pi*periods)/dl
                 Da[i] = abs(gb[i]*dl + gamma_est*dl)/abs(-gamma_est*dl)
             if Da[0] + Db[0] < 0.1*(Da[1] + Db[1]):
                 return e_val
@@ -2766,72 +3332,74 @@ class NISTMultilineTRL(EightTerm):
             #Unreachable
             return e_val
 
-        V_inv = npy.eye(lines-1, dtype=npy.complex) \
-                - (1.0/lines)*npy.ones(shape=(lines-1, lines-1), dtype=npy.complex)
-
-        b1_vec = npy.zeros(lines-1, dtype=npy.complex)
-        b2_vec = npy.zeros(lines-1, dtype=npy.complex)
-        CoA1_vec = npy.zeros(lines-1, dtype=npy.complex)
-        CoA2_vec = npy.zeros(lines-1, dtype=npy.complex)
-
-        b1_vec2 = npy.zeros(lines-1, dtype=npy.complex)
-        b2_vec2 = npy.zeros(lines-1, dtype=npy.complex)
-        CoA1_vec2 = npy.zeros(lines-1, dtype=npy.complex)
-        CoA2_vec2 = npy.zeros(lines-1, dtype=npy.complex)
-
-
+        # Eigenvalues of the line pairs with a common line, computed at all
+        # frequencies the first time the line is chosen as common line
+        eigenvalues = {}
+        def line_pair_eigenvalues(line_c):
+            if line_c not in eigenvalues:
+                Mij = matmul(lines_t, inv(lines_t[line_c]))
+                eigenvalues[line_c] = linalg.eigvals(Mij).tolist()
+            return eigenvalues[line_c]
+
+        # Line pairs used to find the common line, with their length
+        # differences
+        line_pairs = [(n, l[k] - l[n]) for n in range(lines) for k in range(n-1)]
+
+        # V_inv = I - 1/lines, the weighting of the Gauss-Markov estimate
+        # of the propagation constant
+        w = 1.0/lines
+
+        #Propagation constant extraction.
+        #The estimate of the propagation constant at a frequency is the
+        #solution at the previous frequency, so this runs frequency by frequency
+        #on the eigenvalues of the line pairs, computed beforehand.
+        gamma = npy.zeros(fpoints, dtype=complex)
+        line_c = npy.zeros(fpoints, dtype=int)
+        gamma_est = complex(gamma_est)
         for m in range(fpoints):
-            min_phi_eff = pi*npy.ones(lines)
+            min_phi_eff = [pi]*lines
             #Find the best common line to use
-            for n in range(lines):
-                for k in range(n-1):
-                    dl = l[k] - l[n]
-                    pd = abs(exp(-gamma_est*dl) - exp(gamma_est*dl))/2
-                    if -1 <= pd <= 1:
-                        phi_eff = npy.arcsin( pd )
-                    else:
-                        phi_eff = 0
-                    min_phi_eff[n] = min(min_phi_eff[n], phi_eff)
+            for n, dl in line_pairs:
+                pd = abs(cmath.exp(-gamma_est*dl) - cmath.exp(gamma_est*dl))/2
+                if -1 <= pd <= 1:
+                    phi_eff = math.asin(pd)
+                else:
+                    phi_eff = 0
+                min_phi_eff[n] = min(min_phi_eff[n], phi_eff)
             #Common line is selected to be one with the largest phase difference
-            line_c[m] = npy.argmax(min_phi_eff)
+            c_m = min_phi_eff.index(max(min_phi_eff))
+            line_c[m] = c_m
+            e_vals = line_pair_eigenvalues(c_m)
 
-            #Pre-calculate inverse T-matrix of the common line
-            inv_line_c = inv(measured_lines_t[line_c[m]][m])
-
-            #Propagation constant extraction
-            #Compute eigenvalues of each line pair
-
-            g_dl = npy.zeros(lines-1, dtype=npy.complex)
-            dl_vec = npy.zeros(lines-1, dtype=npy.complex)
-            k = 0
+            sum_dl = 0
+            sum_g_dl = 0
+            dl_g_dl = 0
+            dl_dl = 0
 
             for n in range(lines):
                 #Skip the common line
-                if n == line_c[m]:
+                if n == c_m:
                     continue
-                dl = l[n] - l[line_c[m]]
-                Mij = (measured_lines_t[n][m]).dot(inv_line_c)
+                dl = l[n] - l[c_m]
+                e_val = e_vals[n][m]
 
-                if 'estimate' in self.gamma_root_choice:
-                    #Choose the correct root later
-                    e_val = linalg.eigvals(Mij)
-                else:
+                if 'estimate' not in self.gamma_root_choice:
                     #Choose the correct root using heuristics
-                    e_val = root_choice(Mij, dl, gamma_est)
+                    e_val = root_choice(e_val, dl, gamma_est)
 
-                g_dl1 = -log(0.5*(e_val[0] + 1.0/e_val[1]))
-                g_dl2 = -log(0.5*(e_val[1] + 1.0/e_val[0]))
+                g_dl1 = -cmath.log(0.5*(e_val[0] + 1.0/e_val[1]))
+                g_dl2 = -cmath.log(0.5*(e_val[1] + 1.0/e_val[0]))
 
-                g_dl[k] = g_dl1
+                g_dl = g_dl1
 
                 if 'real' in self.gamma_root_choice and (g_dl1/dl).real < 0:
                     #Choose root that has bigger real part (more lossier)
-                    g_dl[k] = g_dl2
+                    g_dl = g_dl2
 
                 if 'imag' in self.gamma_root_choice and (g_dl1/dl).imag < 0:
                     #Choose root that has larger imaginary part
                     #Only works for short lines
-                    g_dl[k] = g_dl2
+                    g_dl = g_dl2
 
                 if 'estimate' in self.gamma_root_choice:
                     #Choose root that is closer to the estimate
@@ -2840,352 +3408,315 @@ class NISTMultilineTRL(EightTerm):
                     else:
                         #Use estimate from earlier iterations
                         g_est = gamma_est
-                    periods1 = npy.round( ((gamma_est*dl).imag - g_dl1.imag)/(2*pi))
-                    periods2 = npy.round( ((gamma_est*dl).imag - g_dl2.imag)/(2*pi))
+                    periods1 = round( ((gamma_est*dl).imag - g_dl1.imag)/(2*pi))
+                    periods2 = round( ((gamma_est*dl).imag - g_dl2.imag)/(2*pi))
                     g_dl1 += 1j*2*pi*periods1
                     g_dl2 += 1j*2*pi*periods2
 
                     if abs(g_dl1 - g_est*dl) < abs(g_dl2 - g_est*dl):
-                        g_dl[k] = g_dl1
+                        g_dl = g_dl1
                     else:
-                        g_dl[k] = g_dl2
+                        g_dl = g_dl2
                 else:
-                    periods = npy.round(((gamma_est*dl).imag - (g_dl[k].imag))/(2*pi))
-                    g_dl[k] += 1j*2*pi*periods
-                dl_vec[k] = dl
-                k = k + 1
-
-            gamma[m] = (dl_vec.transpose().dot(V_inv).dot(g_dl))/(dl_vec.transpose().dot(V_inv).dot(dl_vec))
+                    periods = round(((gamma_est*dl).imag - (g_dl.imag))/(2*pi))
+                    g_dl += 1j*2*pi*periods
 
-            if m != fpoints-1:
-                gamma_est = gamma[m].real + 1j*gamma[m].imag*freqs[m+1]/freqs[m]
-            er_eff[m] = -(gamma[m]/(2*pi*freqs[m]/c))**2
-
-            root1 = []
-            root2 = []
-
-            d1 = [0,0]
-            d2 = [0,0]
+                sum_dl += dl
+                sum_g_dl += g_dl
+                dl_g_dl += dl*g_dl
+                dl_dl += dl*dl
 
-            S_thru = measured_lines[0].s[m]
+            # (dl^T V_inv g_dl)/(dl^T V_inv dl)
+            gamma_m = (dl_g_dl - w*sum_dl*sum_g_dl)/(dl_dl - w*sum_dl*sum_dl)
+            gamma[m] = gamma_m
 
-            p = 0
-
-            for n in range(lines):
-                if n == line_c[m]:
-                    continue
-                #Port 1
-                T = measured_lines_t[n][m].dot(inv_line_c)
-                T = measured_lines[n].s[m,1,0]*measured_lines[line_c[m]].s[m,0,1]*T
-                e_val = linalg.eigvals(T)
-
-                B1 = npy.array([\
-                    [T[0,1]/(e_val[0]-T[0,0]), T[0,1]/(e_val[1]-T[0,0])],
-                    [(e_val[0]-T[1,1])/T[1,0], (e_val[1]-T[1,1])/T[1,0]]])
-                CoA1 = npy.array([\
-                    [T[1,0]/(e_val[1]-T[1,1]), T[1,0]/(e_val[0]-T[1,1])],
-                    [(e_val[1]-T[0,0])/T[0,1], (e_val[0]-T[0,0])/T[0,1]]])
-                B_est1 = T[0,1]/(exp(gamma[m]*(l[n]-l[line_c[m]]) - T[0,0]))
-                CoA_est1 = T[1,0]/(exp(-gamma[m]*(l[n]-l[line_c[m]]) - T[1,1]))
-                dB1 = abs(B1 - B_est1)/abs(B_est1)
-                dCoA1 = abs(CoA1 - CoA_est1)/abs(CoA_est1)
-
-                if abs(B1[0,1] - B_est1) < abs(B1[1,1] - B_est1):
-                    b1_vec[p] = B1[0,1]
-                    b1_vec2[p] = B1[0,0]
-                    root1.append([0,1])
-                else:
-                    b1_vec[p] = B1[1,1]
-                    b1_vec2[p] = B1[1,0]
-                    root1.append([1,1])
-
-                if abs(CoA1[0,1] - CoA_est1) < abs(CoA1[1,1] - CoA_est1):
-                    CoA1_vec[p] = CoA1[0,1]
-                    CoA1_vec2[p] = CoA1[0,0]
-                else:
-                    CoA1_vec[p] = CoA1[1,1]
-                    CoA1_vec2[p] = CoA1[1,0]
-
-                d1[0] += npy.sum(dB1[:,root1[-1][1]]) + npy.sum(dCoA1[:,root1[-1][1]])
-                d1[1] += npy.sum(dB1[:,int(not root1[-1][1])]) + npy.sum(dCoA1[:,int(not root1[-1][1])])
-
-                #Port 2
-                k = npy.array([[0,1],[1,0]], dtype=npy.complex)
-
-                T = s2t_single(k.dot(measured_lines[n].s[m]).dot(k)).dot(\
-                        inv(s2t_single(k.dot(measured_lines[line_c[m]].s[m]).dot(k))))
-                T = measured_lines[n].s[m][0,1]*measured_lines[line_c[m]].s[m][1,0]*T
-                e_val = linalg.eigvals(T)
-
-                B2 = npy.array([\
-                    [T[0,1]/(e_val[0]-T[0,0]), T[0,1]/(e_val[1]-T[0,0])],
-                    [(e_val[0]-T[1,1])/T[1,0], (e_val[1]-T[1,1])/T[1,0]]])
-                CoA2 = npy.array([\
-                    [T[1,0]/(e_val[1]-T[1,1]), T[1,0]/(e_val[0]-T[1,1])],
-                    [(e_val[1]-T[0,0])/T[0,1], (e_val[0]-T[0,0])/T[0,1]]])
-                B_est2 = T[0,1]/(exp(gamma[m]*(l[n]-l[line_c[m]]) - T[0,0]))
-                CoA_est2 = T[1,0]/(exp(-gamma[m]*(l[n]-l[line_c[m]]) - T[1,1]))
-                dB2 = abs(B2 - B_est2)/abs(B_est2)
-                dCoA2 = abs(CoA2 - CoA_est2)/abs(CoA_est2)
-
-                if abs(B2[0,1] - B_est2) < abs(B2[1,1] - B_est2):
-                    b2_vec[p] = B2[0,1]
-                    b2_vec2[p] = B2[0,0]
-                    root2.append([0,1])
-                else:
-                    b2_vec[p] = B2[1,1]
-                    b2_vec2[p] = B2[1,0]
-                    root2.append([1,1])
-
-                if abs(CoA2[0,1] - CoA_est2) < abs(CoA2[1,1] - CoA_est2):
-                    CoA2_vec[p] = CoA2[0,1]
-                    CoA2_vec2[p] = CoA2[0,0]
-                else:
-                    CoA2_vec[p] = CoA2[1,1]
-                    CoA2_vec2[p] = CoA2[1,0]
-
-                d2[0] += npy.sum(dB2[:,root2[-1][1]]) + npy.sum(dCoA2[:,root2[-1][1]])
-                d2[1] += npy.sum(dB2[:,int(not root2[-1][1])]) + npy.sum(dCoA2[:,int(not root2[-1][1])])
-
-                p += 1
-
-            Vb = npy.zeros(shape=(lines-1,lines-1), dtype=npy.complex)
-            Vc = npy.zeros(shape=(lines-1,lines-1), dtype=npy.complex)
-            #Fill in upper triangular matrix
-            l_not_common = [i for i in l if i != l[line_c[m]]]
-            for b in range(len(l_not_common)):
-                for a in range(b+1):
-                    if a == b: #Diagonal
-                        len_l = l_not_common[a]
-                        exp_factor = exp(-gamma[m]*(len_l - l[line_c[m]]))
-                        Vb[a,b] = abs(exp_factor)**2 + 1/abs(exp_factor)**2 + \
-                                2*( abs(exp(-gamma[m]*len_l))*\
-                                abs(exp(-gamma[m]*l[line_c[m]])) )**2
-                        n = abs(exp_factor - 1/exp_factor)**2
-                        Vb[a,b] /= n
-
-                        Vc[a,b] = abs(exp_factor)**2 + 1/(abs(exp_factor))**2 + \
-                                2/( abs(exp(-gamma[m]*l[line_c[m]]))*\
-                                abs(exp(-gamma[m]*len_l)) )**2
-                        Vc[a,b] /= n
-                    elif a < b:
-                        len_a = l_not_common[a]
-                        len_b = l_not_common[b]
-                        exp_factor = exp(-gamma[m]*(len_a -l[line_c[m]]))
-                        exp_factor2 = exp(-gamma[m]*(len_b -l[line_c[m]]))
-                        Vb[a,b] = exp_factor2*exp_factor.conjugate() + \
-                                (abs(exp(-gamma[m]*l[line_c[m]])))**2 * \
-                                exp(-gamma[m]*len_b)*(exp(-gamma[m]*len_a)).conjugate()
-                        n = (exp_factor - 1/exp_factor).conjugate()* \
-                                (exp_factor2-1/exp_factor2)
-                        Vb[a,b] /= n
-                        Vb[b,a] = Vb[a,b].conjugate()
-
-                        Vc[a,b] = 1/(exp_factor2*exp_factor.conjugate()) + \
-                                1/( (abs(exp(-gamma[m]*l[line_c[m]])))**2 * \
-                                exp(-gamma[m]*len_b)*(exp(-gamma[m]*len_a)).conjugate() )
-                        Vc[a,b] /= n
-                        Vc[b,a] = Vc[a,b].conjugate()
-
-            def solve_A(B1, B2, CoA1, CoA2):
-                #Determine A using unknown reflect
-                Ap = B1*B2 - B1*S_thru[1,1] - B2*S_thru[0,0] + linalg.det(S_thru)
-                Ap = -Ap/(1 - CoA1*S_thru[0,0] - CoA2*S_thru[1,1] + CoA1*CoA2*linalg.det(S_thru))
-
-                A1_vals = npy.zeros(len(measured_reflects), dtype=npy.complex)
-                A2_vals = npy.zeros(len(measured_reflects), dtype=npy.complex)
-
-                for n in range(len(measured_reflects)):
-                    S_r = measured_reflects[n].s[m]
-
-                    S_r11 = S_r[0,0]
-                    S_r22 = S_r[1,1]
-
-                    Arr = (S_r11 - B1)/(1 - S_r11*CoA1)* \
-                            (1 - S_r22*CoA2)/(S_r22 - B2)
-                    Gr_est = self.Grefls[n]*exp(-2*gamma[m]*(self.refl_offset[n] - l[0]/2.))
-                    G_trial = (S_r[0,0] - B1)/(npy.sqrt(Ap*Arr)*(1 - S_r[0,0]*CoA1))
-                    if abs( Gr_est/abs(Gr_est) - G_trial/abs(G_trial) ) > npy.sqrt(2):
-                        A1_vals[n] = -npy.sqrt(Ap*Arr)
-                    else:
-                        A1_vals[n] = npy.sqrt(Ap*Arr)
-                    A2_vals[n] = A1_vals[n]/Arr
-
-                A1 = npy.mean(A1_vals)
-                A2 = npy.mean(A2_vals)
-                return A1, A2
-
-            values = []
-            #List possible root choices for B and CoA
-            for i in [(0,0), (0,1), (1,0), (1,1)]:
-                if i[0] == 0:
-                    b1 = b1_vec
-                    coa1 = CoA1_vec
-                else:
-                    b1 = b1_vec2
-                    coa1 = CoA1_vec2
-
-                if i[1] == 0:
-                    b2 = b2_vec
-                    coa2 = CoA2_vec
-                else:
-                    b2 = b2_vec2
-                    coa2 = CoA2_vec2
-
-                inv_Vb = inv(Vb)
-                inv_Vc = inv(Vc)
-                sum_inv_Vb = npy.sum(inv_Vb)
-                sum_inv_Vc = npy.sum(inv_Vc)
-
-                B1 = npy.sum(inv_Vb.dot(b1))/sum_inv_Vb
-                B2 = npy.sum(inv_Vb.dot(b2))/sum_inv_Vb
-                CoA1 = npy.sum(inv_Vc.dot(coa1))/sum_inv_Vc
-                CoA2 = npy.sum(inv_Vc.dot(coa2))/sum_inv_Vc
-
-                denom = 1 - CoA1*S_thru[0,0] - CoA2*S_thru[1,1] + CoA1*CoA2*\
-                (S_thru[0,0]*S_thru[1,1] - S_thru[0,1]*S_thru[1,0])
-
-                values.append( (abs(denom), B1, B2, CoA1, CoA2) )
-
-            if abs(values[0][0]) > 1e-9 and d1[1]/d1[0] > 10 and d2[1]/d2[0] > 10:
-                #Estimate seems to be correct
-                B1, B2, CoA1, CoA2 = values[0][1:]
-                A1, A2 = solve_A(B1, B2, CoA1, CoA2)
-            else:
-                #Estimation is incorrect or the accuracy is bad
-                #Choose the root that minimizes error to measurements
-                best_error = None
-                best_values = []
-                for v in values:
-                    if abs(v[0]) < 1e-9:
-                        continue
-                    B1, B2, CoA1, CoA2 = v[1:]
-                    A1, A2 = solve_A(B1, B2, CoA1, CoA2)
-                    C1 = CoA1*A1
-                    C2 = CoA2*A2
-                    R = S_thru[0,1]*(1 - C1*C2)/(A1 - B1*C1)
-
-                    T1 = R*npy.array([[A1, B1],[C1, 1]])
-                    g = npy.array([[0,1],[1,0]])
-                    T2 = npy.array([[A2, B2],[C2, 1]])
-
-                    error = 0
-                    for n in range(lines):
-                        meas = measured_lines[n].s[m]
-                        ideal = npy.array([[exp(-gamma[m]*l[n]), 0],[0,exp(gamma[m]*l[n])]])
-                        embedded = t2s_single(T1.dot(ideal).dot(g.dot(inv(T2).dot(g))))
-
-                        error += npy.sum(abs(embedded - meas))
-                    if best_error == None or error < best_error:
-                        best_error = error
-                        best_values = v
-                B1, B2, CoA1, CoA2 = best_values[1:]
-                A1, A2 = solve_A(B1, B2, CoA1, CoA2)
-
-            sigmab = npy.sqrt(1/(npy.sum(inv(Vb)).real))
-            sigmac = npy.sqrt(1/(npy.sum(inv(Vc)).real))
-
-            nstd[m] = (sigmab + sigmac)/2
-
-            C1 = CoA1*A1
-            C2 = CoA2*A2
-
-            #Determine R1, R2
-            if self.k_method == 'marks':
-                p1_len_est = self.kwargs.get('p1_len_est', 0)
-                p2_len_est = self.kwargs.get('p2_len_est', 0)
-
-                z0_phase = npy.angle( npy.sqrt(er_eff[m]) )
-                Qox = ( 1 - 1j*z0_phase)
-                Qoy = ( 1 - 1j*z0_phase)
-
-                R1R2 = (S_thru[1,0]*(1 - C1*C2))**-1
-                gam = A2 - B2*C2
-                de = (A1-B1*C1)*(R1R2*(A2-B2*C2))**2
-                beta_sqr = (abs(de)**2 + abs(gam)**2)/\
-                        (de.conjugate()*Qox + de.conjugate()*Qoy)
-                s21y = npy.sqrt( beta_sqr )
-                R2 = ((A2 -B2*C2)/s21y)**-1
-
-                R2_est = exp(gamma[m]*p2_len_est)
-                if abs( R2_est/abs(R2_est) -R2/abs(R2) ) > npy.sqrt(2):
-                    R2 = -R2
-                R1 = R1R2/R2
-                R1_est = exp(gamma[m]*p1_len_est)
-
-                if abs( R1_est/abs(R1_est) - R1/abs(R1) ) > npy.sqrt(2):
-                    warn('Inconsistencies detected')
-            elif self.k_method == 'multical':
-                denom = 1 - CoA1*S_thru[0,0] - CoA2*S_thru[1,1] + CoA1*CoA2*\
-                (S_thru[0,0]*S_thru[1,1] - S_thru[0,1]*S_thru[1,0])
-                R1 = S_thru[0,1]/denom
-                R2 = S_thru[1,0]/denom
-            else:
-                raise ValueError('Unknown k_method: {}'.format(self.k_method))
+            if m != fpoints-1:
+                gamma_est = gamma_m.real + 1j*gamma_m.imag*freqs[m+1]/freqs[m]
+
+        er_eff = -(gamma/(2*pi*freqs/c))**2
+
+        #Everything else is solved at all frequencies at once.
+        #Lines other than the common line, in order, at each frequency
+        f_index = npy.arange(fpoints)
+        others = npy.arange(lines-1)[None,:]
+        others = others + (others >= line_c[:,None])
+        l_array = npy.array(l, dtype=float)
+        l_c = l_array[line_c][:,None]
+        l_others = l_array[others]
+        g = gamma[:,None]
+
+        s_c = lines_s[line_c, f_index]
+        s_others = lines_s[others, f_index[:,None]]
+        inv_t_c = inv(lines_t[line_c, f_index])
+
+        S_thru = lines_s[0]
+        S_thru_det = linalg.det(S_thru)
+
+        def solve_B_CoA(T, dl):
+            #B and A/C estimates of all the line pairs, for both roots
+            e_val = linalg.eigvals(T)
+            e0, e1 = e_val[...,0], e_val[...,1]
+            T00, T01, T10, T11 = T[...,0,0], T[...,0,1], T[...,1,0], T[...,1,1]
+
+            B00, B01 = T01/(e0-T00), T01/(e1-T00)
+            B10, B11 = (e0-T11)/T10, (e1-T11)/T10
+            CoA00, CoA01 = T10/(e1-T11), T10/(e0-T11)
+            CoA10, CoA11 = (e1-T00)/T01, (e0-T00)/T01
+
+            B_est = T01/(exp(g*dl - T00))
+            CoA_est = T10/(exp(-g*dl - T11))
+
+            choose = abs(B01 - B_est) < abs(B11 - B_est)
+            b_vec = npy.where(choose, B01, B11)
+            b_vec2 = npy.where(choose, B00, B10)
+
+            choose = abs(CoA01 - CoA_est) < abs(CoA11 - CoA_est)
+            CoA_vec = npy.where(choose, CoA01, CoA11)
+            CoA_vec2 = npy.where(choose, CoA00, CoA10)
+
+            dB = lambda B: abs(B - B_est)/abs(B_est)
+            dCoA = lambda CoA: abs(CoA - CoA_est)/abs(CoA_est)
+            d = [npy.sum(dB(B01) + dB(B11) + dCoA(CoA01) + dCoA(CoA11), axis=1),
+                 npy.sum(dB(B00) + dB(B10) + dCoA(CoA00) + dCoA(CoA10), axis=1)]
+            return (b_vec, b_vec2), (CoA_vec, CoA_vec2), d
+
+        dl = l_others - l_c
+
+        #Port 1
+        T = matmul(lines_t[others, f_index[:,None]], inv_t_c[:,None])
+        T = (s_others[...,1,0]*s_c[:,None,0,1])[...,None,None]*T
+        b1, CoA1_vecs, d1 = solve_B_CoA(T, dl)
+
+        #Port 2
+        s_flip = s_others[...,::-1,::-1]
+        t_flip = s2t(s_flip.reshape(-1, 2, 2)).reshape(s_flip.shape)
+        T = matmul(t_flip, inv(s2t(s_c[...,::-1,::-1]))[:,None])
+        T = (s_others[...,0,1]*s_c[:,None,1,0])[...,None,None]*T
+        b2, CoA2_vecs, d2 = solve_B_CoA(T, dl)
+
+        #Covariance matrices of the line pairs
+        exp_factor = exp(-g*(l_others - l_c))
+        exp_l = exp(-g*l_others)
+        exp_c = exp(-g*l_c)
+        norm = abs(exp_factor - 1/exp_factor)**2
+        Vb_diag = (abs(exp_factor)**2 + 1/abs(exp_factor)**2 + \
+                2*( abs(exp_l)*abs(exp_c) )**2)/norm
+        Vc_diag = (abs(exp_factor)**2 + 1/(abs(exp_factor))**2 + \
+                2/( abs(exp_c)*abs(exp_l) )**2)/norm
+
+        exp_factor_a = exp_factor[:,:,None]
+        exp_factor_b = exp_factor[:,None,:]
+        exp_a = exp_l[:,:,None]
+        exp_b = exp_l[:,None,:]
+        exp_c2 = (abs(exp_c)**2)[:,:,None]
+        norm = (exp_factor_a - 1/exp_factor_a).conjugate()*(exp_factor_b - 1/exp_factor_b)
+        with npy.errstate(divide='ignore', invalid='ignore'):
+            Vb = (exp_factor_b*exp_factor_a.conjugate() + \
+                    exp_c2*exp_b*exp_a.conjugate())/norm
+            Vc = (1/(exp_factor_b*exp_factor_a.conjugate()) + \
+                    1/(exp_c2*exp_b*exp_a.conjugate()))/norm
+        upper = npy.triu(npy.ones((lines-1, lines-1), dtype=bool), 1)
+        diag = npy.eye(lines-1, dtype=bool)
+        Vb = npy.where(upper, Vb, Vb.transpose(0,2,1).conjugate())
+        Vc = npy.where(upper, Vc, Vc.transpose(0,2,1).conjugate())
+        Vb[:,diag] = Vb_diag
+        Vc[:,diag] = Vc_diag
+
+        inv_Vb = inv(Vb)
+        inv_Vc = inv(Vc)
+        sum_inv_Vb = npy.sum(inv_Vb, axis=(1,2))
+        sum_inv_Vc = npy.sum(inv_Vc, axis=(1,2))
+
+        def weighted(inv_V, sum_inv_V, x):
+            return npy.sum(matmul(inv_V, x[...,None]), axis=(1,2))/sum_inv_V
+
+        B1_roots = [weighted(inv_Vb, sum_inv_Vb, b) for b in b1]
+        B2_roots = [weighted(inv_Vb, sum_inv_Vb, b) for b in b2]
+        CoA1_roots = [weighted(inv_Vc, sum_inv_Vc, x) for x in CoA1_vecs]
+        CoA2_roots = [weighted(inv_Vc, sum_inv_Vc, x) for x in CoA2_vecs]
+
+        def solve_A(B1, B2, CoA1, CoA2, index):
+            #Determine A using unknown reflect
+            S = S_thru[index]
+            Ap = B1*B2 - B1*S[:,1,1] - B2*S[:,0,0] + S_thru_det[index]
+            Ap = -Ap/(1 - CoA1*S[:,0,0] - CoA2*S[:,1,1] + CoA1*CoA2*S_thru_det[index])
+
+            A1_vals = []
+            A2_vals = []
+
+            for n in range(len(measured_reflects)):
+                S_r = measured_reflects[n].s[index]
+
+                S_r11 = S_r[:,0,0]
+                S_r22 = S_r[:,1,1]
+
+                Arr = (S_r11 - B1)/(1 - S_r11*CoA1)* \
+                        (1 - S_r22*CoA2)/(S_r22 - B2)
+                Gr_est = self.Grefls[n]*exp(-2*gamma[index]*(self.refl_offset[n] - l[0]/2.))
+                sqrt_ApArr = npy.sqrt(Ap*Arr)
+                G_trial = (S_r[:,0,0] - B1)/(sqrt_ApArr*(1 - S_r[:,0,0]*CoA1))
+                A1_vals.append(npy.where(
+                    abs( Gr_est/abs(Gr_est) - G_trial/abs(G_trial) ) > npy.sqrt(2),
+                    -sqrt_ApArr, sqrt_ApArr))
+                A2_vals.append(A1_vals[-1]/Arr)
+
+            A1 = npy.mean(A1_vals, axis=0)
+            A2 = npy.mean(A2_vals, axis=0)
+            return A1, A2
+
+        #Possible root choices for B and CoA
+        roots = [(0,0), (0,1), (1,0), (1,1)]
+        denoms = [abs(1 - CoA1_roots[i]*S_thru[:,0,0] - CoA2_roots[j]*S_thru[:,1,1] + \
+                  CoA1_roots[i]*CoA2_roots[j]*\
+                  (S_thru[:,0,0]*S_thru[:,1,1] - S_thru[:,0,1]*S_thru[:,1,0]))
+                  for i, j in roots]
+
+        with npy.errstate(divide='ignore', invalid='ignore'):
+            #Estimate seems to be correct
+            estimated = (denoms[0] > 1e-9) & (d1[1]/d1[0] > 10) & (d2[1]/d2[0] > 10)
+        root = npy.zeros(fpoints, dtype=int)
+
+        #Where the estimation is incorrect or the accuracy is bad,
+        #choose the root that minimizes error to measurements
+        index = npy.nonzero(~estimated)[0]
+        if len(index):
+            g_sw = npy.array([[0,1],[1,0]])
+            errors = npy.full((len(roots), len(index)), npy.inf)
+            for r, (i, j) in enumerate(roots):
+                valid = denoms[r][index] >= 1e-9
+                idx = index[valid]
+                B1, B2 = B1_roots[i][idx], B2_roots[j][idx]
+                CoA1, CoA2 = CoA1_roots[i][idx], CoA2_roots[j][idx]
+                A1, A2 = solve_A(B1, B2, CoA1, CoA2, idx)
+                C1 = CoA1*A1
+                C2 = CoA2*A2
+                R = S_thru[idx,0,1]*(1 - C1*C2)/(A1 - B1*C1)
+
+                T1 = R[:,None,None]*npy.moveaxis(npy.array([[A1, B1],[C1, npy.ones(len(idx))]]), -1, 0)
+                T2 = npy.moveaxis(npy.array([[A2, B2],[C2, npy.ones(len(idx))]]), -1, 0)
+                T2 = matmul(g_sw, matmul(inv(T2), g_sw))
+
+                error = 0
+                for n in range(lines):
+                    meas = lines_s[n][idx]
+                    ideal = npy.zeros((len(idx), 2, 2), dtype=complex)
+                    ideal[:,0,0] = exp(-gamma[idx]*l[n])
+                    ideal[:,1,1] = exp(gamma[idx]*l[n])
+                    embedded = t2s(matmul(matmul(T1, ideal), T2))
+
+                    error += npy.sum(abs(embedded - meas), axis=(1,2))
+                errors[r, valid] = error
+            if npy.any(npy.all(npy.isinf(errors), axis=0)):
+                raise ValueError('No root choice gives a solvable calibration.')
+            root[index] = npy.argmin(errors, axis=0)
+
+        roots = npy.array(roots)
+        B1 = npy.choose(roots[root,0], B1_roots)
+        B2 = npy.choose(roots[root,1], B2_roots)
+        CoA1 = npy.choose(roots[root,0], CoA1_roots)
+        CoA2 = npy.choose(roots[root,1], CoA2_roots)
+        A1, A2 = solve_A(B1, B2, CoA1, CoA2, f_index)
+
+        sigmab = npy.sqrt(1/(sum_inv_Vb.real))
+        sigmac = npy.sqrt(1/(sum_inv_Vc.real))
+
+        nstd = (sigmab + sigmac)/2
+
+        C1 = CoA1*A1
+        C2 = CoA2*A2
+
+        #Determine R1, R2
+        if self.k_method == 'marks':
+            p1_len_est = self.kwargs.get('p1_len_est', 0)
+            p2_len_est = self.kwargs.get('p2_len_est', 0)
+
+            z0_phase = npy.angle( npy.sqrt(er_eff) )
+            Qox = ( 1 - 1j*z0_phase)
+            Qoy = ( 1 - 1j*z0_phase)
+
+            R1R2 = (S_thru[:,1,0]*(1 - C1*C2))**-1
+            gam = A2 - B2*C2
+            de = (A1-B1*C1)*(R1R2*(A2-B2*C2))**2
+            beta_sqr = (abs(de)**2 + abs(gam)**2)/\
+                    (de.conjugate()*Qox + de.conjugate()*Qoy)
+            s21y = npy.sqrt( beta_sqr )
+            R2 = ((A2 -B2*C2)/s21y)**-1
+
+            R2_est = exp(gamma*p2_len_est)
+            R2 = npy.where(abs( R2_est/abs(R2_est) -R2/abs(R2) ) > npy.sqrt(2), -R2, R2)
+            R1 = R1R2/R2
+            R1_est = exp(gamma*p1_len_est)
+
+            if npy.any(abs( R1_est/abs(R1_est) - R1/abs(R1) ) > npy.sqrt(2)):
+                warn('Inconsistencies detected')
+        else:
+            denom = 1 - CoA1*S_thru[:,0,0] - CoA2*S_thru[:,1,1] + CoA1*CoA2*\
+            (S_thru[:,0,0]*S_thru[:,1,1] - S_thru[:,0,1]*S_thru[:,1,0])
+            R1 = S_thru[:,0,1]/denom
+            R2 = S_thru[:,1,0]/denom
 
-            #Reference plane shift
-            if self.ref_plane != 0:
-                try:
-                    shift1 = exp(-2*gamma[m]*self.ref_plane[0])
-                    shift2 = exp(-2*gamma[m]*self.ref_plane[1])
-                except TypeError:
-                    shift1 = exp(-2*gamma[m]*self.ref_plane)
-                    shift2 = exp(-2*gamma[m]*self.ref_plane)
-                A1 *= shift1
-                A2 *= shift2
-                C1 *= shift1
-                C2 *= shift2
-                R1 *= shift1
-                R2 *= shift2
-
-            if self.c0 is not None:
-                #Estimate the line characteristic impedance
-                #using known capacitance/length
-                if self.z0_line is not None:
-                    raise ValueError('Only one of c0 or z0_line can be given.')
-                try:
-                    c0m = self.c0[m]
-                except TypeError:
-                    c0m = self.c0
-                z0[m] = gamma[m]/(1j*2*npy.pi*freqs[m]*c0m)
+        #Reference plane shift
+        if self.ref_plane != 0:
+            try:
+                shift1 = exp(-2*gamma*self.ref_plane[0])
+                shift2 = exp(-2*gamma*self.ref_plane[1])
+            except TypeError:
+                shift1 = exp(-2*gamma*self.ref_plane)
+                shift2 = exp(-2*gamma*self.ref_plane)
+            A1 = A1*shift1
+            A2 = A2*shift2
+            C1 = C1*shift1
+            C2 = C2*shift2
+            R1 = R1*shift1
+            R2 = R2*shift2
+
+        def per_frequency(value):
+            try:
+                value[0]
+            except TypeError:
+                return value
+            return npy.asarray(value)[:fpoints]
+
+        z0 = npy.zeros(fpoints, dtype=complex)
+        if self.c0 is not None:
+            #Estimate the line characteristic impedance
+            #using known capacitance/length
+            if self.z0_line is not None:
+                raise ValueError('Only one of c0 or z0_line can be given.')
+            z0[:] = gamma/(1j*2*npy.pi*freqs*per_frequency(self.c0))
+        else:
+            #Set the known line characteristic impedance
+            if self.z0_line is not None:
+                z0[:] = per_frequency(self.z0_line)
             else:
-                #Set the known line characteristic impedance
-                if self.z0_line is not None:
-                    try:
-                        z0[m] = self.z0_line[m]
-                    except TypeError:
-                        z0[m] = self.z0_line
-                else:
-                    try:
-                        z0[m] = self.z0_ref[m]
-                    except TypeError:
-                        z0[m] = self.z0_ref
+                z0[:] = per_frequency(self.z0_ref)
 
-            #Error matrices
-            Tmat1[m,:,:] = R1*npy.array([[A1, B1],[C1, 1]])
-            Tmat2[m,:,:] = R2*npy.array([[A2, B2],[C2, 1]])
+        #Error matrices
+        one = npy.ones(fpoints)
+        Tmat1 = R1[:,None,None]*npy.moveaxis(npy.array([[A1, B1],[C1, one]]), -1, 0)
+        Tmat2 = R2[:,None,None]*npy.moveaxis(npy.array([[A2, B2],[C2, one]]), -1, 0)
 
-            Smat1[m,:,:] = t2s_single(Tmat1[m,:,:])
-            Smat2[m,:,:] = t2s_single(Tmat2[m,:,:])
+        Smat1 = t2s(Tmat1)
+        Smat2 = t2s(Tmat2)
 
-            #Convert the error coefficients to
-            #definitions used by the EightTerm class.
-            dx = linalg.det(Smat1[m,:,:])
-            dy = linalg.det(Smat2[m,:,:])
+        #Convert the error coefficients to
+        #definitions used by the EightTerm class.
+        dx = linalg.det(Smat1)
+        dy = linalg.det(Smat2)
 
-            if self.k_method == 'marks':
-                k = Smat1[m,1,0]/Smat2[m,0,1]
-            else:
-                k = dx*dy*Smat1[m,1,0]/(Smat2[m,0,1]*Smat2[m,1,0])
+        if self.k_method == 'marks':
+            k = Smat1[:,1,0]/Smat2[:,0,1]
+        else:
+            k = dx*dy*Smat1[:,1,0]/(Smat2[:,0,1]*Smat2[:,1,0])
 
-            #Error coefficients
-            e[m] = [Smat1[m,0,0],
-                    Smat1[m,1,1],
-                    dx,
-                    Smat2[m,0,0],
-                    Smat2[m,1,1],
-                    dy,
-                    k]
+        #Error coefficients
+        e = npy.stack([Smat1[:,0,0],
+                       Smat1[:,1,1],
+                       dx,
+                       Smat2[:,0,0],
+                       Smat2[:,1,1],
+                       dy,
+                       k], axis=1)
 
         self._z0 = z0
         self._gamma = gamma
@@ -3837,31 +4368,26 @@ class SixteenTerm(Calibration):
         return None
 
     def apply_cal(self, ntwk):
-        caled = ntwk.copy()
-        inv = linalg.inv
+        caled = self.unterminate(ntwk.copy())
+        caled.s = correct_T_matrices(caled.s, *self.T_matrices)
+        return caled
 
-        T1,T2,T3,T4 = self.T_matrices
+    def _array_corrector(self):
+        T = self.T_matrices
+        switch_terms = self.switch_terms
 
-        ntwk = self.unterminate(ntwk)
-
-        for f in list(range(len(ntwk.s))):
-            t1,t2,t3,t4,m = T1[f,:,:],T2[f,:,:],T3[f,:,:],\
-                            T4[f,:,:],ntwk.s[f,:,:]
-            caled.s[f,:,:] = inv(-1*m.dot(t3)+t1).dot(m.dot(t4)-t2)
-        return caled
+        def correct(m):
+            if switch_terms is not None:
+                m = unterminate_s(m, switch_terms[0].s[:,0,0],
+                                  switch_terms[1].s[:,0,0])
+            return correct_T_matrices(m, *T)
+        return correct
 
     def embed(self, ntwk):
         '''
         '''
         embedded = ntwk.copy()
-        inv = linalg.inv
-
-        T1,T2,T3,T4 = self.T_matrices
-
-        for f in list(range(len(ntwk.s))):
-            t1,t2,t3,t4,a = T1[f,:,:],T2[f,:,:],T3[f,:,:],\
-                            T4[f,:,:],ntwk.s[f,:,:]
-            embedded.s[f,:,:] = (t1.dot(a)+t2).dot(inv(t3.dot(a)+t4))
+        embedded.s = embed_T_matrices(ntwk.s, *self.T_matrices)
 
         embedded = self.terminate(embedded)
 
@@ -3915,17 +4441,11 @@ class SixteenTerm(Calibration):
                 [ e401 , e411]])\
                 .transpose().reshape(-1,2,2)
 
-        T1 = npy.zeros(E1.shape, dtype=npy.complex)
-        T2 = T1.copy()
-        T3 = T1.copy()
-        T4 = T1.copy()
-
-        invE3 = inv(E3)
-        for i in range(npoints):
-            T1[i] = E2[i] - E1[i].dot(invE3[i]).dot(E4[i])
-            T2[i] = E1[i].dot(invE3[i])
-            T3[i] = -invE3[i].dot(E4[i])
-            T4[i] = invE3[i]
+        matmul = npy.matmul
+        T4 = inv(E3)
+        T2 = matmul(E1, T4)
+        T3 = -matmul(T4, E4)
+        T1 = E2 - matmul(T2, E4)
 
         return T1, T2, T3, T4
 
@@ -3934,19 +4454,12 @@ class SixteenTerm(Calibration):
         Convert solved calibration T matrices to S-parameters.
         '''
 
-        inv = linalg.inv
+        matmul = npy.matmul
 
-        E1 = npy.zeros(T1.shape, dtype=npy.complex)
-        E2 = npy.zeros(T2.shape, dtype=npy.complex)
-        E3 = npy.zeros(T3.shape, dtype=npy.complex)
-        E4 = npy.zeros(T4.shape, dtype=npy.complex)
-
-        invT4 = inv(npy.array(T4))
-        for i in range(len(T1)):
-            E1[i] = T2[i].dot(invT4[i])
-            E2[i] = T1[i] - T2[i].dot(invT4[i]).dot(T3[i])
-            E3[i] = invT4[i]
-            E4[i] = -invT4[i].dot(T3[i])
+        E3 = linalg.inv(npy.array(T4))
+        E1 = matmul(T2, E3)
+        E2 = T1 - matmul(E1, T3)
+        E4 = -matmul(E3, T3)
         return E1, E2, E3, E4
 
 
@@ -4337,21 +4850,43 @@ def unterminate(ntwk, gamma_f, gamma_r):
 
 
         unterminated = ntwk.copy()
+        unterminated.s = unterminate_s(ntwk.s, gamma_f.s[:,0,0], gamma_r.s[:,0,0])
+        return unterminated
 
-        # extract scattering matrices
-        m, gamma_r, gamma_f = ntwk.s, gamma_r.s, gamma_f.s
-        u = m.copy()
+def unterminate_s(m, gamma_f, gamma_r):
+        '''
+        Unterminates switch terms from raw s-parameters.
 
-        one = npy.ones(ntwk.frequency.npoints)
+        Array version of :func:`unterminate`.
 
-        d = one - m[:,0,1]*m[:,1,0]*gamma_r[:,0,0]*gamma_f[:,0,0]
-        u[:,0,0] = (m[:,0,0] - m[:,0,1]*m[:,1,0]*gamma_f[:,0,0])/(d)
-        u[:,0,1] = (m[:,0,1] - m[:,0,0]*m[:,0,1]*gamma_r[:,0,0])/(d)
-        u[:,1,0] = (m[:,1,0] - m[:,1,1]*m[:,1,0]*gamma_f[:,0,0])/(d)
-        u[:,1,1] = (m[:,1,1] - m[:,0,1]*m[:,1,0]*gamma_r[:,0,0])/(d)
+        Parameters
+        -------------
+        m : numpy.ndarray
+            raw s-parameters, of shape (nfreq, 2, 2). Extra leading
+            dimensions, like (n_dut, nfreq, 2, 2), are broadcast.
+        gamma_f : numpy.ndarray
+            forward switch term, of shape (nfreq,)
+        gamma_r : numpy.ndarray
+            reverse switch term, of shape (nfreq,)
 
-        unterminated.s = u
-        return unterminated
+        Returns
+        -----------
+        u : numpy.ndarray
+            unterminated s-parameters, of the same shape as `m`
+
+        See Also
+        --------
+        unterminate
+        '''
+        u = m.copy()
+
+        d = 1 - m[...,0,1]*m[...,1,0]*gamma_r*gamma_f
+        u[...,0,0] = (m[...,0,0] - m[...,0,1]*m[...,1,0]*gamma_f)/(d)
+        u[...,0,1] = (m[...,0,1] - m[...,0,0]*m[...,0,1]*gamma_r)/(d)
+        u[...,1,0] = (m[...,1,0] - m[...,1,1]*m[...,1,0]*gamma_f)/(d)
+        u[...,1,1] = (m[...,1,1] - m[...,0,1]*m[...,1,0]*gamma_r)/(d)
+
+        return u
 
 def terminate(ntwk, gamma_f, gamma_r):
         '''
@@ -4396,6 +4931,113 @@ def terminate(ntwk, gamma_f, gamma_r):
         m.s[:,0,1] = ntwk.s[:,0,1]/(1-ntwk.s[:,0,0]*gamma_r.s[:,0,0])
         return m
 
+def correct_T_matrices(m, T1, T2, T3, T4):
+    '''
+    Corrects raw s-matrices with the T matrices of a two-port error model.
+
+    The corrected s-matrices are
+
+    .. math::
+
+        S = (T_1 - M T_3)^{-1} (M T_4 - T_2)
+
+    and are solved for all the frequencies at once.
+
+    Parameters
+    ------------
+    m : numpy.ndarray
+        raw (unterminated) s-matrices, of shape (nfreq, 2, 2). Extra leading
+        dimensions, like (n_dut, nfreq, 2, 2), are broadcast.
+    T1, T2, T3, T4 : numpy.ndarray
+        T matrices of shape (nfreq, 2, 2), as returned by
+        :attr:`EightTerm.T_matrices` or :attr:`SixteenTerm.T_matrices`
+
+    Returns
+    ---------
+    s : numpy.ndarray
+        corrected s-matrices, of the same shape as `m`
+
+    See Also
+    ----------
+    embed_T_matrices
+    '''
+    matmul = npy.matmul
+    return linalg.solve(T1 - matmul(m, T3), matmul(m, T4) - T2)
+
+def embed_T_matrices(a, T1, T2, T3, T4):
+    '''
+    Embeds s-matrices in the T matrices of a two-port error model.
+
+    This is the inverse of :func:`correct_T_matrices`,
+
+    .. math::
+
+        M = (T_1 A + T_2) (T_3 A + T_4)^{-1}
+
+    Parameters
+    ------------
+    a : numpy.ndarray
+        actual s-matrices, of shape (nfreq, 2, 2). Extra leading
+        dimensions are broadcast.
+    T1, T2, T3, T4 : numpy.ndarray
+        T matrices of shape (nfreq, 2, 2)
+
+    Returns
+    ---------
+    m : numpy.ndarray
+        embedded (unterminated) s-matrices, of the same shape as `a`
+
+    See Also
+    ----------
+    correct_T_matrices
+    '''
+    matmul = npy.matmul
+    return matmul(matmul(T1, a) + T2, linalg.inv(matmul(T3, a) + T4))
+
+def lstsq_stacked(a, b, rcond=None):
+    '''
+    Least-squares solutions of a stack of linear systems.
+
+    Solves a[k] x[k] = b[k] for all k at once, with the same results as
+    calling :func:`numpy.linalg.lstsq` on each system, through a single
+    stacked singular value decomposition.
+
+    Parameters
+    ------------
+    a : numpy.ndarray
+        coefficient matrices, of shape (K, M, N)
+    b : numpy.ndarray
+        ordinate values, of shape (K, M, P)
+    rcond : float or None
+        cut-off ratio for small singular values, as for
+        :func:`numpy.linalg.lstsq`. If None (default), it is the machine
+        precision times max(M, N).
+
+    Returns
+    ---------
+    x : numpy.ndarray
+        least-squares solutions, of shape (K, N, P)
+    residuals : numpy.ndarray
+        sums of squared residuals of each column of b, of shape (K, P).
+        Unlike :func:`numpy.linalg.lstsq`, they are always returned; they
+        are only meaningful where the rank is N and M > N.
+    rank : numpy.ndarray
+        ranks of the matrices a, of shape (K,)
+    '''
+    a = npy.asarray(a)
+    b = npy.asarray(b)
+    M, N = a.shape[-2:]
+    if rcond is None:
+        rcond = npy.finfo(a.dtype).eps * max(M, N)
+
+    u, sv, vh = linalg.svd(a, full_matrices=False)
+    kept = sv > rcond * sv[:, :1]
+    sv_inv = npy.divide(1., sv, out=npy.zeros(sv.shape), where=kept)
+    uhb = npy.matmul(u.conj().transpose(0, 2, 1), b)
+    x = npy.matmul(vh.conj().transpose(0, 2, 1), sv_inv[:, :, None] * uhb)
+    residuals = npy.sum(abs(npy.matmul(a, x) - b)**2, axis=1)
+    return x, residuals, kept.sum(axis=1)
+
 def determine_line(thru_m, line_m, line_approx=None):
     '''
     Determine S21 of a matched line.
@@ -0,0 +1,326 @@
+'''
+.. module:: skrf.calibration.calibrationCache
+================================================================
+calibrationCache (:mod:`skrf.calibration.calibrationCache`)
+================================================================
+
+
+Contains the CalibrationCache class, a persistent cache of the results of
+:func:`~skrf.calibration.calibration.Calibration.run`.
+
+The results are stored in a directory, under a hash of everything the
+calibration depends on: its class, the measured and ideal Networks and
+its other parameters. A calibration whose standards did not change is
+thus loaded from the cache, even after a restart, instead of being
+solved again. To use a cache for all the calibrations::
+
+    >>> rf.Calibration.coefs_cache = rf.CalibrationCache('~/.skrf_cals')
+
+or for one calibration only::
+
+    >>> cal.coefs_cache = rf.CalibrationCache('~/.skrf_cals')
+
+CalibrationCache Class
+======================
+
+.. autosummary::
+   :toctree: generated/
+
+   CalibrationCache
+
+'''
+import hashlib
+import os
+import tempfile
+from numbers import Number
+
+import numpy as npy
+import six.moves.cPickle as pickle
+
+from ..frequency import Frequency
+from ..network import Network, CacheInfo
+from .. import __version__ as skrf__version__
+
+
+class CalibrationCache(object):
+    '''
+    A persistent cache of calibration results, with LRU eviction.
+
+    Each entry holds the attributes set by the `run()` method of a
+    calibration, like its error coefficients, in a file named after the
+    hash of the calibration inputs. When the cache grows beyond
+    `max_size` bytes or `max_entries` entries, the least recently used
+    entries are removed.
+
+    Parameters
+    ----------
+    directory : str
+        directory of the cache. It is created if needed.
+    max_size : int or None
+        maximum total size of the entries, in bytes. None means no limit.
+    max_entries : int or None
+        maximum number of entries. None means no limit.
+
+    Examples
+    --------
+    >>> cache = rf.CalibrationCache('cal_cache', max_size=2**30)
+    >>> cal = rf.TRL(measured=measured, switch_terms=switch_terms)
+    >>> cal.coefs_cache = cache
+    >>> cal.run()           # solved, or loaded if already solved
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=0, maxsize=None, currsize=12)
+
+    See Also
+    --------
+    skrf.calibration.calibration.Calibration.coefs_cache
+    '''
+    suffix = '.pkl'
+
+    def __init__(self, directory, max_size=None, max_entries=None):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return 'CalibrationCache(%r, max_size=%r, max_entries=%r)' % (
+            self.directory, self.max_size, self.max_entries)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def key(self, cal):
+        '''
+        Hash of the inputs of a calibration.
+
+        The hash covers the class of the calibration, the version of skrf,
+        and the public attributes of the calibration, like the measured
+        and ideal Networks and the keyword arguments. The `name` of the
+        calibration is ignored.
+
+        Parameters
+        ----------
+        cal : :class:`~skrf.calibration.calibration.Calibration`
+
+        Returns
+        -------
+        key : str or None
+            hexadecimal hash, or None if an attribute of the calibration,
+            like a function, can not be hashed, in which case it is not
+            cached.
+        '''
+        return self._key(cal, self._digests(cal))
+
+    def cached_run(self, cal, run):
+        '''
+        Run a calibration, or load its results from the cache.
+
+        On a miss, `run` is called, and the attributes it added or
+        changed are stored. This is called by the `run()` method of
+        the calibrations whose `coefs_cache` is set.
+
+        Parameters
+        ----------
+        cal : :class:`~skrf.calibration.calibration.Calibration`
+            calibration to run
+        run : function
+            unbound `run()` method of the calibration class
+        '''
+        digests = self._digests(cal)
+        key = self._key(cal, digests)
+        if key is None:
+            return run(cal)
+
+        state = self.load(key)
+        if state is not None:
+            vars(cal).update(state)
+            return
+
+        before = dict(vars(cal))
+        out = run(cal)
+        after = self._digests(cal) or {}
+        state = {}
+        for k, v in vars(cal).items():
+            if k.startswith('_'):
+                changed = k not in before or before[k] is not v
+            else:
+                # public attributes modified by run(), like solved standards
+                changed = k in after and after[k] != digests.get(k)
+            if changed:
+                state[k] = v
+        try:
+            self.store(key, state)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # results which can not be pickled are simply not cached
+            pass
+        return out
+
+    def load(self, key):
+        '''
+        Attributes stored under `key`, or None if there are none.
+
+        The entry is marked as the most recently used one.
+        '''
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fid:
+                state = pickle.load(fid)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return state
+
+    def store(self, key, state):
+        '''
+        Store the attributes `state` under `key`, and evict the least
+        recently used entries if the cache is too large.
+        '''
+        # written to a temporary file first, so that an entry is never
+        # read while it is written
+        fid, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fid, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        '''
+        Remove the least recently used entries until the cache fits
+        `max_size` and `max_entries`.
+        '''
+        entries = self._entries()
+        size = sum(entry[2] for entry in entries)
+        count = len(entries)
+        for path, mtime, entry_size in sorted(entries, key=lambda entry: entry[1]):
+            if (self.max_size is None or size <= self.max_size) and \
+                    (self.max_entries is None or count <= self.max_entries):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            count -= 1
+
+    def clear(self):
+        '''
+        Remove all the entries of the cache.
+        '''
+        for path, mtime, size in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.hits = self.misses = 0
+
+    @property
+    def size(self):
+        '''
+        Total size of the entries, in bytes.
+        '''
+        return sum(entry[2] for entry in self._entries())
+
+    def cache_info(self):
+        '''
+        Statistics of the cache, as :meth:`skrf.network.Network.cache_info`.
+
+        The hits and misses are counted since the cache object was created.
+        '''
+        return CacheInfo(self.hits, self.misses, self.max_entries, len(self))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _digests(self, cal):
+        '''
+        Hashes of the public attributes of `cal`, or None if one of them can
+        not be hashed
+        '''
+        digests = {}
+        for k, v in vars(cal).items():
+            if k.startswith('_') or k in ('name', 'coefs_cache'):
+                continue
+            h = hashlib.sha256()
+            try:
+                _fingerprint(h, v)
+            except TypeError:
+                return None
+            digests[k] = h.hexdigest()
+        return digests
+
+    def _key(self, cal, digests):
+        if digests is None:
+            return None
+        h = hashlib.sha256()
+        _fingerprint(h, type(cal))
+        _fingerprint(h, skrf__version__)
+        _fingerprint(h, digests)
+        return h.hexdigest()
+
+    def _entries(self):
+        '''
+        (path, access time, size) of the entries
+        '''
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(self.suffix):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+
+def _fingerprint(h, obj):
+    '''
+    Update the hash `h` with the content of `obj`.
+
+    Raises TypeError for the objects whose content can not be hashed.
+    '''
+    if isinstance(obj, Network):
+        h.update(b'Network')
+        _fingerprint(h, [obj.f, obj.s, obj.z0, obj.s_def])
+    elif isinstance(obj, Frequency):
+        h.update(b'Frequency')
+        _fingerprint(h, obj.f)
+    elif isinstance(obj, npy.ndarray):
+        if obj.dtype.hasobject:
+            _fingerprint(h, obj.tolist())
+        else:
+            h.update(('ndarray%s%s' % (obj.dtype.str, obj.shape)).encode())
+            h.update(npy.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b'dict%i' % len(obj))
+        for k in sorted(obj, key=repr):
+            _fingerprint(h, k)
+            _fingerprint(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(('%s%i' % (type(obj).__name__, len(obj))).encode())
+        for k in obj:
+            _fingerprint(h, k)
+    elif obj is None or isinstance(obj, (str, bytes, bool, Number, npy.generic)):
+        h.update(('%s:%r' % (type(obj).__name__, obj)).encode())
+    elif isinstance(obj, type):
+        # classes are identified by their name. Other callables, like
+        # functions or bound methods, are not: two different lambdas have
+        # the same name.
+        h.update(('%s.%s' % (obj.__module__, obj.__qualname__)).encode())
+    else:
+        raise TypeError('can not hash %s' % type(obj).__name__)
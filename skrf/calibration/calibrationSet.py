@@ -16,11 +16,16 @@ CalibrationSet Class
    :toctree: generated/
 
    CalibrationSet
+   Dot
+   Cartesian
 
 '''
-from itertools import product, combinations, permutations
+import os
+from copy import copy
+from itertools import product, combinations, permutations, islice
 from .calibration import Calibration
-from ..networkSet import NetworkSet
+from ..networkSet import NetworkSet, NetworkStatistics
+from ..util import parallel_map
 
 
 
@@ -54,14 +59,24 @@ class CalibrationSet(object):
 
     This is designed to support experimental uncertainty analysis [1]_.
 
+    The calibrations are built from combinations of the measured
+    standards, defined by the subclasses. They can be generated lazily
+    with :func:`iter_cals`, and the statistics of the corrected Networks
+    computed over a pool of workers with :func:`apply_cal_statistics` and
+    :func:`corrected_statistics`, without storing all the calibrations.
+
     References
     -----------
 
     .. [1] A. Arsenovic, L. Chen, M. F. Bauwens, H. Li, N. S. Barker, and R. M. Weikle, "An Experimental Technique for Calibration Uncertainty Analysis," IEEE Transactions on Microwave Theory and Techniques, vol. 61, no. 1, pp. 263-269, 2013.
 
     '''
+    # True if consecutive calibrations are updated from each other, see
+    # :func:`~skrf.calibration.calibration.Calibration.update_measured`
+    incremental = False
 
-    def __init__(self, cal_class, ideals, measured_sets,*args, **kwargs):
+    def __init__(self, cal_class, ideals, measured_sets, *args, lazy=False,
+                 **kwargs):
         '''
         Parameters
         ----------
@@ -76,8 +91,12 @@ class CalibrationSet(object):
             set to the ideals element of the same index. The sets
             themselves  can be anything list-like
 
+        lazy : bool
+            if False (default), the list of calibrations `cal_list` is
+            created now. Otherwise, it is created when first accessed.
+
         \\*args\\**kargs :
-            passed to self.run(),
+            passed to the initializer of `cal_class`
 
         '''
         self.cal_class = cal_class
@@ -85,11 +104,32 @@ class CalibrationSet(object):
         self.measured_sets = measured_sets
         self.args = args
         self.kwargs = kwargs
-        self.run(*args, **kwargs)
+        self._cal_list = None
+        if not lazy:
+            self.run()
 
     def __getitem__(self, key):
         return self.cal_list[key]
 
+    def __len__(self):
+        '''
+        Number of calibrations
+        '''
+        raise NotImplementedError('SubClass must implement this')
+
+    @property
+    def cal_list(self):
+        '''
+        List of the calibrations, created by :func:`run` if needed
+        '''
+        if self._cal_list is None:
+            self.run()
+        return self._cal_list
+
+    @cal_list.setter
+    def cal_list(self, cal_list):
+        self._cal_list = cal_list
+
     def apply_cal(self, raw_ntwk, *args, **kwargs):
         '''
         '''
@@ -111,8 +151,122 @@ class CalibrationSet(object):
             return [k.__getattribute__(prop).__getattribute__(func) \
                 for k in self.measured_sets]
 
+    def combinations(self):
+        '''
+        Iterator over the lists of measured standards of the calibrations
+        '''
+        raise NotImplementedError('SubClass must implement this')
+
     def run(self):
-        NotImplementedError('SubClass must implement this')
+        '''
+        Create the list of all the calibrations, `cal_list`
+        '''
+        self.cal_list = list(self.iter_cals())
+
+    def iter_cals(self, start=0, stop=None):
+        '''
+        Generate the calibrations one at a time.
+
+        Parameters
+        ----------
+        start, stop : int or None
+            range of the calibrations to generate, as for
+            :func:`itertools.islice`. By default, all the calibrations
+            are generated.
+        '''
+        incremental = self.incremental and \
+            self.cal_class._update is not Calibration._update and \
+            not self.kwargs.get('sloppy_input', False)
+        cal, previous = None, None
+        for measured in islice(self.combinations(), start, stop):
+            if cal is None or not incremental:
+                cal = self.cal_class(ideals=self.ideals, measured=measured,
+                                     *self.args, **self.kwargs)
+                if incremental:
+                    cal.run()
+            else:
+                cal = copy(cal)
+                for k, (m, m_previous) in enumerate(zip(measured, previous)):
+                    if m is not m_previous:
+                        cal.update_measured(k, m)
+            yield cal
+            previous = measured
+
+    def apply_cal_statistics(self, raw_ntwk, workers=1, pool='process',
+                             chunk_size=None, **kwargs):
+        '''
+        Statistics of a Network corrected by all the calibrations.
+
+        The corrected Networks are reduced into running statistics as
+        the calibrations are generated, so neither the calibrations nor
+        the corrected Networks are stored. The calibrations are split
+        in chunks, which can be processed by a pool of workers.
+
+        Parameters
+        ----------
+        raw_ntwk : :class:`~skrf.network.Network`
+            raw measurement to correct
+        workers : int or None
+            number of workers. If 1 (default), the chunks are processed
+            one after the other. If None, the number of CPUs is used.
+        pool : {'process', 'thread'}
+            kind of pool, see :func:`~skrf.util.parallel_map`
+        chunk_size : int or None
+            number of calibrations of a chunk. If None, the calibrations
+            are split in 4 chunks per worker.
+        \\*\\*kwargs :
+            passed to :class:`~skrf.networkSet.NetworkStatistics`, like
+            `properties`
+
+        Returns
+        -------
+        stats : :class:`~skrf.networkSet.NetworkStatistics`
+            statistics of the corrected Networks, like `stats.mean_s`
+            or `stats.std_s_db`
+
+        Examples
+        --------
+        >>> calset = Cartesian(OnePort, ideals, measured_sets, lazy=True)
+        >>> stats = calset.apply_cal_statistics(dut, workers=4)
+        >>> stats.std_s_mag.plot_s_mag()
+        '''
+        return self._statistics(raw_ntwk, workers, pool, chunk_size, kwargs)[0]
+
+    def corrected_statistics(self, workers=1, pool='process', chunk_size=None,
+                             **kwargs):
+        '''
+        Statistics of the standards corrected by all the calibrations.
+
+        This is the streaming counterpart of :attr:`corrected_sets`, see
+        :func:`apply_cal_statistics` for the parameters.
+
+        Returns
+        -------
+        stats : list of :class:`~skrf.networkSet.NetworkStatistics`
+            statistics of each corrected standard
+        '''
+        return self._statistics(None, workers, pool, chunk_size, kwargs)
+
+    def _statistics(self, raw_ntwk, workers, pool, chunk_size, kwargs):
+        n_cals = len(self)
+        if chunk_size is None:
+            chunk_size = -(-n_cals // (4 * (workers or os.cpu_count() or 1)))
+        chunk_size = max(chunk_size, 1)
+        # the workers generate their own calibrations
+        calset = copy(self)
+        calset._cal_list = None
+        chunks = [(calset, start, min(start + chunk_size, n_cals), raw_ntwk, kwargs)
+                  for start in range(0, n_cals, chunk_size)]
+        results, errors = parallel_map(_chunk_statistics, chunks,
+                                       workers=workers, pool=pool)
+        for error in errors:
+            if error is not None:
+                raise error
+        stats = results[0]
+        for result in results[1:]:
+            for stat, other in zip(stats, result):
+                stat.merge(other)
+        return stats
 
     @property
     def corrected_sets(self):
@@ -125,21 +279,60 @@ class CalibrationSet(object):
         return [NetworkSet([k[l] for k in mat]) for l in range(n_meas)]
 
 
+def _chunk_statistics(args):
+    '''
+    Statistics of the Networks corrected by a range of calibrations of a
+    CalibrationSet
+    '''
+    calset, start, stop, raw_ntwk, kwargs = args
+    stats = None
+    for cal in calset.iter_cals(start, stop):
+        if raw_ntwk is None:
+            caled = cal.caled_ntwks
+        else:
+            caled = [cal.apply_cal(raw_ntwk)]
+        if stats is None:
+            stats = [NetworkStatistics(**kwargs) for k in caled]
+        for stat, ntwk in zip(stats, caled):
+            stat.add(ntwk)
+    return stats
+
 
 class Dot(CalibrationSet):
+    '''
+    Calibrations of the k-th measurements of all the standards, for all k.
+
+    All the measured sets must have the same length.
+    '''
+    def __len__(self):
+        return len(self.measured_sets[0])
 
-    def run(self, *args, **kwargs):
-        ideals = self.ideals
+    def combinations(self):
         measured_sets = self.measured_sets
         if len(set(map(len, measured_sets))) !=1:
             raise(IndexError('all measured NetworkSets must have same length for dot product combinatoric function'))
+        return zip(*[list(k) for k in measured_sets])
 
-        self.cal_list = []
-        for k in range(len(measured_sets[0])):
-            measured = [measured_set[k] for measured_set in measured_sets]
-            cal = self.cal_class(ideals=ideals, measured= measured,
-                                 *args,**kwargs)
-            self.cal_list.append(cal)
 
+class Cartesian(CalibrationSet):
+    '''
+    Calibrations of all the combinations of the measured standards.
+
+    For measured sets of lengths n1, n2, ..., there are n1*n2*...
+    calibrations. Consecutive combinations only differ by a few
+    standards, so when `cal_class` supports incremental updates, like
+    :class:`~skrf.calibration.calibration.OnePort` and
+    :class:`~skrf.calibration.calibration.TwelveTerm`, each calibration
+    is a copy of the previous one with the changed standards replaced by
+    :func:`~skrf.calibration.calibration.Calibration.update_measured`.
+    '''
+    incremental = True
 
+    def __len__(self):
+        n = 1
+        for measured_set in self.measured_sets:
+            n *= len(measured_set)
+        return n
 
+    def combinations(self):
+        return product(*[list(k) for k in self.measured_sets])
@@ -8,7 +8,7 @@ from numpy.random  import rand, uniform
 from nose.tools import nottest
 from nose.plugins.skip import SkipTest
 
-from skrf.calibration import OnePort, PHN, SDDL, TRL, SOLT, UnknownThru, EightTerm, TwoPortOnePath, EnhancedResponse,TwelveTerm, SixteenTerm, LMR16, terminate, determine_line, determine_reflect, NISTMultilineTRL
+from skrf.calibration import OnePort, PHN, SDDL, TRL, SOLT, UnknownThru, EightTerm, TwoPortOnePath, EnhancedResponse,TwelveTerm, SixteenTerm, LMR16, terminate, determine_line, determine_reflect, NISTMultilineTRL, correct_T_matrices, embed_T_matrices, lstsq_stacked
 
 from skrf import two_port_reflect
 from skrf.networkSet import NetworkSet
@@ -69,6 +69,18 @@ class DetermineTest(unittest.TestCase):
 
         [ self.assertEqual(k,l) for k,l in zip(self.r, r_found)]
 
+    def test_lstsq_stacked(self):
+        a = rand(20, 5, 3) + 1j*rand(20, 5, 3)
+        a[3, :, 2] = a[3, :, 1]     # rank deficient
+        b = rand(20, 5, 1) + 1j*rand(20, 5, 1)
+        x, residuals, rank = lstsq_stacked(a, b)
+        for k in range(len(a)):
+            x_k, residuals_k, rank_k = npy.linalg.lstsq(a[k], b[k], rcond=None)[:3]
+            npy.testing.assert_allclose(x[k], x_k, rtol=1e-10)
+            self.assertEqual(rank[k], rank_k)
+            if rank_k == 3:
+                npy.testing.assert_allclose(residuals[k], residuals_k, rtol=1e-10)
+
 
 class CalibrationTest(object):
     '''
@@ -104,7 +116,70 @@ class CalibrationTest(object):
     def test_embed_equal_measure(self):
         a = self.wg.random(n_ports=self.n_ports)
         self.assertEqual(self.cal.embed(a),self.measure(a))
+
+    @suppress_warning_decorator("only gave a single measurement orientation")
+    def test_apply_cal_to_array(self):
+        duts = [self.wg.random(n_ports=self.n_ports, name='dut%i' % k)
+                for k in range(3)]
+        measured = [self.cal.embed(k) for k in duts]
+        caled = [self.cal.apply_cal(k) for k in measured]
+
+        s = self.cal.apply_cal_to_array(npy.array([k.s for k in measured]),
+                                        chunk_size=2)
+        caled_list = self.cal.apply_cal_to_list(measured, chunk_size=2)
+        caled_ns = self.cal.apply_cal_to_network_set(NetworkSet(measured))
+        for k in range(len(duts)):
+            npy.testing.assert_allclose(s[k], caled[k].s, atol=1e-12)
+            npy.testing.assert_allclose(caled_list[k].s, caled[k].s, atol=1e-12)
+            npy.testing.assert_allclose(caled_ns[k].s, caled[k].s, atol=1e-12)
+            self.assertEqual(caled_list[k].name, measured[k].name)
         
+    @suppress_warning_decorator("only gave a single measurement orientation")
+    def test_update_measured(self):
+        '''
+        Replacing a measured standard should give the same coefficients as
+        running the calibration again.
+        '''
+        self.cal.run()
+        for k in [0, -1]:
+            remeasured = self.cal.measured[k].copy()
+            remeasured.s = remeasured.s + 1e-3*(rand(*remeasured.s.shape)-.5)
+            self.cal.update_measured(k, remeasured)
+            updated = dict(self.cal.coefs)
+            self.cal.run()
+            for key in updated:
+                npy.testing.assert_allclose(updated[key], self.cal.coefs[key],
+                                            rtol=1e-9, atol=1e-12)
+
+    @suppress_warning_decorator("only gave a single measurement orientation")
+    def test_monte_carlo(self):
+        '''
+        Without noise, every trial should give the coefficients of the
+        calibration, and the trials solved together should match the
+        ones solved one at a time.
+        '''
+        ntwk = self.wg.random(n_ports=self.n_ports, name='dut')
+        dut = self.cal.embed(ntwk)
+        coefs_stats, duts_stats = self.cal.monte_carlo(3, duts=[dut],
+                                                       properties=['s'])
+        for k, coef in self.cal.coefs.items():
+            self.assertEqual(len(coefs_stats[k]), 3)
+            npy.testing.assert_allclose(coefs_stats[k].mean_s.s.flatten(), coef,
+                                        atol=1e-9)
+            npy.testing.assert_allclose(coefs_stats[k].std_s.s, 0, atol=1e-9)
+        self.assertEqual(duts_stats[0].mean_s, self.cal.apply_cal(dut))
+
+        kwargs = dict(noise=(1e-3, .1), repeatability=(1e-3, .1), seed=1,
+                      duts=[dut], properties=['s', 's_mag'])
+        coefs_stats, duts_stats = self.cal.monte_carlo(4, **kwargs)
+        looped, looped_duts = self.cal.monte_carlo(4, chunk_size=1, **kwargs)
+        for k in coefs_stats:
+            npy.testing.assert_allclose(coefs_stats[k].mean_s.s,
+                                        looped[k].mean_s.s, atol=1e-9)
+        npy.testing.assert_allclose(duts_stats[0].std_s_mag.s,
+                                    looped_duts[0].std_s_mag.s, atol=1e-9)
+        self.assertTrue(npy.all(duts_stats[0].std_s_mag.s[:, 0, 0] > 0))
+
     @suppress_warning_decorator("n_thrus is None")
     def test_from_coefs(self):
         cal_from_coefs = self.cal.from_coefs(self.cal.frequency, self.cal.coefs)
@@ -168,6 +243,31 @@ class OnePortTest(unittest.TestCase, CalibrationTest):
             self.cal.coefs_ntwks['reflection tracking'],
             )
 
+    def test_remove_and_cal(self):
+        if type(self.cal) is not OnePort:
+            self.skipTest('the standards are solved by the calibration')
+        ideals, measured = self.cal.ideals, self.cal.measured
+        c, i = self.cal.remove_and_cal('ew')
+        self.assertIs(i, ideals[1])
+        cal = OnePort(ideals=ideals[:1]+ideals[2:],
+                      measured=measured[:1]+measured[2:])
+        self.assertEqual(c, cal.apply_cal(measured[1]))
+        self.assertEqual(c, i)
+        self.assertEqual(len(self.cal.measured), 4)
+
+    def test_update_measured_ideal(self):
+        '''
+        Replacing a standard by another one should give the same
+        calibration as using it from the start.
+        '''
+        if type(self.cal) is not OnePort:
+            self.skipTest('the standards are solved by the calibration')
+        self.cal.run()
+        load = self.wg.load(.1+.2j, name='load')
+        self.cal.update_measured('load', self.measure(load), load)
+        self.assertEqual(self.cal.coefs_ntwks['directivity'], self.E.s11)
+        self.assertEqual(self.cal.ideals[-1], load)
+
 
 class SDDLTest(OnePortTest):
     def setUp(self):
@@ -465,6 +565,23 @@ class EightTermTest(unittest.TestCase, CalibrationTest):
     def test_verify_12term(self):
         self.assertTrue(self.cal.verify_12term_ntwk.s_mag.max() < 1e-3)
 
+    def test_apply_cal_keeps_input(self):
+        a = self.wg.random(n_ports=self.n_ports)
+        m = self.measure(a)
+        m_s = m.s.copy()
+        self.cal.apply_cal(m)
+        npy.testing.assert_array_equal(m.s, m_s)
+
+    def test_correct_T_matrices_stacked(self):
+        # a stack of DUTs is corrected at once, like each of them
+        duts = [self.wg.random(n_ports=self.n_ports) for k in range(3)]
+        m = npy.array([(self.X**a**self.Y).s for a in duts])
+        s = correct_T_matrices(m, *self.cal.T_matrices)
+        for k, a in enumerate(duts):
+            npy.testing.assert_allclose(s[k], a.s, atol=1e-9)
+        npy.testing.assert_allclose(embed_T_matrices(s, *self.cal.T_matrices),
+                                    m, atol=1e-9)
+
 
 class TRLTest(EightTermTest):
     def setUp(self):
@@ -649,6 +766,36 @@ class NISTMultilineTRLTest(EightTermTest):
     def test_gamma(self):
         self.assertTrue(max(npy.abs(self.wg.gamma-self.cal.gamma)) < 1e-3)
 
+    def test_many_frequencies(self):
+        # the solution is vectorized over frequency, with a recursive
+        # estimate of the propagation constant
+        wg = rf.RectangularWaveguide(rf.F(75,100,51), a=100*rf.mil, z0=50, rho='gold')
+        X = wg.random(n_ports=2, name='X')
+        Y = wg.random(n_ports=2, name='Y')
+        actuals = [
+            wg.thru(),
+            rf.two_port_reflect(wg.load(-.98-.1j),wg.load(-.98-.1j)),
+            wg.line(100,'um'),
+            wg.line(200,'um'),
+            wg.line(900,'um'),
+            ]
+        measured = [X**k**Y for k in actuals]
+        dut = wg.random(n_ports=2, name='dut')
+        for root_choice in ['real', 'imag', 'estimate', 'auto']:
+            for k_method in ['multical', 'marks']:
+                cal = NISTMultilineTRL(
+                    measured = measured,
+                    Grefls = [-1],
+                    l = [0, 100e-6, 200e-6, 900e-6],
+                    er_est = 1,
+                    gamma_root_choice = root_choice,
+                    k_method = k_method,
+                    )
+                self.assertTrue(max(npy.abs(wg.gamma-cal.gamma)) < 1e-3)
+                self.assertEqual(cal.apply_cal(X**dut**Y), dut)
+                self.assertEqual(cal.coefs_ntwks['forward directivity'], X.s11)
+                self.assertEqual(cal.coefs_ntwks['reverse directivity'], Y.s22)
+
 
 class NISTMultilineTRLTest2(unittest.TestCase):
     """ Test characteristic impedance change and reference plane shift.
@@ -905,6 +1052,19 @@ class TwelveTermTest(unittest.TestCase, CalibrationTest):
         self.assertEqual(
             self.Ir.s11,
             self.cal.coefs_ntwks['reverse isolation'])
+
+    @suppress_warning_decorator("n_thrus is None")
+    def test_remove_and_cal(self):
+        if type(self.cal) is not TwelveTerm:
+            self.skipTest('not a TwelveTerm calibration')
+        ideals, measured = self.cal.ideals, self.cal.measured
+        c, i = self.cal.remove_and_cal(-1)
+        self.assertIs(i, ideals[-1])
+        cal = TwelveTerm(ideals=ideals[:-1], measured=measured[:-1],
+                         n_thrus=1, **self.cal.kwargs)
+        self.assertEqual(c, cal.apply_cal(measured[-1]))
+        self.assertEqual(c, i)
+        self.assertEqual(self.cal.n_thrus, 2)
     
     @nottest
     def test_convert_12term_2_8term(self):
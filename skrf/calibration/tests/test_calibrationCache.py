@@ -0,0 +1,139 @@
+import unittest
+import os
+import tempfile
+
+import skrf as rf
+import numpy as npy
+from skrf.calibration import OnePort, SDDL, CalibrationCache
+
+
+class CalibrationCacheTest(unittest.TestCase):
+    '''
+    Calibrations whose `coefs_cache` is set should load the results of
+    `run()` from the cache when the same standards were already solved.
+    '''
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = CalibrationCache(self.tmp_dir.name)
+        self.wg = rf.RectangularWaveguide(rf.F(75, 100, 11), a=100*rf.mil, z0=50)
+        wg = self.wg
+        self.E = wg.random(n_ports=2, name='E')
+        self.ideals = [
+            wg.short(name='short'),
+            wg.delay_short(45., 'deg', name='ew'),
+            wg.delay_short(90., 'deg', name='qw'),
+            wg.match(name='load'),
+            ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def one_port(self, ideals=None):
+        ideals = self.ideals if ideals is None else ideals
+        cal = OnePort(ideals=ideals, measured=[self.E**k for k in ideals])
+        cal.coefs_cache = self.cache
+        return cal
+
+    def test_hit(self):
+        cal = self.one_port()
+        cal.run()
+        self.assertEqual(self.cache.cache_info().misses, 1)
+        self.assertEqual(len(self.cache), 1)
+
+        cal2 = self.one_port()
+        cal2.run()
+        self.assertEqual(self.cache.cache_info().hits, 1)
+        for k in cal.coefs:
+            npy.testing.assert_array_equal(cal.coefs[k], cal2.coefs[k])
+        npy.testing.assert_array_equal(cal2.output_from_run['residuals'],
+                                       cal.output_from_run['residuals'])
+
+        # a new cache object on the same directory finds the entry
+        cal3 = self.one_port()
+        cal3.coefs_cache = CalibrationCache(self.tmp_dir.name)
+        cal3.coefs
+        self.assertEqual(cal3.coefs_cache.cache_info().hits, 1)
+
+    def test_key(self):
+        cal = self.one_port()
+        key = self.cache.key(cal)
+        self.assertEqual(self.cache.key(self.one_port()), key)
+        cal.name = 'other name'
+        self.assertEqual(self.cache.key(cal), key)
+
+        ideals = self.ideals[:-1] + [self.wg.load(.1, name='load')]
+        self.assertNotEqual(self.cache.key(self.one_port(ideals)), key)
+        cal = self.one_port()
+        cal.measured[0].s[0] += 1e-12
+        self.assertNotEqual(self.cache.key(cal), key)
+        cal = self.one_port()
+        cal.kwargs['rcond'] = 1e-3
+        self.assertNotEqual(self.cache.key(cal), key)
+
+        cal = self.one_port()
+        cal.kwargs['unhashable'] = object()
+        self.assertIsNone(self.cache.key(cal))
+        cal.run()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_callable(self):
+        '''
+        Calibrations with a function as a parameter are not cached, as
+        different functions can have the same name.
+        '''
+        cals = []
+        for k in range(2):
+            cal = self.one_port()
+            cal.kwargs['func'] = lambda x, k=k: x + k
+            cals.append(cal)
+        self.assertIsNone(self.cache.key(cals[0]))
+        self.assertIsNone(self.cache.key(cals[1]))
+        cals[0].run()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_eviction(self):
+        cache = CalibrationCache(self.tmp_dir.name, max_entries=2)
+        cals = []
+        for k in range(3):
+            ideals = self.ideals[:-1] + [self.wg.load(.1*k, name='load')]
+            cal = self.one_port(ideals)
+            cal.coefs_cache = cache
+            cal.run()
+            cals.append(cal)
+            # make the access times distinct
+            os.utime(cache._path(cache.key(cal)), (k, k))
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(cache.key(cals[0]), cache)
+        self.assertIn(cache.key(cals[2]), cache)
+
+        size = cache.size
+        cache.max_size = size - 1
+        cache.evict()
+        self.assertEqual(len(cache), 1)
+        self.assertIn(cache.key(cals[2]), cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_modified_standards(self):
+        '''
+        The standards solved by `run()` should also be restored.
+        '''
+        wg = self.wg
+        actuals = [wg.short(name='short'), wg.delay_short(10., 'deg', name='ew'),
+                   wg.delay_short(33., 'deg', name='qw'), wg.load(.2+.2j, name='load')]
+        cals = []
+        for k in range(2):
+            cal = SDDL(ideals=self.ideals[:-1] + [actuals[-1]],
+                       measured=[self.E**k for k in actuals])
+            cal.coefs_cache = self.cache
+            cal.run()
+            cals.append(cal)
+        self.assertEqual(self.cache.cache_info().hits, 1)
+        self.assertEqual(cals[1].ideals[1], cals[0].ideals[1])
+        self.assertEqual(cals[1].ideals[2], cals[0].ideals[2])
+        self.assertEqual(cals[1].coefs_ntwks['directivity'], self.E.s11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,9 @@ import unittest
 
 import skrf as rf
 import numpy as npy
-from skrf.calibration.calibrationSet import Dot
-from skrf.calibration import OnePort, TRL, SOLT, EightTerm
+from itertools import product
+from skrf.calibration.calibrationSet import Dot, Cartesian
+from skrf.calibration import OnePort, TRL, SOLT, EightTerm, TwelveTerm
 from skrf.util import suppress_warning_decorator
 
 
@@ -23,6 +24,41 @@ class CalsetTest(object):
         ntwk = self.wg.random(n_ports = self.n_ports)
         self.calset.apply_cal(ntwk)
 
+    @suppress_warning_decorator("No switch terms")
+    def test_apply_cal_statistics(self):
+        '''
+        The running statistics should match the ones of the set of
+        corrected networks, whatever the pool of workers
+        '''
+        ntwk = self.wg.random(n_ports = self.n_ports)
+        ns = self.calset.apply_cal(ntwk)
+        for workers, pool in [(1, 'process'), (2, 'thread'), (2, 'process')]:
+            stats = self.calset.apply_cal_statistics(
+                ntwk, workers=workers, pool=pool, chunk_size=2)
+            self.assertEqual(len(stats), len(self.calset))
+            for attr in ['mean_s', 'std_s', 'min_s_mag', 'max_s_db']:
+                npy.testing.assert_allclose(getattr(stats, attr).s,
+                                            getattr(ns, attr).s,
+                                            rtol=1e-9, atol=1e-12)
+
+    @suppress_warning_decorator("No switch terms")
+    def test_corrected_statistics(self):
+        stats = self.calset.corrected_statistics(chunk_size=2)
+        for ns, stat in zip(self.calset.corrected_sets, stats):
+            npy.testing.assert_allclose(stat.mean_s.s, ns.mean_s.s,
+                                        rtol=1e-9, atol=1e-12)
+            npy.testing.assert_allclose(stat.std_s_mag.s, ns.std_s_mag.s,
+                                        rtol=1e-9, atol=1e-12)
+
+    @suppress_warning_decorator("No switch terms")
+    def test_lazy(self):
+        calset = type(self.calset)(self.calset.cal_class, self.calset.ideals,
+                                   self.calset.measured_sets, lazy=True,
+                                   **self.calset.kwargs)
+        self.assertIsNone(calset._cal_list)
+        self.assertEqual(len(list(calset.iter_cals(1, 3))), 2)
+        self.assertEqual(len(calset.cal_list), len(calset))
+
 class DotOneport(unittest.TestCase,CalsetTest):
     '''
     
@@ -98,3 +134,75 @@ class DotEightTerm(unittest.TestCase, CalsetTest):
         out.name = ntwk.name
         return out
     
+
+
+class CartesianOneport(DotOneport):
+    '''
+    The calibrations updated incrementally should be the same as the ones
+    created from each combination of the measured standards.
+    '''
+    cal_class = OnePort
+
+    def setUp(self):
+        self.wg = rf.RectangularWaveguide(rf.F(75,100,11), a=100*rf.mil,z0=50)
+        wg = self.wg
+        self.n_ports = 1
+        self.E = wg.random(n_ports =2, name = 'E')
+        self.ideals = [
+                wg.short( name='short'),
+                wg.delay_short( 45.,'deg',name='ew'),
+                wg.delay_short( 90.,'deg',name='qw'),
+                wg.match( name='load'),
+                ]
+        self.measured_sets = [
+            rf.NetworkSet([self.measure(ideal) for k in range(2)])
+            for ideal in self.ideals]
+        self.calset = Cartesian(cal_class = self.cal_class,
+                                ideals = self.ideals,
+                                measured_sets = self.measured_sets)
+
+    def measure(self, ntwk):
+        out = self.wg.random(n_ports=self.n_ports)
+        out.s = 1e-3*out.s + (self.E**ntwk).s
+        out.name = ntwk.name
+        return out
+
+    def test_combinations(self):
+        combinations = list(product(*[list(k) for k in self.measured_sets]))
+        self.assertEqual(len(self.calset.cal_list), len(combinations))
+        for cal, measured in zip(self.calset.cal_list, combinations):
+            expected = self.cal_class(ideals=self.ideals, measured=measured,
+                                      **self.calset.kwargs)
+            for k in expected.coefs:
+                npy.testing.assert_allclose(cal.coefs[k], expected.coefs[k],
+                                            rtol=1e-9, atol=1e-12)
+
+
+class CartesianTwelveTerm(CartesianOneport):
+    cal_class = TwelveTerm
+
+    def setUp(self):
+        self.wg = rf.RectangularWaveguide(rf.F(75,100,11), a=100*rf.mil,z0=50)
+        wg = self.wg
+        self.n_ports = 2
+        self.X = wg.random(n_ports =2, name = 'X')
+        self.Y = wg.random(n_ports =2, name = 'Y')
+        self.ideals = [
+            wg.short(nports=2, name='short'),
+            wg.open(nports=2, name='open'),
+            wg.match(nports=2, name='load'),
+            wg.thru(name='thru'),
+            ]
+        self.measured_sets = [
+            rf.NetworkSet([self.measure(ideal) for k in range(2)])
+            for ideal in self.ideals]
+        self.calset = Cartesian(cal_class = self.cal_class,
+                                ideals = self.ideals,
+                                measured_sets = self.measured_sets,
+                                n_thrus = 1)
+
+    def measure(self, ntwk):
+        out = self.wg.random(n_ports=self.n_ports)
+        out.s = 1e-3*out.s + (self.X**ntwk**self.Y).s
+        out.name = ntwk.name
+        return out
@@ -37,6 +37,7 @@ Network Representations
    :toctree: generated/
    
    Circuit.network
+   Circuit.sweep
    Circuit.s
    Circuit.s_external
    Circuit.s_active
@@ -45,6 +46,14 @@ Network Representations
    Circuit.vswr_active
    Circuit.port_z0
 
+Caching
+=======
+.. autosummary::
+   :toctree: generated/
+
+   Circuit.cache_info
+   Circuit.clear_cache
+
 Circuit internals
 ==================
 .. autosummary::
@@ -72,9 +81,11 @@ Graph representation
    Circuit.edge_labels
 
 '''
-from . network import Network, a2s
+from . network import Network, a2s, CacheInfo
+from . networkSet import NetworkSet
 from . media import media
 from . constants import INF
+from . util import parallel_map
 
 import numpy as np
 
@@ -83,8 +94,9 @@ try:
 except ImportError as e:
     pass
 
-from itertools import chain, product
-from scipy.linalg import block_diag
+from itertools import chain
+from scipy.sparse import coo_matrix, identity
+from scipy.sparse.linalg import splu
 
 class Circuit():
     '''
@@ -97,11 +109,44 @@ class Circuit():
 
     The algorithm used to calculate the resultant network can be found in [#]_.
 
+    The topology of the circuit, like the port indexes, is computed once
+    when the circuit is created. The frequency-dependent matrices [X], [C]
+    and the global scattering matrix are computed on first use and cached,
+    so that the external s-parameters, voltages and currents cost a single
+    solve. The cache is invalidated when the s-parameters, port impedances
+    or frequency of the networks change. After modifying `connections`,
+    call :func:`clear_cache`. The cache can be disabled by setting
+    :attr:`use_cache` to False.
+
+    By default, the global scattering matrix is computed from dense
+    matrices of shape (nb_frequency, dim, dim). For large circuits, set
+    :attr:`solver` to 'sparse': the external s-parameters, voltages and
+    currents are then computed with a sparse LU decomposition at each
+    frequency, solving only for the external ports, without building
+    the dense matrices.
+
+    Wideband circuits can be evaluated by chunks of :attr:`chunk_size`
+    frequency points, to bound the memory used by the dense matrices,
+    and the chunks can be evaluated by a pool of :attr:`workers` threads,
+    as the linear algebra releases the GIL. This applies to
+    :attr:`network`, :attr:`s_external`, :func:`s_active`,
+    :func:`voltages` and :func:`currents`, not to the global matrices
+    :attr:`s`, :attr:`X` and :attr:`C`.
+
     References
     ----------
     .. [#] P. Hallbjörner, Microw. Opt. Technol. Lett. 38, 99 (2003).
 
     '''
+    # if True, the frequency-dependent matrices are cached
+    use_cache = True
+    # 'dense' or 'sparse', see the class documentation
+    solver = 'dense'
+    # maximum number of frequency points evaluated together, None for all
+    chunk_size = None
+    # number of threads evaluating the chunks of frequency points
+    workers = 1
+
     def __init__(self, connections):
         '''
         Circuit constructor. Creates a circuit made of a set of N-ports networks.
@@ -177,6 +222,95 @@ class Circuit():
         # All frequencies are the same, Circuit frequency can be any of the ntw
         self.frequency = ntws[0].frequency
 
+        self._update_topology()
+        self._reset_cache()
+
+    def _update_topology(self):
+        '''
+        Compute the data which depend only on the connections
+        '''
+        self._connections_list = [[idx_cnx, cnx] for (idx_cnx, cnx) in
+                                  enumerate(chain.from_iterable(self.connections))]
+        self._port_indexes = [idx_cnx for (idx_cnx, (ntw, ntw_port))
+                              in self._connections_list
+                              if 'port' in str.lower(ntw.name)]
+        self._dim = len(self._connections_list)
+        self._networks = self.networks_list()
+
+        stops = np.cumsum([len(cnx) for cnx in self.connections])
+        starts = stops - [len(cnx) for cnx in self.connections]
+        self._blocks = list(zip(starts, stops))
+
+        # ports of each network which is not a "port" (from), and their
+        # indexes in the global matrices (to)
+        ntws = {k:v for k,v in self.networks_dict().items() if 'port' not in k.lower()}
+        reordering = {ntw_name:([], []) for ntw_name in ntws}
+        for (idx_cnx, (ntw, ntw_port)) in self._connections_list:
+            if ntw.name in ntws:
+                reordering[ntw.name][0].append(ntw_port)
+                reordering[ntw.name][1].append(idx_cnx)
+        self._ports_reordering = [(ntws[ntw_name], np.array(_from), np.array(_to))
+                                  for (ntw_name, (_from, _to)) in reordering.items()]
+
+    def _reset_cache(self):
+        self._cache = {}
+        self._cache_key = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _cache_fingerprint(self):
+        '''
+        Fingerprint of the data of the networks the cached matrices are
+        computed from
+        '''
+        return tuple(ntw._cache_fingerprint() for ntw in self._networks)
+
+    def _cached(self, name, func):
+        '''
+        Return the matrix `name`, computed with `func` when it is not in the
+        cache.
+        '''
+        if not self.use_cache:
+            return func()
+        key = self._cache_fingerprint()
+        if self._cache_key != key:
+            self._cache = {}
+            self._cache_key = key
+        if name in self._cache:
+            self._cache_hits += 1
+            return self._cache[name]
+        self._cache_misses += 1
+        value = func()
+        if isinstance(value, np.ndarray):
+            # the cached array is shared by all the callers
+            value.flags.writeable = False
+        self._cache[name] = value
+        return value
+
+    def cache_info(self):
+        '''
+        Return the statistics of the cache of frequency-dependent matrices.
+
+        Return
+        --------
+        info : namedtuple
+            `hits` and `misses` of the cache since it was last cleared,
+            `maxsize` (None) and `currsize`, the number of cached matrices.
+        '''
+        return CacheInfo(self._cache_hits, self._cache_misses, None,
+                         len(self._cache))
+
+    def clear_cache(self):
+        '''
+        Empty the cache of frequency-dependent matrices.
+
+        The topology is also computed again from `connections`, so this
+        must be called after modifying `connections`. Modifications of the
+        networks themselves are detected.
+        '''
+        self._update_topology()
+        self._reset_cache()
+
     def _is_named(self, ntw):
         '''
         Return True is the network has a name, False otherwise
@@ -310,7 +444,7 @@ class Circuit():
              ...
             ]
         '''
-        return [[idx_cnx, cnx] for (idx_cnx, cnx) in enumerate(chain.from_iterable(self.connections))]
+        return list(self._connections_list)
 
 
 
@@ -335,7 +469,7 @@ class Circuit():
 
         It correspond to the sum of all connections
         '''
-        return np.sum([len(cnx) for cnx in self.connections])
+        return self._dim
 
     @property
     def G(self):
@@ -392,6 +526,9 @@ class Circuit():
         ::
             { k: [(ntw1_name, ntw1_port), (ntw1_z0, ntw2_name, ntw2_port), ntw2_z0], ... }
         '''
+        return dict(self._cached('intersections_dict', self._intersections_dict))
+
+    def _intersections_dict(self):
         inter_dict = {}
         # for k in range(self.connections_nb):
         #     # get all edges connected to intersection Xk
@@ -438,39 +575,40 @@ class Circuit():
         return edge_labels
 
 
-    def _Y_k(self, cnx):
+    def _Y_k(self, cnx, f=slice(None)):
         '''
-        Return the sum of the system admittances of each intersection
+        Return the sum of the system admittances of each intersection, at
+        the frequency points `f`
         '''
         y_ns = []
         for (ntw, ntw_port) in cnx:
             # formula (2)
-            y_ns.append(1/ntw.z0[:,ntw_port] )
+            y_ns.append(1/ntw.z0[f,ntw_port] )
 
         y_k = np.array(y_ns).sum(axis=0)  # shape: (nb_freq,)
         return y_k
 
-    def _Xnn_k(self, cnx_k):
+    def _Xnn_k(self, cnx_k, f=slice(None)):
         '''
         Return the reflection coefficients x_nn of the connection matrix [X]_k
         '''
         X_nn = []
-        y_k = self._Y_k(cnx_k)
+        y_k = self._Y_k(cnx_k, f)
 
         for (ntw, ntw_port) in cnx_k:
             # formula (1)
-            X_nn.append( 2/(ntw.z0[:,ntw_port]*y_k) - 1)
+            X_nn.append( 2/(ntw.z0[f,ntw_port]*y_k) - 1)
 
         return np.array(X_nn).T  # shape: (nb_freq, nb_n)
 
-    def _Xmn_k(self, cnx_k):
+    def _Xmn_k(self, cnx_k, f=slice(None)):
         '''
         Return the transmission coefficient x_mn of the mth column of
         intersection scattering matrix matrix [X]_k
         '''
         # get the char.impedance of the n
         X_mn = []
-        y_k = self._Y_k(cnx_k)
+        y_k = self._Y_k(cnx_k, f)
 
         # There is a problem in the case of two-ports connexion:
         # the formula (3) in P. Hallbjörner (2003) seems incorrect.
@@ -480,7 +618,7 @@ class Circuit():
         if len(cnx_k) == 2:
             z0s = []
             for (ntw, ntw_port) in cnx_k:
-                z0s.append(ntw.z0[:,ntw_port])
+                z0s.append(ntw.z0[f,ntw_port])
 
             z0eq = np.array(z0s).prod(axis=0)
 
@@ -489,16 +627,16 @@ class Circuit():
         else:
             # formula (3)
             for (ntw, ntw_port) in cnx_k:
-                X_mn.append( 2/(ntw.z0[:,ntw_port]*y_k) )
+                X_mn.append( 2/(ntw.z0[f,ntw_port]*y_k) )
 
         return np.array(X_mn).T  # shape: (nb_freq, nb_n)
 
-    def _Xk(self, cnx_k):
+    def _Xk(self, cnx_k, f=slice(None)):
         '''
         Return the scattering matrices [X]_k of the individual intersections k
         '''
-        Xnn = self._Xnn_k(cnx_k)  # shape: (nb_freq, nb_n)
-        Xmn = self._Xmn_k(cnx_k)  # shape: (nb_freq, nb_n)
+        Xnn = self._Xnn_k(cnx_k, f)  # shape: (nb_freq, nb_n)
+        Xmn = self._Xmn_k(cnx_k, f)  # shape: (nb_freq, nb_n)
         # # for loop version
         # Xs = []
         # for (_Xnn, _Xmn) in zip(Xnn, Xmn):  # for all frequencies
@@ -529,25 +667,15 @@ class Circuit():
         It is composed of the individual intersection matrices [X]_k assembled
         by bloc diagonal.
         '''
-        # Xk = []
-        # for cnx in self.connections:
-        #     Xk.append(self._Xk(cnx))
-        # Xk = np.array(Xk)
-
-        # #X = np.zeros(len(C.frequency), )
-        # Xf = []
-        # for (idx, f) in enumerate(self.frequency):
-        #     Xf.append(block_diag(*Xk[:,idx,:]))
-        # return np.array(Xf)  # shape: (nb_frequency, nb_inter*nb_n, nb_inter*nb_n)
-
-        # Slightly faster version
-        Xks = [self._Xk(cnx) for cnx in self.connections]
-
-        Xf = np.zeros((len(self.frequency), self.dim, self.dim), dtype='complex')
-        # TODO: avoid this for loop which is a bottleneck for large frequencies
-        for idx in np.nditer(np.arange(len(self.frequency))):
-            mat_list = [Xk[idx,:] for Xk in Xks]
-            Xf[idx,:] = block_diag(*mat_list)  # bottleneck 
+        return self._cached('X', self._X)
+
+    def _X(self, f=slice(None)):
+        # The blocks [X]_k are written at their offsets on the diagonal
+        # at all frequencies at once, instead of calling
+        # scipy.linalg.block_diag at each frequency.
+        Xf = np.zeros((self._nb_freq(f), self.dim, self.dim), dtype='complex')
+        for (start, stop), cnx in zip(self._blocks, self.connections):
+            Xf[:, start:stop, start:stop] = self._Xk(cnx, f)
         return Xf
 
     @property
@@ -555,31 +683,15 @@ class Circuit():
         '''
         Return the global scattering matrix of the networks
         '''
-        # list all networks which are not considered as "ports", 
-        # that is which do not contain "port" in their network name
-        ntws = {k:v for k,v in self.networks_dict().items() if 'port' not in k.lower()}
-
-        # generate the port reordering indexes from each connections
-        ntws_ports_reordering = {ntw:[] for ntw in ntws}
-        for (idx_cnx, cnx) in self.connections_list:
-            ntw, ntw_port = cnx
-            if ntw.name in ntws.keys():
-                ntws_ports_reordering[ntw.name].append([ntw_port, idx_cnx])
-
-        # re-ordering scattering parameters
-        S = np.zeros((len(self.frequency), self.dim, self.dim), dtype='complex' )
+        return self._cached('C', self._C)
 
-        for (ntw_name, ntw_ports) in ntws_ports_reordering.items():
-            # get the port re-ordering indexes (from -> to)
-            ntw_ports = np.array(ntw_ports)
-            # create the port permutations
-            from_port = list(product(ntw_ports[:,0], repeat=2))
-            to_port = list(product(ntw_ports[:,1], repeat=2))
-
-            #print(ntw_name, from_port, to_port)
-            for (_from, _to) in zip(from_port, to_port):
-                #print(f'{_from} --> {_to}')
-                S[:, _to[0], _to[1]] = ntws[ntw_name].s[:, _from[0], _from[1]]
+    def _C(self, f=slice(None)):
+        # re-ordering scattering parameters of the networks which are not
+        # considered as "ports", with the port indexes computed from the
+        # connections
+        S = np.zeros((self._nb_freq(f), self.dim, self.dim), dtype='complex' )
+        for (ntw, _from, _to) in self._ports_reordering:
+            S[:, _to[:, None], _to] = ntw.s[f, _from[:, None], _from]
 
         return S  # shape (nb_frequency, nb_inter*nb_n, nb_inter*nb_n)
 
@@ -589,10 +701,20 @@ class Circuit():
         Return the global scattering parameters of the circuit, that is with
         both "inner" and "outer" ports
         '''
+        return self._cached('s', self._s)
+
+    def _s(self):
+        return self._solve(self.X, self.C)
+
+    def _solve(self, X, C):
+        '''
+        Return the global scattering matrices for the stacked intersection
+        matrices X and networks matrices C, of shape (..., dim, dim)
+        '''
         # transpose is necessary to get expected result
-        #return np.transpose(self.X @ np.linalg.inv(np.identity(self.dim) - self.C @ self.X), axes=(0,2,1))
+        #return np.transpose(X @ np.linalg.inv(np.identity(self.dim) - C @ X), axes=(0,2,1))
         # does not use the @ operator for backward Python version compatibility
-        return np.transpose(np.matmul(self.X, np.linalg.inv(np.identity(self.dim) - np.matmul(self.C, self.X))), axes=(0,2,1))
+        return np.swapaxes(np.matmul(X, np.linalg.inv(np.identity(self.dim) - np.matmul(C, X))), -1, -2)
 
 
     @property
@@ -600,12 +722,7 @@ class Circuit():
         '''
         Return the indexes of the "external" ports. These must be labelled "port"
         '''
-        port_indexes = []
-        for (idx_cnx, cnx) in enumerate(chain.from_iterable(self.connections)):
-            ntw, ntw_port = cnx
-            if 'port' in str.lower(ntw.name):
-                port_indexes.append(idx_cnx)
-        return port_indexes
+        return list(self._port_indexes)
 
     def _cnx_z0(self, cnx_k):
         '''
@@ -634,10 +751,132 @@ class Circuit():
         '''
         Return the scattering parameters for the external ports
         '''
+        nb_ports = len(self.port_indexes)
+        S_ext = np.zeros((len(self.frequency), nb_ports, nb_ports), dtype='complex')
+        return self._s_external_into(S_ext)  # shape (nb_frequency, nb_ports, nb_ports)
+
+    def _s_external_into(self, out):
+        '''
+        Write the scattering parameters for the external ports in `out`.
+
+        With the sparse solver, or when the circuit is evaluated by chunks
+        of frequency, the chunks are written in `out` as they are solved.
+        When the cache is used, they are written in the cached array
+        instead, which is then copied once in `out`.
+        '''
+        if not (self._sparse() or self._chunked()):
+            out[:] = self._external(self.s)
+        elif not self.use_cache:
+            self._evaluate(self._s_external_chunk, out)
+        else:
+            out[:] = self._cached('s_external', lambda: self._evaluate(
+                self._s_external_chunk, np.empty_like(out)))
+        return out
+
+    def _s_external_chunk(self, f):
+        '''
+        Return the scattering parameters for the external ports at the
+        frequency points `f`
+        '''
+        if self._sparse():
+            return self._s_external_sparse(f)
+        return self._external(self._solve(self._X(f), self._C(f)))
+
+    def _sparse(self):
+        '''
+        Return True if the sparse solver is used
+        '''
+        if self.solver not in ('dense', 'sparse'):
+            raise ValueError("solver must be 'dense' or 'sparse'")
+        return self.solver == 'sparse'
+
+    def _chunked(self):
+        '''
+        Return True if the circuit is evaluated by chunks of frequency
+        '''
+        return self.chunk_size is not None or self.workers != 1
+
+    def _nb_freq(self, f):
+        '''
+        Return the number of frequency points of the slice `f`
+        '''
+        return len(range(len(self.frequency))[f])
+
+    def _evaluate(self, func, out):
+        '''
+        Write `func(f)` in `out[f]` for the chunks of frequency points `f`,
+        with a pool of :attr:`workers` threads.
+        '''
+        nb_freq = len(self.frequency)
+        chunk_size = nb_freq if self.chunk_size is None else max(int(self.chunk_size), 1)
+
+        def evaluate(f):
+            out[f] = func(f)
+
+        chunks = [slice(start, start + chunk_size) for start in range(0, nb_freq, chunk_size)]
+        results, errors = parallel_map(evaluate, chunks, workers=self.workers, pool='thread')
+        for error in errors:
+            if error is not None:
+                raise error
+        return out
+
+    def _sparse_entries(self, f=slice(None)):
+        '''
+        Return the (rows, columns, values) of the non-zero entries of [X] and
+        of [C] at the frequency points `f`, the values being of shape
+        (nb_frequency, nb_entries)
+        '''
+        nb_freq = self._nb_freq(f)
+        X_rows, X_cols, X_values = [], [], []
+        for (start, stop), cnx in zip(self._blocks, self.connections):
+            idx = np.arange(start, stop)
+            X_rows.append(np.repeat(idx, len(idx)))
+            X_cols.append(np.tile(idx, len(idx)))
+            X_values.append(self._Xk(cnx, f).reshape(nb_freq, -1))
+        C_rows, C_cols, C_values = [], [], []
+        for (ntw, _from, _to) in self._ports_reordering:
+            C_rows.append(np.repeat(_to, len(_to)))
+            C_cols.append(np.tile(_to, len(_to)))
+            C_values.append(ntw.s[f, _from[:, None], _from].reshape(nb_freq, -1))
+        return ((np.concatenate(X_rows), np.concatenate(X_cols), np.concatenate(X_values, axis=1)),
+                (np.concatenate(C_rows), np.concatenate(C_cols), np.concatenate(C_values, axis=1)))
+
+    def _sparse_factors(self, f=slice(None)):
+        '''
+        Yield, for each of the frequency points `f`, [X] as a sparse matrix
+        and the sparse LU decomposition of I - [C][X]
+        '''
+        (X_rows, X_cols, X_values), (C_rows, C_cols, C_values) = self._sparse_entries(f)
+        shape = (self.dim, self.dim)
+        I = identity(self.dim, dtype='complex', format='csc')
+        for (X_f, C_f) in zip(X_values, C_values):
+            X = coo_matrix((X_f, (X_rows, X_cols)), shape=shape).tocsr()
+            C = coo_matrix((C_f, (C_rows, C_cols)), shape=shape).tocsr()
+            yield X, splu((I - C.dot(X)).tocsc())
+
+    def _s_external_sparse(self, f=slice(None)):
+        '''
+        Return the external scattering parameters at the frequency points
+        `f`, with the sparse solver.
+        '''
+        # with s^T = X (I - C X)^-1, only the columns of (I - C X)^-1 of the
+        # external ports are solved for
+        port_indexes = self.port_indexes
+        nb_ports = len(port_indexes)
+        E = np.zeros((self.dim, nb_ports), dtype='complex')
+        E[port_indexes, np.arange(nb_ports)] = 1
+        S_ext = np.zeros((self._nb_freq(f), nb_ports, nb_ports), dtype='complex')
+        for (k, (X, lu)) in enumerate(self._sparse_factors(f)):
+            S_ext[k] = X[port_indexes, :].dot(lu.solve(E))
+        return S_ext
+
+    def _external(self, s):
+        '''
+        Return the external ports part of stacked global scattering matrices
+        '''
         port_indexes = self.port_indexes
         a, b = np.meshgrid(port_indexes, port_indexes)
-        S_ext = self.s[:, a, b]
-        return S_ext  # shape (nb_frequency, nb_ports, nb_ports)
+        return s[..., a, b]
 
     @property
     def network(self):
@@ -647,9 +886,111 @@ class Circuit():
         ntw = Network()
         ntw.frequency = self.frequency
         ntw.z0 = self.port_z0
-        ntw.s = self.s_external
+        nb_ports = len(self.port_indexes)
+        ntw.s = np.zeros((len(self.frequency), nb_ports, nb_ports), dtype='complex')
+        self._s_external_into(ntw.s)
         return ntw
 
+    def sweep(self, variants, chunk_size=None, as_array=False):
+        '''
+        Return the networks of variants of the circuit, where some networks
+        are replaced.
+
+        The variants share the topology of the circuit, and are solved
+        together, as a batch. Only the blocks of the matrices [C] and [X]
+        which depend on the replaced networks are computed for each
+        variant: [X] is reused as is when the replacements have the same
+        characteristic impedances as the original networks.
+
+        Parameters
+        ----------
+        variants : dict of lists of :class:`~skrf.network.Network`
+            For each network to replace, designated by its name, the list of
+            its replacements. All the lists have the same length, the number
+            of variants. The replacements have the same number of ports and
+            frequency as the networks they replace.
+        chunk_size : int or None
+            maximum number of variants solved together, to bound the memory
+            used. If None (default), chunks of about 32768 frequency points
+            are solved together.
+        as_array : bool
+            if True, return the stacked s-parameters instead of a NetworkSet.
+
+        Return
+        ------
+        ntwks : :class:`~skrf.networkSet.NetworkSet` or array
+            Networks of the variants, or their s-parameters, of shape
+            (nb_variants, nb_frequency, nb_ports, nb_ports), if `as_array`.
+
+        Examples
+        --------
+        >>> capacitors = [media.capacitor(c, name='C1') for c in [1e-12, 2e-12, 5e-12]]
+        >>> ns = circuit.sweep({'C1': capacitors})
+        '''
+        reordering = {ntw.name: (ntw, _from, _to)
+                      for (ntw, _from, _to) in self._ports_reordering}
+        nb_variants = None
+        for (name, ntws) in variants.items():
+            if name not in reordering:
+                raise ValueError('No network named {} in the circuit, or it is a port.'.format(name))
+            if nb_variants is None:
+                nb_variants = len(ntws)
+            elif len(ntws) != nb_variants:
+                raise ValueError('All the variants must have the same number of networks.')
+            for ntw in ntws:
+                if ntw.nports != reordering[name][0].nports:
+                    raise ValueError('{} must be replaced by {}-port networks.'.format(
+                        name, reordering[name][0].nports))
+                if ntw.frequency != self.frequency:
+                    raise ValueError('All Networks must have same frequencies')
+        if not nb_variants:
+            raise ValueError('No variant to evaluate.')
+
+        # intersections connected to networks whose characteristic
+        # impedances are changed
+        z0_changed = [name for (name, ntws) in variants.items()
+                      if any(not np.array_equal(ntw.z0, reordering[name][0].z0)
+                             for ntw in ntws)]
+        changed_cnx = [k for (k, cnx) in enumerate(self.connections)
+                       if any(ntw.name in z0_changed for (ntw, _) in cnx)]
+
+        if chunk_size is None:
+            chunk_size = 2**15 // len(self.frequency)
+        chunk_size = max(int(chunk_size), 1)
+
+        X, C = self.X, self.C
+        nb_ports = len(self.port_indexes)
+        S_ext = np.zeros((nb_variants, len(self.frequency), nb_ports, nb_ports),
+                         dtype='complex')
+        for start in range(0, nb_variants, chunk_size):
+            stop = min(start + chunk_size, nb_variants)
+            Cs = np.repeat(C[None], stop - start, axis=0)
+            for (name, ntws) in variants.items():
+                ntw, _from, _to = reordering[name]
+                s = np.array([ntw.s for ntw in ntws[start:stop]])
+                Cs[:, :, _to[:, None], _to] = s[:, :, _from[:, None], _from]
+            # [X] is copied for each variant even when it does not change,
+            # as the stacked matrix products are much faster than the
+            # broadcasted ones
+            Xs = np.repeat(X[None], stop - start, axis=0)
+            for idx in range(start, stop):
+                for k in changed_cnx:
+                    cnx = [(variants[ntw.name][idx] if ntw.name in variants else ntw, port)
+                           for (ntw, port) in self.connections[k]]
+                    (k_start, k_stop) = self._blocks[k]
+                    Xs[idx - start, :, k_start:k_stop, k_start:k_stop] = self._Xk(cnx)
+            S_ext[start:stop] = self._external(self._solve(Xs, Cs))
+
+        if as_array:
+            return S_ext
+        port_z0 = self.port_z0
+        ntwks = []
+        for idx in range(nb_variants):
+            name = ','.join(ntws[idx].name for ntws in variants.values() if ntws[idx].name)
+            ntwks.append(Network(frequency=self.frequency, s=S_ext[idx], z0=port_z0,
+                                 name=name or None))
+        return NetworkSet(ntwks)
+
 
     def s_active(self, a):
         '''
@@ -788,8 +1129,11 @@ class Circuit():
             Characteristic impedances of both "inner" and "outer" ports
 
         '''
+        return self._cached('z0', self._z0)
+
+    def _z0(self):
         z0s = []
-        for cnx_idx, (ntw, ntw_port) in self.connections_list:
+        for cnx_idx, (ntw, ntw_port) in self._connections_list:
             z0s.append(ntw.z0[:,ntw_port])
         return np.array(z0s).T
 
@@ -908,8 +1252,23 @@ class Circuit():
         phase excitation at "external" ports using `_a(power, phase)` method.
         
         '''
+        if self._sparse() or self._chunked():
+            b = np.zeros((len(self.frequency), self.dim), dtype='complex')
+            return self._evaluate(lambda f: self._b_chunk(a_internal, f), b)
         # return self.s @ a_internal
         return np.matmul(self.s, a_internal)
+
+    def _b_chunk(self, a_internal, f):
+        '''
+        Wave output array at "internal" ports, at the frequency points `f`
+        '''
+        if self._sparse():
+            # b = s a = (I - C X)^-T X^T a
+            b = np.zeros((self._nb_freq(f), self.dim), dtype='complex')
+            for (k, (X, lu)) in enumerate(self._sparse_factors(f)):
+                b[k] = lu.solve(X.T.dot(a_internal), trans='T')
+            return b
+        return np.matmul(self._solve(self._X(f), self._C(f)), a_internal)
     
     def currents(self, power, phase):
         '''
@@ -258,7 +258,7 @@ class Frequency(object):
         elif len(self.f) == len(other.f) == 0:
             return True
         else:
-            return (max(abs(self.f-other.f)) < ZERO)
+            return (npy.max(abs(self.f-other.f)) < ZERO)
 
     def __ne__(self,other: object) -> bool:
         return (not self.__eq__(other))
@@ -535,6 +535,17 @@ class Frequency(object):
         freq.unit = self.unit
         return freq
 
+    def _view(self, key: Union[int, slice] = None) -> 'Frequency':
+        '''
+        returns a Frequency whose frequency vector is a read-only view of
+        the slice `key` of this one, sharing its memory.
+        '''
+        freq = Frequency.__new__(Frequency)
+        freq.__dict__.update(self.__dict__)
+        freq._f = self._f[key] if key is not None else self._f.view()
+        freq._f.flags.writeable = False
+        return freq
+
     @property
     def t(self) -> npy.ndarray:
         '''
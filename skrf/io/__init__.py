@@ -24,9 +24,12 @@ through the Network constructor, :func:`~skrf.network.Network.__init__`
 
 .. automodule:: skrf.io.csv
 
+.. automodule:: skrf.io.native
+
 
 '''
 
 from .general import * 
 from .csv import * 
 from .touchstone import * 
+from .native import * 
@@ -71,7 +71,7 @@ import json
 import numpy as npy
 import glob
 
-from ..util import get_extn, get_fid
+from ..util import get_extn, get_fid, parallel_map
 from ..network import Network
 from ..frequency import Frequency
 from ..media import Media
@@ -243,7 +243,19 @@ def write(file, obj, overwrite = True):
         pickle.dump(obj, fid, protocol=2)
         fid.close()
 
-def read_all(dir: str ='.', contains = None, f_unit = None, obj_type=None, files: list=None, recursive=False) -> dict:
+def _read_file(filename):
+    '''
+    Read a skrf object from a pickle file, or a Network from a touchstone file
+    '''
+    try:
+        return read(filename)
+    except:
+        pass
+    return Network(filename)
+
+
+def read_all(dir: str ='.', contains = None, f_unit = None, obj_type=None, files: list=None, recursive=False,
+             workers: int = 1, pool: str = 'thread', errors: dict = None) -> dict:
     '''
     Read all skrf objects in a directory
 
@@ -267,6 +279,15 @@ def read_all(dir: str ='.', contains = None, f_unit = None, obj_type=None, files
         list of files to load, bypasses dir parameter.
     recursive : bool, optional
         If True, search in the specified directory and all other nested directories
+    workers : int, optional
+        number of files read in parallel. Default is 1 (no parallelism),
+        None uses the number of CPUs. See :func:`~skrf.util.parallel_map`
+    pool : {'thread', 'process'}
+        kind of pool used when `workers` is not 1. Parsing touchstone
+        files is mostly limited by the GIL, so 'process' is faster.
+    errors : dict, optional
+        if not None, filled with the exceptions raised by the files which
+        could not be read, keyed by filename
 
     Returns
     ---------
@@ -293,6 +314,11 @@ def read_all(dir: str ='.', contains = None, f_unit = None, obj_type=None, files
     {'delay_short': 1-Port Network: 'delay_short',  75-110 GHz, 201 pts, z0=[ 50.+0.j],
     'line': 2-Port Network: 'line',  75-110 GHz, 201 pts, z0=[ 50.+0.j  50.+0.j]}
 
+    Reading a large directory with 8 processes
+
+    >>> errors = {}
+    >>> rf.read_all('measurements/', workers=8, pool='process', errors=errors)
+
     See Also
     ----------
     read : read a skrf object
@@ -314,22 +340,16 @@ def read_all(dir: str ='.', contains = None, f_unit = None, obj_type=None, files
     else:
         filelist.extend(files)
 
-    for filename in filelist:
-        if contains is not None and contains not in filename:
-            continue
-        fullname = filename
-        keyname = os.path.splitext(filename.split(os.path.sep)[-1])[0]
-        try:
-            out[keyname] = read(fullname)
-            continue
-        except:
-            pass
+    if contains is not None:
+        filelist = [filename for filename in filelist if contains in filename]
 
-        try:
-            out[keyname] = Network(fullname)
-            continue
-        except:
-            pass
+    objs, errs = parallel_map(_read_file, filelist, workers=workers, pool=pool)
+    for filename, obj, err in zip(filelist, objs, errs):
+        keyname = os.path.splitext(filename.split(os.path.sep)[-1])[0]
+        if err is None:
+            out[keyname] = obj
+        elif errors is not None:
+            errors[filename] = err
 
     if f_unit is not None:
         for keyname in out:
@@ -484,7 +504,8 @@ def save_sesh(dict_objs, file='skrfSesh.p', module='skrf', exclude_prefix='_'):
 
     write(file, objects)
 
-def load_all_touchstones(dir = '.', contains=None, f_unit=None):
+def load_all_touchstones(dir = '.', contains=None, f_unit=None,
+                         workers=1, pool='thread', errors=None):
     '''
     Loads all touchtone files in a given dir into a dictionary.
 
@@ -501,6 +522,13 @@ def load_all_touchstones(dir = '.', contains=None, f_unit=None):
     f_unit  : ['hz','mhz','ghz']
             the frequency unit to assign all loaded networks. see
             :attr:`frequency.Frequency.unit`.
+    workers : int
+            number of files read in parallel, see :func:`read_all`
+    pool : {'thread', 'process'}
+            kind of pool used when `workers` is not 1
+    errors : dict
+            if not None, filled with the exceptions raised by the files
+            which could not be read, keyed by filename
 
     Returns
     ---------
@@ -517,18 +545,24 @@ def load_all_touchstones(dir = '.', contains=None, f_unit=None):
     '''
     ntwkDict = {}
 
+    filelist = []
     for f in os.listdir (dir):
         if contains is not None and contains not in f:
             continue
-        fullname = os.path.join(dir,f)
         keyname,extn = os.path.splitext(f)
         extn = extn.lower()
-        try:
-            if extn[1]== 's' and extn[-1]=='p':
-                ntwkDict[keyname]=(Network(dir +'/'+f))
-                if f_unit is not None: ntwkDict[keyname].frequency.unit=f_unit
-        except:
-            pass
+        if len(extn) > 2 and extn[1]== 's' and extn[-1]=='p':
+            filelist.append(f)
+
+    ntwks, errs = parallel_map(Network, [dir +'/'+f for f in filelist],
+                               workers=workers, pool=pool)
+    for f, ntwk, err in zip(filelist, ntwks, errs):
+        keyname = os.path.splitext(f)[0]
+        if err is None:
+            ntwkDict[keyname] = ntwk
+            if f_unit is not None: ntwkDict[keyname].frequency.unit=f_unit
+        elif errors is not None:
+            errors[dir +'/'+f] = err
     return ntwkDict
 
 def write_dict_of_networks(ntwkDict, dir='.'):
@@ -818,6 +852,8 @@ class TouchstoneEncoder(json.JSONEncoder):
             return npy.real(obj), npy.imag(obj)  # split into [real, im]
         if isinstance(obj, Frequency):
             return {'flist': obj.f_scaled.tolist(), 'funit': obj.unit}
+        if isinstance(obj, npy.dtype):
+            return obj.name
         return json.JSONEncoder.default(self, obj)
 
 
@@ -830,7 +866,7 @@ def to_json_string(network):
     :return: str
         JSON string representation of a network object.
     '''
-    return json.dumps(network.__dict__, cls=TouchstoneEncoder)
+    return json.dumps(network.__getstate__(), cls=TouchstoneEncoder)
 
 
 def from_json_string(obj_string):
@@ -842,7 +878,7 @@ def from_json_string(obj_string):
         A Network object, rebuilt from JSON.
     '''
     obj = json.loads(obj_string)
-    ntwk = Network()
+    ntwk = Network(dtype=obj.get('_dtype', None))
     ntwk.variables = obj['variables']
     ntwk.name = obj['name']
     ntwk.comments = obj['comments']
@@ -0,0 +1,288 @@
+'''
+.. module:: skrf.io.native
+
+========================================
+native (:mod:`skrf.io.native`)
+========================================
+
+Binary storage of Networks and NetworkSets.
+
+The native format stores the arrays of the Networks (frequency,
+s-parameters, port impedances, noise data) with their own dtype, so
+single precision Networks stay in single precision, and the
+other attributes (name, comments, port names, variables) as JSON. Unlike
+touchstone files, nothing has to be parsed, and unlike pickles, the files
+do not depend on the version of skrf or of python.
+
+A native file is an uncompressed zip archive of .npy files, the layout
+of :func:`numpy.savez`. It can thus also be opened with :func:`numpy.load`.
+Each Network is stored under its index in the file::
+
+    0/f.npy             frequency, in Hz
+    0/s.npy             s-parameters
+    0/z0.npy            port impedances
+    0/noise.npy         noise correlation matrices, if any
+    0/noise_f.npy       noise frequency, in Hz, if any
+    0/meta.npy          JSON string of the other attributes
+    1/f.npy
+    ...
+
+As the arrays are not compressed, they are read through memory-maps:
+only the Networks and the frequency points requested are read from disk.
+Networks can be appended to an existing file.
+
+.. autosummary::
+   :toctree: generated/
+
+   write_native
+   read_native
+   len_native
+
+'''
+import json
+import os
+import zipfile
+from io import UnsupportedOperation
+
+import numpy as npy
+from numpy.lib import format as npy_format
+
+from ..network import Network
+from ..frequency import Frequency
+from ..networkSet import NetworkSet
+
+
+def _write_array(archive, name, array):
+    '''
+    Write `array` in the .npy format as the member `name` of `archive`
+    '''
+    with archive.open(name, 'w', force_zip64=True) as fid:
+        npy_format.write_array(fid, npy.asanyarray(array), allow_pickle=False)
+
+
+def _member_offset(fid, info):
+    '''
+    Position of the data of a stored member of a zip archive
+    '''
+    # the local file header is 30 bytes, followed by the file name and
+    # an extra field, whose lengths are stored at bytes 26 and 28
+    fid.seek(info.header_offset + 26)
+    lengths = npy.frombuffer(fid.read(4), dtype='<u2')
+    return info.header_offset + 30 + int(lengths[0]) + int(lengths[1])
+
+
+def _read_array(archive, fid, name, key=None, mmap=True):
+    '''
+    Read the .npy member `name` of `archive`, indexed by `key` on its
+    first axis.
+
+    If `mmap` is True and the member is not compressed, the array is read
+    through a memory-map of the file-object `fid`, so only the part selected
+    by `key` is read from disk.
+    '''
+    info = archive.getinfo(name)
+    if mmap and fid is not None and info.compress_type == zipfile.ZIP_STORED:
+        fid.seek(_member_offset(fid, info))
+        version = npy_format.read_magic(fid)
+        if version == (1, 0):
+            header = npy_format.read_array_header_1_0(fid)
+        else:
+            header = npy_format.read_array_header_2_0(fid)
+        shape, fortran_order, dtype = header
+        if dtype.hasobject:
+            raise ValueError('object arrays can not be read')
+        array = npy.memmap(fid, dtype=dtype, mode='r', offset=fid.tell(),
+                           shape=shape, order='F' if fortran_order else 'C')
+    else:
+        with archive.open(name) as member:
+            array = npy_format.read_array(member, allow_pickle=False)
+    if key is not None:
+        array = array[key]
+    return npy.array(array)
+
+
+def _indexes(archive):
+    '''
+    Sorted indexes of the Networks stored in `archive`
+    '''
+    return sorted(int(name.split('/')[0]) for name in archive.namelist()
+                  if name.endswith('/s.npy'))
+
+
+def write_native(file, obj, append=False):
+    '''
+    Write Networks to a native binary file.
+
+    Parameters
+    ----------
+    file : str or file-object
+        file to write to. '.npz' is a natural extension, as the file
+        can also be read by :func:`numpy.load`.
+    obj : :class:`~skrf.network.Network`, list of Networks or :class:`~skrf.networkSet.NetworkSet`
+        Networks to write
+    append : bool, optional
+        if True, the Networks are added after the ones already stored
+        in `file`. Otherwise (default), `file` is overwritten.
+
+    Examples
+    --------
+    >>> rf.write_native('measurements.npz', ntwk_set)
+    >>> rf.write_native('measurements.npz', new_ntwk, append=True)
+
+    See Also
+    --------
+    read_native
+    skrf.network.Network.write_native
+    skrf.networkSet.NetworkSet.write_native
+    '''
+    if isinstance(obj, Network):
+        ntwks = [obj]
+    elif isinstance(obj, NetworkSet):
+        ntwks = obj.ntwk_set
+    else:
+        ntwks = list(obj)
+
+    if append and (not isinstance(file, str) or os.path.exists(file)):
+        mode = 'a'
+    else:
+        mode = 'w'
+
+    with zipfile.ZipFile(file, mode, compression=zipfile.ZIP_STORED,
+                         allowZip64=True) as archive:
+        start = len(_indexes(archive)) if mode == 'a' else 0
+        for k, ntwk in enumerate(ntwks):
+            prefix = '%i/' % (start + k)
+            meta = {
+                'name': ntwk.name,
+                'comments': ntwk.comments,
+                'port_names': ntwk.port_names,
+                'variables': getattr(ntwk, 'variables', None),
+                'f_unit': ntwk.frequency.unit,
+                's_def': ntwk.s_def,
+                }
+            _write_array(archive, prefix + 'f.npy', ntwk.frequency.f)
+            _write_array(archive, prefix + 's.npy', ntwk.s)
+            _write_array(archive, prefix + 'z0.npy', ntwk.z0)
+            if ntwk.noise is not None and ntwk.noise_freq is not None:
+                _write_array(archive, prefix + 'noise.npy', ntwk.noise)
+                _write_array(archive, prefix + 'noise_f.npy', ntwk.noise_freq.f)
+            _write_array(archive, prefix + 'meta.npy', npy.array(json.dumps(meta)))
+
+
+def len_native(file):
+    '''
+    Number of Networks stored in a native binary file.
+
+    Parameters
+    ----------
+    file : str or file-object
+        native file written by :func:`write_native`
+
+    Returns
+    -------
+    n : int
+        number of Networks
+    '''
+    with zipfile.ZipFile(file) as archive:
+        return len(_indexes(archive))
+
+
+def read_native(file, index=None, f_slice=None, mmap=True):
+    '''
+    Read Networks from a native binary file.
+
+    Parameters
+    ----------
+    file : str or file-object
+        native file written by :func:`write_native`
+    index : int, list of int or slice, optional
+        Networks to read, in the order of the file. If None (default),
+        all the Networks are read.
+    f_slice : slice, array of int or str, optional
+        frequency points to read. Either indices, or a human readable
+        string like '50.1-75.5ghz' as for
+        :meth:`skrf.network.Network.__getitem__`. If None (default), all the
+        frequency points are read.
+    mmap : bool, optional
+        if True (default), the data are read through memory-maps, so that
+        only the requested Networks and frequency points are read from disk.
+
+    Returns
+    -------
+    ntwks : :class:`~skrf.network.Network` or list of Networks
+        a Network if `index` is an int, a list of Networks otherwise
+
+    Examples
+    --------
+    >>> ntwks = rf.read_native('measurements.npz')
+    >>> ntwk = rf.read_native('measurements.npz', index=12, f_slice='1-2ghz')
+
+    See Also
+    --------
+    write_native
+    skrf.network.Network.from_native
+    skrf.networkSet.NetworkSet.from_native
+    '''
+    if isinstance(file, str):
+        fid = open(file, 'rb')
+    else:
+        # only the files of the operating system can be memory-mapped
+        fid = file
+        try:
+            file.fileno()
+        except (AttributeError, UnsupportedOperation, OSError):
+            fid = None
+
+    try:
+        with zipfile.ZipFile(file if fid is None else fid) as archive:
+            indexes = _indexes(archive)
+            if index is None:
+                selected = indexes
+            elif isinstance(index, slice):
+                selected = indexes[index]
+            elif npy.ndim(index) == 0:
+                selected = [indexes[index]]
+            else:
+                selected = [indexes[k] for k in index]
+
+            ntwks = []
+            for k in selected:
+                prefix = '%i/' % k
+                meta = json.loads(str(_read_array(archive, fid, prefix + 'meta.npy',
+                                                  mmap=False)))
+                f = _read_array(archive, fid, prefix + 'f.npy', mmap=mmap)
+                key = f_slice
+                if isinstance(f_slice, str):
+                    frequency = Frequency.from_f(f, unit='hz')
+                    frequency.unit = meta['f_unit']
+                    sliced_f = frequency[f_slice].f
+                    start = npy.searchsorted(f, sliced_f[0]) if len(sliced_f) else 0
+                    key = slice(start, start + len(sliced_f))
+                if key is not None:
+                    f = f[key]
+                s = _read_array(archive, fid, prefix + 's.npy', key, mmap=mmap)
+                z0 = _read_array(archive, fid, prefix + 'z0.npy', mmap=mmap)
+                if z0.ndim == 2 and key is not None:
+                    z0 = z0[key]
+
+                frequency = Frequency.from_f(f, unit='hz')
+                frequency.unit = meta['f_unit']
+                ntwk = Network(frequency=frequency, s=s, z0=z0,
+                               name=meta['name'], comments=meta['comments'],
+                               s_def=meta['s_def'], dtype=s.dtype)
+                ntwk.port_names = meta['port_names']
+                if meta['variables'] is not None:
+                    ntwk.variables = meta['variables']
+                if prefix + 'noise.npy' in archive.namelist():
+                    noise_f = _read_array(archive, fid, prefix + 'noise_f.npy', mmap=mmap)
+                    ntwk.noise = _read_array(archive, fid, prefix + 'noise.npy', mmap=mmap)
+                    ntwk.noise_freq = Frequency.from_f(noise_f, unit='hz')
+                    ntwk.noise_freq.unit = meta['f_unit']
+                ntwks.append(ntwk)
+    finally:
+        if isinstance(file, str):
+            fid.close()
+
+    if index is not None and npy.ndim(index) == 0 and not isinstance(index, slice):
+        return ntwks[0]
+    return ntwks
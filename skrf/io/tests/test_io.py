@@ -1,5 +1,6 @@
 
 import unittest
+import io
 import os
 import numpy as npy
 
@@ -44,6 +45,24 @@ class IOTestCase(unittest.TestCase):
     def test_read_all_files(self):
         rf.read_all(files=self.test_files)
 
+    def test_read_all_parallel(self):
+        files = self.test_files + [os.path.join(self.test_dir, 'missing.s2p')]
+        ntwks = rf.read_all(files=files)
+        for pool in ['thread', 'process']:
+            errors = {}
+            ntwks_parallel = rf.read_all(files=files, workers=2, pool=pool,
+                                         errors=errors)
+            self.assertEqual(list(ntwks_parallel), list(ntwks))
+            for k in ntwks:
+                self.assertEqual(ntwks_parallel[k], ntwks[k])
+            self.assertEqual(list(errors), files[-1:])
+
+    def test_load_all_touchstones_parallel(self):
+        ntwks = rf.load_all_touchstones(self.test_dir, contains='ntwk')
+        ntwks_parallel = rf.load_all_touchstones(self.test_dir, contains='ntwk',
+                                                 workers=2)
+        self.assertEqual(list(ntwks_parallel), list(ntwks))
+
     def test_save_sesh(self):
         a=self.ntwk1
         b=self.ntwk2
@@ -164,3 +183,78 @@ class IOTestCase(unittest.TestCase):
         given = {'p1': ('.03', ''), 'p2': ('0.03', ''), 'p3': ('100', ''), 'p4': ('2.5', 'um')}
         actual = rf.io.Touchstone(self.ntwk_comments_file).get_comment_variables()
         self.assertEqual(given, actual)
+
+    def test_native_roundtrip(self):
+        '''
+        Networks and NetworkSets written to a native file should be read
+        back unchanged, with or without memory-maps.
+        '''
+        native_file = os.path.join(self.test_dir, 'native.npz')
+        noisy = rf.Network(os.path.join(self.test_dir, '../../tests/ntwk_noise.s2p'))
+        try:
+            for ntwk in [self.ntwk1, self.short, noisy]:
+                ntwk.write_native(native_file)
+                for mmap in [True, False]:
+                    actual = rf.Network.from_native(native_file, mmap=mmap)
+                    self.assertEqual(actual, ntwk)
+                    self.assertEqual(actual.frequency, ntwk.frequency)
+                    self.assertEqual(actual.name, ntwk.name)
+                    self.assertEqual(actual.comments, ntwk.comments)
+                    self.assertEqual(actual.port_names, ntwk.port_names)
+                    npy.testing.assert_array_equal(actual.z0, ntwk.z0)
+            npy.testing.assert_array_equal(actual.noise, noisy.noise)
+            npy.testing.assert_array_equal(actual.noise_freq.f, noisy.noise_freq.f)
+
+            ns = rf.NetworkSet([self.ntwk1, self.ntwk2, self.ntwk3])
+            ns.write_native(native_file)
+            self.assertEqual(rf.NetworkSet.from_native(native_file), ns)
+            # readable by numpy as well
+            with npy.load(native_file) as data:
+                npy.testing.assert_array_equal(data['1/s'], self.ntwk2.s)
+        finally:
+            os.remove(native_file)
+
+    def test_native_bytesio(self):
+        '''
+        Networks written to a file-object which is not a file of the
+        operating system should be read back, as it can not be memory-mapped.
+        '''
+        buf = io.BytesIO()
+        rf.write_native(buf, [self.ntwk1, self.ntwk2])
+        buf.seek(0)
+        self.assertEqual(rf.read_native(buf), [self.ntwk1, self.ntwk2])
+        buf.seek(0)
+        self.assertEqual(rf.read_native(buf, index=1, f_slice='1-2ghz'),
+                         self.ntwk2['1-2ghz'])
+
+    def test_native_partial_read(self):
+        '''
+        Networks appended to a native file, and parts of them, should be
+        read back.
+        '''
+        native_file = os.path.join(self.test_dir, 'native.npz')
+        try:
+            rf.write_native(native_file, [self.ntwk1, self.ntwk2])
+            self.ntwk3.write_native(native_file, append=True)
+            self.assertEqual(rf.len_native(native_file), 3)
+
+            ntwks = rf.read_native(native_file)
+            self.assertEqual(ntwks, [self.ntwk1, self.ntwk2, self.ntwk3])
+            self.assertEqual(rf.read_native(native_file, index=-1), self.ntwk3)
+            self.assertEqual(rf.read_native(native_file, index=[2, 0]),
+                             [self.ntwk3, self.ntwk1])
+            self.assertEqual(rf.read_native(native_file, index=slice(1, None)),
+                             [self.ntwk2, self.ntwk3])
+
+            for f_slice in [slice(10, 20), npy.array([0, 5, 7]), '1-2ghz']:
+                for mmap in [True, False]:
+                    actual = rf.read_native(native_file, index=1,
+                                            f_slice=f_slice, mmap=mmap)
+                    self.assertEqual(actual, self.ntwk2[f_slice])
+
+            ns = rf.NetworkSet.from_native(native_file, index=[0, 1],
+                                           f_slice='1-2ghz')
+            self.assertEqual(len(ns), 2)
+            self.assertEqual(ns[0], self.ntwk1['1-2ghz'])
+        finally:
+            os.remove(native_file)
@@ -2,6 +2,7 @@
 import unittest
 import os
 import numpy as npy
+from io import StringIO
 from pathlib import Path
 from zipfile import ZipFile
 
@@ -100,6 +101,129 @@ class TouchstoneTestCase(unittest.TestCase):
                         k, str(expected_sp_ri[k]), str(sp_ri[k]))  )
 
 
+    def test_parser_engines(self):
+        '''
+        The fast and the line by line parsers should read the same data
+        and header information from all the test touchstone files.
+        '''
+        test_dirs = [self.test_dir,
+                     os.path.join(self.test_dir, '../../tests/')]
+        filenames = []
+        for test_dir in test_dirs:
+            filenames += [os.path.join(test_dir, f) for f in os.listdir(test_dir)
+                          if f.lower().endswith('p') and '.s' in f.lower()]
+        self.assertTrue(len(filenames) > 0)
+
+        for filename in filenames:
+            touch_python = Touchstone(filename, engine='python')
+            touch_fast = Touchstone(filename, engine='fast')
+            npy.testing.assert_array_equal(touch_python.sparameters,
+                                           touch_fast.sparameters)
+            if touch_python.noise is None:
+                self.assertIsNone(touch_fast.noise)
+            else:
+                npy.testing.assert_array_equal(touch_python.noise,
+                                               touch_fast.noise)
+            for attr in ['comments', 'port_names', 'reference', 'resistance',
+                         'frequency_unit', 'parameter', 'format', 'rank']:
+                self.assertEqual(getattr(touch_python, attr),
+                                 getattr(touch_fast, attr),
+                                 msg='%s differs for %s' % (attr, filename))
+
+    def test_parser_fallback(self):
+        '''
+        A data section which can not be converted in one pass is read by
+        the line by line parser when the engine is 'auto'.
+        '''
+        filename = os.path.join(self.test_dir, 'simple_touchstone.s2p')
+        with open(filename) as fid:
+            lines = fid.readlines()
+        # keyword in the middle of the data, skipped by the line by line parser
+        lines.insert(4, '[Network Data]\n')
+        text = ''.join(lines)
+
+        fid = StringIO(text)
+        fid.name = filename
+        self.assertRaises(ValueError, Touchstone, fid, engine='fast')
+
+        fid = StringIO(text)
+        fid.name = filename
+        touch = Touchstone(fid, engine='auto')
+        f, s = touch.get_sparameter_arrays()
+        npy.testing.assert_array_equal(f, [1.0e9, 1.1e9])
+        self.assertEqual(s[1, 1, 1], 15+16j)
+
+    def test_stream_engine(self):
+        '''
+        The stream engine should read the same s-parameters and noise data
+        as the default engine, whatever the chunk size.
+        '''
+        for filename in ['ntwk_noise.s2p', 'cst_example_6ports_V2.ts',
+                         'hfss_19.2.s10p']:
+            filename = os.path.join(self.test_dir, '../../tests/', filename)
+            touch = Touchstone(filename)
+            f, s = touch.get_sparameter_arrays()
+            for chunk_size in [1, 7, 1024]:
+                touch_stream = Touchstone(filename, engine='stream',
+                                          chunk_size=chunk_size)
+                f_stream, s_stream = touch_stream.get_sparameter_arrays()
+                npy.testing.assert_array_equal(f, f_stream)
+                npy.testing.assert_array_equal(s, s_stream)
+                if touch.noise is not None:
+                    npy.testing.assert_array_equal(touch.noise,
+                                                   touch_stream.noise)
+            self.assertRaises(ValueError, touch_stream.get_sparameter_data)
+
+    def test_read_touchstone_chunks(self):
+        '''
+        The frequency-sliced Networks should add up to the whole Network.
+        '''
+        filename = os.path.join(self.test_dir, 'ntwk1.s2p')
+        ntwk = rf.Network(filename)
+        chunks = list(rf.read_touchstone_chunks(filename, chunk_size=10))
+        self.assertEqual(len(chunks), int(npy.ceil(len(ntwk.f) / 10.)))
+        for k, chunk in enumerate(chunks):
+            self.assertEqual(chunk.name, ntwk.name)
+            self.assertEqual(chunk, ntwk[k*10:(k+1)*10])
+
+        with open(filename) as fid:
+            chunks = list(rf.read_touchstone_chunks(fid, chunk_size=1000))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0], ntwk)
+
+    def test_read_touchstone_header(self):
+        '''
+        The metadata should match the ones of the Network read from the
+        same file.
+        '''
+        for filename in ['ntwk1.s2p', 'ntwk_noise.s2p', 'hfss_19.2.s10p',
+                         'cst_example_6ports_V2.ts']:
+            filename = os.path.join(self.test_dir, '../../tests/', filename)
+            ntwk = rf.Network(filename)
+            header = rf.read_touchstone_header(filename)
+            self.assertEqual(header['rank'], ntwk.nports)
+            self.assertEqual(header['npoints'], len(ntwk.f))
+            self.assertEqual(header['f_start'], ntwk.f[0])
+            self.assertEqual(header['f_stop'], ntwk.f[-1])
+            self.assertEqual(header['port_names'], ntwk.port_names)
+            self.assertEqual(header['comments'], ntwk.comments)
+            self.assertEqual(len(header['reference']), ntwk.nports)
+
+    def test_read_all_touchstone_headers(self):
+        '''
+        All the touchstone files of a directory should be scanned.
+        '''
+        test_dir = os.path.join(self.test_dir, '../../tests/')
+        headers = rf.read_all_touchstone_headers(test_dir)
+        filenames = [f for f in os.listdir(test_dir) if f.endswith('p')
+                     and '.s' in f]
+        self.assertEqual(len(headers), len(filenames))
+
+        headers = rf.read_all_touchstone_headers(test_dir, contains='ntwk4')
+        self.assertEqual(len(headers), 2)
+        for filename in headers:
+            self.assertIn('ntwk4', filename)
+
     def test_HFSS_touchstone_files(self):
         """ 
         HFSS can export additional information in the Touchstone file
@@ -22,11 +22,17 @@ Functions related to reading/writing touchstones.
    hfss_touchstone_2_media
    hfss_touchstone_2_network
    read_zipped_touchstones
+   read_touchstone_chunks
+   read_touchstone_header
+   read_all_touchstone_headers
 
 """
 import re
 import os
+import glob
+import warnings
 import zipfile
+from io import StringIO, TextIOBase, TextIOWrapper
 import numpy
 import numpy as npy
 
@@ -38,6 +44,28 @@ from ..frequency import Frequency
 from ..media import Media, DefinedGammaZ0
 from .. import mathFunctions as mf
 
+_re_comment = re.compile(r'!.*')
+_re_end_keyword = re.compile(r'\[end\]', re.IGNORECASE)
+
+
+def _str2values(text):
+    """
+    Convert a touchstone data section to a 1D array of floats, in one pass.
+
+    Raises a ValueError if `text` contains anything else than numbers,
+    comments and the [End] keyword.
+    """
+    data = _re_end_keyword.sub(' ', _re_comment.sub(' ', text))
+    if not data.strip():
+        return numpy.array([])
+    with warnings.catch_warnings():
+        # numpy only warns when it can not read the string to its end
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return numpy.fromstring(data, sep=' ')
+        except DeprecationWarning as e:
+            raise ValueError(str(e))
+
 
 class Touchstone:
     """
@@ -50,7 +78,7 @@ class Touchstone:
     .. [#] https://ibis.org/interconnect_wip/touchstone_spec2_draft.pdf
     .. [##] https://ibis.org/touchstone_ver2.0/touchstone_ver2_0.pdf
     """
-    def __init__(self, file):
+    def __init__(self, file, engine='auto', chunk_size=1024):
         """
         constructor
 
@@ -58,6 +86,21 @@ class Touchstone:
         -------------
         file : str or file-object
             touchstone file to load
+        engine : {'auto', 'fast', 'python', 'stream'}
+            parser used for the numeric data.
+
+            * 'fast': the header is parsed line by line, then the whole
+              data section is converted at once by numpy.
+            * 'python': every data line is converted separately.
+            * 'auto' (default): try 'fast' and fall back on 'python'
+              if the data section can not be converted in one pass.
+            * 'stream': the data section is converted `chunk_size`
+              frequency points at a time, straight into a preallocated
+              complex array. Only :meth:`get_sparameter_arrays` is
+              available with this engine.
+        chunk_size : int
+            number of frequency points converted at a time by the
+            'stream' engine
 
         Examples
         ---------
@@ -71,7 +114,21 @@ class Touchstone:
         >>> t = rf.Touchstone(file)
         """
         fid = get_fid(file)
-        filename = fid.name
+        self._init_attributes(fid.name)
+        self.load_file(fid, engine=engine, chunk_size=chunk_size)
+
+        self.gamma = []
+        self.z0 = []
+
+        if self.is_from_hfss():
+            self.get_gamma_z0_from_fid(fid)
+
+        fid.close()
+
+    def _init_attributes(self, filename):
+        """
+        Set the internal data structures to their default values
+        """
         ## file name of the touchstone data file
         self.filename = filename
 
@@ -104,21 +161,76 @@ class Touchstone:
         self.port_names = None
 
         self.comment_variables=None
-        self.load_file(fid)
+        ## frequency (Hz) and complex s-parameters read by the 'stream' engine
+        self._f = None
+        self._s = None
 
-        self.gamma = []
-        self.z0 = []
+    def load_file(self, fid, engine='auto', chunk_size=1024):
+        """
+        Load the touchstone file into the internal data structures
 
-        if self.is_from_hfss:
-            self.get_gamma_z0_from_fid(fid)
+        Parameters
+        ------------
+        fid : file-object
+            touchstone file to load
+        engine : {'auto', 'fast', 'python', 'stream'}
+            parser used for the numeric data, see :class:`Touchstone`
+        chunk_size : int
+            number of frequency points converted at a time by the
+            'stream' engine
+        """
+        self._check_extension()
+
+        if engine == 'stream':
+            self._read_stream(fid, chunk_size)
+            return
+        elif engine == 'python':
+            values = []
+            self._parse_lines(fid, values)
+        elif engine in ('auto', 'fast'):
+            text = fid.read()
+            if isinstance(text, bytes):
+                text = text.decode('utf-8')
+            try:
+                values = self._parse_values_fast(text)
+            except ValueError:
+                if engine == 'fast':
+                    raise
+                # start over with the line by line parser
+                self._init_attributes(self.filename)
+                self._check_extension()
+                values = []
+                self._parse_lines(StringIO(text), values)
+        else:
+            raise ValueError("engine must be 'auto', 'fast', 'python' or 'stream'")
+        self._finalize_header()
 
-        fid.close()
+        # let's do some post-processing to the read values
+        # for s2p parameters there may be noise parameters in the value list
+        values = numpy.asarray(values)
+        if self.rank == 2:
+            # the first frequency value that is smaller than the last one is the
+            # indicator for the start of the noise section
+            # each set of the s-parameter section is 9 values long
+            pos = numpy.where(numpy.sign(numpy.diff(values[::9])) == -1)
+            if len(pos[0]) != 0:
+                # we have noise data in the values
+                pos = pos[0][0] + 1   # add 1 because diff reduced it by 1
+                noise_values = values[pos*9:]
+                values = values[:pos*9]
+                self.noise = noise_values.reshape((-1,5))
+
+        if len(values)%(1+2*(self.rank)**2) != 0 :
+            # incomplete data line / matrix found
+            raise AssertionError
 
-    def load_file(self, fid):
+        # reshape the values to match the rank
+        self.sparameters = values.reshape((-1, 1 + 2*self.rank**2))
+
+    def _check_extension(self):
         """
-        Load the touchstone file into the internal data structures
+        Check the filename extension and get the rank of .sNp files
         """
-
         filename=self.filename
 
         # Check the filename extension. 
@@ -136,11 +248,34 @@ class Touchstone:
         else:
             raise Exception('Filename does not have the expected Touchstone extension (.sNp or .ts)')
 
-        values = []
+    def _finalize_header(self):
+        """
+        Set the values derived from the header
+        """
+        # multiplier from the frequency unit
+        self.frequency_mult = {'hz':1.0, 'khz':1e3,
+                               'mhz':1e6, 'ghz':1e9}.get(self.frequency_unit)
+        # set the reference to the resistance value if no [reference] is provided
+        if not self.reference:
+            self.reference = [self.resistance] * self.rank
+
+    def _parse_lines(self, fid, values=None):
+        """
+        Parse the lines of the touchstone file, one at a time.
+
+        Header information (comments, option line and keywords) are stored
+        in the internal data structures. If `values` is a list, the numeric
+        data are appended to it. Otherwise the parsing stops at the first
+        data line, and the position of this line in `fid` and the line
+        itself, without comment, are returned.
+        """
+        pos = 0
         while True:
             line = fid.readline()
             if not line:
                 break
+            line_start = pos
+            pos += len(line)
             # store comments if they precede the option line
             line = line.split('!',1)
             if len(line) == 2:
@@ -183,6 +318,7 @@ class Touchstone:
                 self.reference = [ float(r) for r in line.split()[2:] ]
                 if not self.reference:
                     line = fid.readline()
+                    pos += len(line)
                     self.reference = [ float(r) for r in line.split()]
                 continue
             
@@ -225,37 +361,137 @@ class Touchstone:
 
                 continue
 
+            # first data line: stop here if the data are converted elsewhere
+            if values is None:
+                return line_start, line
+
             # collect all values without taking care of there meaning
             # we're separating them later
             values.extend([ float(v) for v in line.split() ])
 
-        # let's do some post-processing to the read values
-        # for s2p parameters there may be noise parameters in the value list
-        values = numpy.asarray(values)
-        if self.rank == 2:
-            # the first frequency value that is smaller than the last one is the
-            # indicator for the start of the noise section
-            # each set of the s-parameter section is 9 values long
-            pos = numpy.where(numpy.sign(numpy.diff(values[::9])) == -1)
-            if len(pos[0]) != 0:
-                # we have noise data in the values
-                pos = pos[0][0] + 1   # add 1 because diff reduced it by 1
-                noise_values = values[pos*9:]
-                values = values[:pos*9]
-                self.noise = noise_values.reshape((-1,5))
+        return None, None
 
-        if len(values)%(1+2*(self.rank)**2) != 0 :
+    def _parse_values_fast(self, text):
+        """
+        Parse the header, then convert the whole data section in one pass.
+
+        Raises a ValueError if the data section contains anything else than
+        numbers, comments and the [End] keyword.
+        """
+        pos, line = self._parse_lines(StringIO(text))
+        if pos is None:
+            return numpy.array([])
+        return _str2values(text[pos:])
+
+    def _open_stream(self, fid):
+        """
+        Parse the header of `fid`, leaving the data section in the file.
+
+        Returns the text file-object positioned after the first data line,
+        and this line.
+        """
+        if not isinstance(fid, TextIOBase):
+            fid = TextIOWrapper(fid, encoding='utf-8')
+        pos, line = self._parse_lines(fid)
+        self._finalize_header()
+        return fid, line
+
+    def _iter_sparameter_chunks(self, fid, line, chunk_size):
+        """
+        Generator of (f, s) arrays of at most `chunk_size` frequency points.
+
+        The data section of `fid` is converted one block of lines at a
+        time, `line` being the first data line already read by
+        :meth:`_open_stream`. For 2-port files, the noise data found at the
+        end of the data section are stored in :attr:`noise`.
+        """
+        n_values = 1 + 2*self.rank**2
+        # about `chunk_size` frequency points are read at a time,
+        # assuming ~20 characters per value
+        size_hint = chunk_size * n_values * 20
+        values = _str2values(line) if line else numpy.array([])
+        f_last = -numpy.inf
+        noise = None
+        while True:
+            lines = fid.readlines(size_hint)
+            if lines:
+                block = _str2values(''.join(lines))
+                if noise is not None:
+                    noise.append(block)
+                    continue
+                values = numpy.concatenate((values, block))
+                if len(values) < chunk_size * n_values:
+                    continue
+
+            n = len(values) // n_values
+            if self.rank == 2 and noise is None:
+                # the first frequency value that is smaller than the last one
+                # is the indicator for the start of the noise section
+                f = numpy.concatenate(([f_last], values[::n_values]))
+                pos = numpy.where(numpy.diff(f) < 0)[0]
+                if len(pos) != 0:
+                    n = pos[0]
+                    noise = [values[n*n_values:]]
+            if lines and noise is None:
+                # keep the last incomplete chunk for the next block
+                n = n - n % chunk_size
+
+            records = values[:n*n_values].reshape((-1, n_values))
+            for start in range(0, n, chunk_size):
+                yield self._values_to_arrays(records[start:start + chunk_size])
+            if n > 0:
+                f_last = records[-1, 0]
+            values = values[n*n_values:] if noise is None else numpy.array([])
+
+            if not lines:
+                break
+
+        if len(values) != 0:
             # incomplete data line / matrix found
             raise AssertionError
+        if noise is not None:
+            self.noise = numpy.concatenate(noise).reshape((-1, 5))
 
-        # reshape the values to match the rank
-        self.sparameters = values.reshape((-1, 1 + 2*self.rank**2))
-        # multiplier from the frequency unit
-        self.frequency_mult = {'hz':1.0, 'khz':1e3,
-                               'mhz':1e6, 'ghz':1e9}.get(self.frequency_unit)
-        # set the reference to the resistance value if no [reference] is provided
-        if not self.reference:
-            self.reference = [self.resistance] * self.rank
+    def _read_stream(self, fid, chunk_size):
+        """
+        Read the s-parameters into a preallocated complex array, converting
+        `chunk_size` frequency points at a time.
+
+        The number of frequency points is taken from the
+        [Number of Frequencies] keyword if any, or is counted beforehand.
+        """
+        text_fid, line = self._open_stream(fid)
+        n_values = 1 + 2*self.rank**2
+        if self.frequency_nb is not None:
+            nfreq = int(self.frequency_nb)
+        else:
+            # upper bound, as the count includes the noise data if any
+            start = text_fid.tell()
+            count = len(line.split()) if line else 0
+            while True:
+                lines = text_fid.readlines(chunk_size * n_values * 20)
+                if not lines:
+                    break
+                count += len(_re_end_keyword.sub(' ',
+                             _re_comment.sub(' ', ''.join(lines))).split())
+            text_fid.seek(start)
+            nfreq = count // n_values
+
+        self._f = numpy.empty(nfreq)
+        self._s = numpy.empty((nfreq, self.rank, self.rank), dtype=complex)
+        n = 0
+        for f, s in self._iter_sparameter_chunks(text_fid, line, chunk_size):
+            if n + len(f) > nfreq:
+                raise ValueError('more than %i frequency points found' % nfreq)
+            self._f[n:n + len(f)] = f
+            self._s[n:n + len(f)] = s
+            n += len(f)
+        self._f = self._f[:n]
+        self._s = self._s[:n]
+
+        if text_fid is not fid:
+            # do not close the binary file-object with its text wrapper
+            text_fid.detach()
 
     def get_comments(self, ignored_comments = ['Created with skrf']):
         """
@@ -352,6 +588,8 @@ class Touchstone:
             list of numpy.arrays
 
         """
+        if self.sparameters is None:
+            raise ValueError("original data are not available with the 'stream' engine")
         ret = {}
         if format == 'orig':
             values = self.sparameters
@@ -407,8 +645,15 @@ class Touchstone:
           s11 = a[:,0,0]
 
         """
-        v = self.sparameters
+        if self.sparameters is None:
+            # data read by the 'stream' engine
+            return self._f, self._s
+        return self._values_to_arrays(self.sparameters)
 
+    def _values_to_arrays(self, v):
+        """
+        Convert rows of original s-parameter data to (f, s) arrays
+        """
         if self.format == 'ri':
             v_complex = v[:,1::2] + 1j* v[:,2::2]
         elif self.format == 'ma':
@@ -666,3 +911,209 @@ def read_zipped_touchstones(ziparchive, dir=""):
             network = Network.zipped_touchstone(fname, ziparchive)
             networks[network.name] = network
     return networks
+
+
+def read_touchstone_chunks(file, chunk_size=1024):
+    """
+    Read a touchstone file as a sequence of frequency-sliced Networks.
+
+    Only `chunk_size` frequency points are converted and kept in memory at
+    a time, so files larger than the available memory can be processed.
+
+    Parameters
+    ----------
+    file : str or file-object
+        touchstone file to read
+    chunk_size : int
+        number of frequency points of each Network
+
+    Yields
+    ------
+    ntwk : :class:`~skrf.network.Network`
+        Network holding the next `chunk_size` frequency points of the file
+
+    Notes
+    -----
+    The noise data and the HFSS gamma and port impedance comments are
+    not read. Use :class:`~skrf.network.Network` to read them.
+
+    Examples
+    --------
+    >>> for ntwk in rf.read_touchstone_chunks('big.s32p', chunk_size=1000):
+    ...     print(ntwk.f[0], ntwk.s_db[:, 0, 0].max())
+    """
+    fid = get_fid(file)
+    try:
+        touch, text_fid, line = _read_header(fid)
+        if touch.parameter != 's':
+            raise NotImplementedError('only s-parameters supported for now.')
+
+        name = os.path.basename(os.path.splitext(touch.filename)[0])
+        comments = touch.get_comments()
+        try:
+            variables = touch.get_comment_variables()
+        except:
+            variables = None
+        for f, s in touch._iter_sparameter_chunks(text_fid, line, chunk_size):
+            frequency = Frequency.from_f(f, unit='hz')
+            frequency.unit = touch.frequency_unit
+            ntwk = Network(frequency=frequency, s=s,
+                           z0=complex(touch.resistance),
+                           name=name, comments=comments)
+            if variables is not None:
+                ntwk.variables = variables
+            ntwk.port_names = touch.port_names
+            yield ntwk
+    finally:
+        fid.close()
+
+
+def _read_header(fid):
+    """
+    Create a Touchstone from the header of `fid`, without reading the data.
+
+    Returns the Touchstone, the text file-object positioned after the first
+    data line, and this line.
+    """
+    touch = Touchstone.__new__(Touchstone)
+    touch._init_attributes(fid.name)
+    touch._check_extension()
+    text_fid, line = touch._open_stream(fid)
+    return touch, text_fid, line
+
+
+def read_touchstone_header(file):
+    """
+    Read the metadata of a touchstone file, without converting its data.
+
+    Only the frequency values are converted from the data section, to get
+    the frequency axis. This is much faster than creating a
+    :class:`~skrf.network.Network`, to index large collections of files.
+
+    Parameters
+    ----------
+    file : str or file-object
+        touchstone file to scan
+
+    Returns
+    -------
+    header : dict
+        with the keys
+
+        * 'filename', 'version'
+        * 'rank' : number of ports
+        * 'frequency_unit', 'parameter', 'format' : from the option line
+        * 'reference' : list of the complex reference impedances
+        * 'port_names' : list of port names, or None
+        * 'comments', 'variables' : see :meth:`Touchstone.get_comments`
+          and :meth:`Touchstone.get_comment_variables`
+        * 'f_start', 'f_stop' : first and last frequency, in Hz
+        * 'npoints' : number of frequency points
+
+    Examples
+    --------
+    >>> header = rf.read_touchstone_header('ntwk1.s2p')
+    >>> header['rank'], header['npoints']
+    (2, 91)
+
+    See Also
+    --------
+    read_all_touchstone_headers
+    """
+    fid = get_fid(file)
+    try:
+        touch, text_fid, line = _read_header(fid)
+        n_values = 1 + 2*touch.rank**2
+        tokens = line.split() if line else []
+        # index of the first frequency value in tokens
+        offset = 0
+        f_start, f_stop, npoints = None, None, 0
+        while True:
+            f = numpy.array(tokens[offset::n_values], dtype=float)
+            if touch.rank == 2 and len(f) != 0:
+                # the first frequency value that is smaller than the last one
+                # is the indicator for the start of the noise section
+                pos = numpy.where(numpy.diff(numpy.concatenate(
+                    ([-numpy.inf if f_stop is None else f_stop], f))) < 0)[0]
+                if len(pos) != 0:
+                    f = f[:pos[0]]
+                    tokens = []
+            if len(f) != 0:
+                if f_start is None:
+                    f_start = f[0]
+                f_stop = f[-1]
+                npoints += len(f)
+            if not tokens:
+                break
+            offset = (offset - len(tokens)) % n_values
+            lines = text_fid.readlines(1 << 20)
+            tokens = _re_end_keyword.sub(' ', _re_comment.sub(' ',
+                                         ''.join(lines))).split()
+    finally:
+        fid.close()
+
+    try:
+        variables = touch.get_comment_variables()
+    except:
+        variables = {}
+
+    mult = touch.frequency_mult
+    return {
+        'filename': touch.filename,
+        'version': touch.version,
+        'rank': touch.rank,
+        'frequency_unit': touch.frequency_unit,
+        'parameter': touch.parameter,
+        'format': touch.format,
+        'reference': [complex(r) for r in touch.reference],
+        'port_names': touch.port_names,
+        'comments': touch.get_comments(),
+        'variables': variables,
+        'f_start': None if f_start is None else f_start * mult,
+        'f_stop': None if f_stop is None else f_stop * mult,
+        'npoints': npoints,
+        }
+
+
+def read_all_touchstone_headers(dir='.', contains=None, recursive=False):
+    """
+    Read the metadata of all touchstone files in a directory.
+
+    Files which can not be scanned are skipped.
+
+    Parameters
+    ----------
+    dir : str, optional
+        the directory to scan, default '.'
+    contains : str, optional
+        if not None, only files containing this substring are scanned
+    recursive : bool, optional
+        if True, scan also all the nested directories
+
+    Returns
+    -------
+    headers : dict
+        keys are the file paths, and values the headers returned by
+        :func:`read_touchstone_header`
+
+    Examples
+    --------
+    >>> headers = rf.read_all_touchstone_headers('measurements/', recursive=True)
+    >>> [k for k in headers if headers[k]['rank'] == 4]
+
+    See Also
+    --------
+    read_touchstone_header
+    skrf.io.general.read_all
+    """
+    if recursive:
+        dir = os.path.join(dir, '**')
+    headers = {}
+    for filename in glob.iglob(os.path.join(dir, '*.s*p'), recursive=recursive):
+        if contains is not None and contains not in filename:
+            continue
+        try:
+            headers[filename] = read_touchstone_header(filename)
+        except:
+            pass
+    return headers
@@ -148,11 +148,12 @@ from typing import (Any, NoReturn, Optional, Sequence,
     Sized, Union, Tuple, Callable, TYPE_CHECKING, Dict, List)
 from numbers import Number
 from six.moves import xrange
-from functools import reduce
+from functools import reduce, lru_cache
 
 import os
 import warnings
 from io import StringIO
+from string import Formatter
 
 import six.moves.cPickle as pickle
 from six.moves.cPickle import UnpicklingError
@@ -160,6 +161,8 @@ from six.moves.cPickle import UnpicklingError
 import sys
 import re
 import zipfile
+import zlib
+from collections import namedtuple, OrderedDict
 from copy import deepcopy as copy
 from numbers import Number
 from itertools import product
@@ -194,6 +197,10 @@ if TYPE_CHECKING:
 #import matplotlib.tri as tri
 #from scipy.interpolate import interp1d
 
+# statistics of the cache of derived matrices, see Network.cache_info
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
 class Network(object):
     """
     A n-port electrical network [#]_.
@@ -264,6 +271,13 @@ class Network(object):
 
     =========================  =============================================
 
+    The derived matrices (`z`, `y`, `t`, `a`, `h`) and the secondary
+    properties are computed at each access. They can be cached by setting
+    :attr:`cache_size` to a positive number, either for a single Network or
+    for all of them with `rf.Network.cache_size = 32`. The cache is
+    invalidated when `s`, `z0` or the frequency change, including in place.
+    See :func:`cache_info` and :func:`clear_cache`.
+
     :class:`Network`  objects can be  created from a touchstone or pickle
     file  (see :func:`__init__`), by a
     :class:`~skrf.media.media.Media` object, or manually by assigning the
@@ -329,9 +343,18 @@ class Network(object):
 
     noise_interp_kind = 'linear'
 
+    # maximum number of derived matrices kept in the cache of each Network,
+    # 0 disables the cache
+    cache_size = 0
+
+    # dtype of the s-parameters and port impedances of new Networks,
+    # see Network.dtype
+    default_dtype = complex
+
     # CONSTRUCTOR
     def __init__(self, file: str = None, name : str = None, comments: str = None,
-        f_unit: str = None, s_def: str = S_DEF_DEFAULT, **kwargs) -> None:
+        f_unit: str = None, s_def: str = S_DEF_DEFAULT, dtype: npy.dtype = None,
+        **kwargs) -> None:
         '''
         Network constructor.
 
@@ -357,6 +380,9 @@ class Network(object):
             'traveling' corresponds to the initial implementation.
             Default is 'power'.
             NB: results are the same for real-valued characteristic impedances.
+        dtype : complex dtype, optional
+            dtype used to store the s-parameters and port impedances, see
+            :attr:`dtype`. Default is :attr:`default_dtype`, complex128.
         \*\*kwargs :
             key word arguments can be used to assign properties of the
             Network, such as `s`, `f` and `z0`.
@@ -400,7 +426,8 @@ class Network(object):
         self.deembed = None
         self.noise = None
         self.noise_freq = None
-        self._z0 = npy.array(50, dtype=complex)
+        self._dtype = self._check_dtype(self.default_dtype if dtype is None else dtype)
+        self._z0 = npy.array(50, dtype=self._dtype)
 
         if s_def not in S_DEFINITIONS:
             raise ValueError('s_def parameter should be either:', S_DEFINITIONS)
@@ -737,9 +764,7 @@ class Network(object):
                         p2_index = self.port_names.index(p2_name)
                     except ValueError as e:
                         raise KeyError("Unknown port {0}".format(p2_name))
-                ntwk = self.copy()
-                ntwk.s = self.s[:, p1_index, p2_index]
-                ntwk.z0 = self.z0[:, p1_index]
+                ntwk = self.view(m=p1_index, n=p2_index).copy()
                 ntwk.name = "{0}({1}, {2})".format(self.name, p1_name, p2_name)
                 ntwk.port_names = None
                 return ntwk
@@ -796,50 +821,103 @@ class Network(object):
         if other.s.shape != self.s.shape:
             raise IndexError('Networks must have same number of ports.')
 
-    def __generate_secondary_properties(self) -> None:
+    def __getattr__(self, name: str) -> 'Network':
+        """
+        one-port sub-networks, `s11`, `s21`, ...
+
+        They are resolved here, from the number of ports of the Network,
+        rather than defined as properties of the class.
         """
-        creates numerous `secondary properties` which are various
-        different scalar projects of the primary properties. the primary
-        properties are s,z, and y.
+        if name[:1] == 's' and name[1:].isdigit():
+            indices = _subnetwork_indices(self.number_of_ports)
+            if name in indices:
+                m, n = indices[name]
+                return self.view(m=m, n=n).copy()
+        raise AttributeError("'%s' object has no attribute '%s'"
+                             % (self.__class__.__name__, name))
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # cached matrices are not worth saving
+        for attr in ['_cache', '_cache_key', '_cache_hits', '_cache_misses']:
+            state.pop(attr, None)
+        return state
+
+    def _cache_fingerprint(self) -> tuple:
         """
-        for prop_name in PRIMARY_PROPERTIES:
-            for func_name in COMPONENT_FUNC_DICT:
-                func = COMPONENT_FUNC_DICT[func_name]
-                if 'gd' in func_name:  # scaling of gradient by frequency
-                    def fget(self: 'Network', f: Callable = func, p: str = prop_name) -> npy.ndarray:
-                        return f(getattr(self, p)) / (2 * npy.pi * self.frequency.step)
-                else:
-                    def fget(self: 'Network', f: Callable = func, p: str = prop_name) -> npy.ndarray:
-                        return f(getattr(self, p))
-                doc = """
-                The %s component of the %s-matrix
+        fingerprint of the data the derived matrices are computed from.
 
+        The checksums of the arrays catch modifications made in place.
+        """
+        def checksum(x):
+            return zlib.crc32(npy.ascontiguousarray(x).view(npy.uint8))
+        return (self.s_def, self._s.shape, checksum(self._s),
+                self._z0.shape, checksum(self._z0),
+                checksum(self.frequency.f))
 
-                See Also
-                ----------
-                %s
-                """ % (func_name, prop_name, prop_name)
+    def _cached(self, name: str, func: Callable) -> npy.ndarray:
+        """
+        returns the derived matrix `name`, computed with `func` when it
+        is not in the cache.
+        """
+        if self.cache_size <= 0 or not hasattr(self, '_s'):
+            return func()
+        d = self.__dict__
+        key = self._cache_fingerprint()
+        if d.get('_cache_key') != key:
+            d['_cache'] = OrderedDict()
+            d['_cache_key'] = key
+        cache = d['_cache']
+        if name in cache:
+            d['_cache_hits'] = d.get('_cache_hits', 0) + 1
+            cache.move_to_end(name)
+            return cache[name]
+        d['_cache_misses'] = d.get('_cache_misses', 0) + 1
+        value = func()
+        if isinstance(value, npy.ndarray):
+            # the cached array is shared by all the callers
+            value.flags.writeable = False
+        cache[name] = value
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        """
+        statistics of the cache of derived matrices.
 
-                setattr(self.__class__, '%s_%s' % (prop_name, func_name), \
-                        property(fget, doc=doc))
+        Returns
+        --------
+        info : namedtuple
+            `hits` and `misses` of the cache since it was last cleared,
+            `maxsize`, the :attr:`cache_size`, and `currsize`, the number
+            of matrices in the cache.
 
-    def __generate_subnetworks(self) -> None:
+        Examples
+        ----------
+        >>> ntwk.cache_size = 16
+        >>> ntwk.z_re; ntwk.z_im
+        >>> ntwk.cache_info()
+        CacheInfo(hits=1, misses=3, maxsize=16, currsize=3)
+
+        See Also
+        ----------
+        clear_cache
+        """
+        d = self.__dict__
+        return CacheInfo(d.get('_cache_hits', 0), d.get('_cache_misses', 0),
+                         self.cache_size, len(d.get('_cache', ())))
+
+    def clear_cache(self) -> None:
         """
-        generates all one-port sub-networks
+        empties the cache of derived matrices and resets its statistics.
+
+        See Also
+        ----------
+        cache_info
         """
-        for m in range(self.number_of_ports):
-            for n in range(self.number_of_ports):
-                def fget(self: 'Network', m:int=m, n:int=n) -> 'Network':
-                    ntwk = self.copy()
-                    ntwk.s = self.s[:, m, n]
-                    ntwk.z0 = self.z0[:, m]
-                    return ntwk
-
-                doc = '''
-                one-port sub-network.
-                '''
-                setattr(self.__class__, 's%i%i' % (m + 1, n + 1), \
-                        property(fget, doc=doc))
+        for attr in ['_cache', '_cache_key', '_cache_hits', '_cache_misses']:
+            self.__dict__.pop(attr, None)
 
     # PRIMARY PROPERTIES
     @property
@@ -886,9 +964,44 @@ class Network(object):
             else:
                 s = npy.reshape(s, (-1, 1, 1))
 
-        self._s = npy.array(s, dtype=complex)
-        self.__generate_secondary_properties()
-        self.__generate_subnetworks()
+        self._s = npy.array(s, dtype=self.dtype)
+
+    @property
+    def dtype(self) -> npy.dtype:
+        """
+        dtype of the stored s-parameters and port impedances.
+
+        Either complex128 (default) or complex64. Single precision halves
+        the memory used by the Network, and is usually enough for measured
+        data. The s-parameters, port impedances and derived Networks
+        (interpolated, cascaded, copies, ...) keep this dtype. Conversions
+        involving matrix inverses, like `z` or `y`, are computed and
+        returned in double precision.
+
+        The default dtype of new Networks is set for all Networks by the
+        class attribute :attr:`default_dtype`, eg.
+        `rf.Network.default_dtype = npy.complex64`.
+
+        Returns
+        --------
+        dtype : :class:`numpy.dtype`
+        """
+        # Networks pickled before dtype existed are double precision
+        return self.__dict__.get('_dtype', npy.dtype(complex))
+
+    @dtype.setter
+    def dtype(self, dtype: npy.dtype) -> None:
+        self._dtype = self._check_dtype(dtype)
+        if hasattr(self, '_s'):
+            self._s = self._s.astype(self._dtype, copy=False)
+        self._z0 = self._z0.astype(self._dtype, copy=False)
+
+    @staticmethod
+    def _check_dtype(dtype: npy.dtype) -> npy.dtype:
+        dtype = npy.dtype(dtype)
+        if dtype not in (npy.complex64, npy.complex128):
+            raise ValueError('dtype must be complex64 or complex128')
+        return dtype
 
     @property
     def h(self) -> npy.ndarray:
@@ -919,11 +1032,11 @@ class Network(object):
         ------------
         .. [#] http://en.wikipedia.org/wiki/Two-port_network#Hybrid_parameters_(h-parameters)
         """
-        return s2h(self.s, self.z0)
+        return self._cached('h', lambda: s2h(self.s, self.z0))
 
     @h.setter
     def h(self, value: npy.ndarray) -> None:
-        self._s = h2s(value, self.z0)
+        self._s = h2s(value, self.z0).astype(self.dtype, copy=False)
 
     @property
     def y(self) -> npy.ndarray:
@@ -953,11 +1066,11 @@ class Network(object):
         ------------
         .. [#] http://en.wikipedia.org/wiki/Admittance_parameters
         """
-        return s2y(self._s, self.z0, s_def=self.s_def)
+        return self._cached('y', lambda: s2y(self._s, self.z0, s_def=self.s_def))
 
     @y.setter
     def y(self, value: npy.ndarray) -> None:
-        self._s = y2s(value, self.z0, s_def=self.s_def)
+        self._s = y2s(value, self.z0, s_def=self.s_def).astype(self.dtype, copy=False)
 
     @property
     def z(self) -> npy.ndarray:
@@ -987,11 +1100,11 @@ class Network(object):
         ------------
         .. [#] http://en.wikipedia.org/wiki/impedance_parameters
         """
-        return s2z(self._s, self.z0, s_def=self.s_def)
+        return self._cached('z', lambda: s2z(self._s, self.z0, s_def=self.s_def))
 
     @z.setter
     def z(self, value: npy.ndarray) -> None:
-        self._s = z2s(value, self.z0, s_def=self.s_def)
+        self._s = z2s(value, self.z0, s_def=self.s_def).astype(self.dtype, copy=False)
 
     @property
     def t(self) -> npy.ndarray:
@@ -1024,7 +1137,7 @@ class Network(object):
         -----------
         .. [#] http://en.wikipedia.org/wiki/Scattering_parameters#Scattering_transfer_parameters
         """
-        return s2t(self.s)
+        return self._cached('t', lambda: s2t(self.s))
 
     @property
     def s_invert(self) -> npy.ndarray:
@@ -1087,11 +1200,11 @@ class Network(object):
         ------------
         .. [#] http://en.wikipedia.org/wiki/impedance_parameters
         """
-        return s2a(self.s, self.z0)
+        return self._cached('a', lambda: s2a(self.s, self.z0))
 
     @a.setter
     def a(self, value: npy.ndarray) -> None:
-        self._s = a2s(value, self.z0)
+        self._s = a2s(value, self.z0).astype(self.dtype, copy=False)
 
     @property
     def z0(self) -> npy.ndarray:
@@ -1122,7 +1235,7 @@ class Network(object):
         elif self._z0.ndim == 1:
             # _z0 is a vector, either of length nports or frequency.npoints.
             # Create a npy.array with shape fxn and broadcast vector to array.
-            z0 = npy.zeros(self._s.shape[:2], dtype=complex)
+            z0 = npy.zeros(self._s.shape[:2], dtype=self._z0.dtype)
             if len(self._z0) == self.nports:
                 z0[:] = self._z0[None, :]
             else:
@@ -1135,7 +1248,7 @@ class Network(object):
     @z0.setter
     def z0(self, z0: NumberLike) -> None:
         # cast any array like type (tuple, list) to a npy.array
-        z0 = npy.array(z0, dtype=complex)
+        z0 = npy.array(z0, dtype=self.dtype)
 
         # assign _z0 directly if z0 is a scalar
         if z0.ndim == 0:
@@ -1648,7 +1761,7 @@ class Network(object):
         '''
         ntwk = Network(s=self.s,
                        frequency=self.frequency.copy(),
-                       z0=self.z0, s_def=self.s_def
+                       z0=self.z0, s_def=self.s_def, dtype=self.dtype
                        )
 
         ntwk.name = self.name
@@ -1686,7 +1799,7 @@ class Network(object):
         for attr in ['_s', 'frequency', '_z0', 'name']:
             self.__setattr__(attr, copy(other.__getattribute__(attr)))
 
-    def copy_subset(self, key: npy.ndarray) -> 'Network':
+    def copy_subset(self, key: npy.ndarray, view: bool = False) -> 'Network':
         '''
         Returns a copy of a frequency subset of this Network
 
@@ -1697,10 +1810,19 @@ class Network(object):
         -----------
         key : numpy array
             the array indices of the frequencies to take
+        view : bool, optional
+            if True, returns a read-only view of the subset rather than
+            a copy, see :func:`view`. Default is False.
         '''
+        if view:
+            ntwk = self.view(key)
+            if isinstance(self.name, str):
+                ntwk.name = self.name + '_subset'
+            return ntwk
+
         ntwk = Network(s=self.s[key,:],
                        frequency=self.frequency[key].copy(),
-                       z0=self.z0[key,:],
+                       z0=self.z0[key,:], dtype=self.dtype
                        )
 
         if isinstance(self.name, str):
@@ -1718,6 +1840,92 @@ class Network(object):
             ntwk.port_names = None
         return ntwk
 
+    def view(self, key: Union[str, int, slice] = None, m: int = None,
+             n: int = None) -> 'Network':
+        '''
+        Returns a Network sharing its data with this Network.
+
+        Unlike :func:`copy`, :func:`copy_subset` or the one-port
+        sub-networks `s11`, `s21`, ..., no data is copied: the s-parameters,
+        port impedances, frequency and noise of the returned Network are
+        read-only views of the arrays of this Network.
+
+        The view follows the modifications made in place to this Network.
+        Modifying the view in place raises a ValueError, so that this
+        Network is never modified through it. Assigning new values to its
+        properties (eg. `view.s = ...`) or calling :func:`copy` gives it its
+        own data. Methods modifying a view in place, like :func:`renumber`,
+        copy its data first.
+
+        Parameters
+        -----------
+        key : str, int or slice, optional
+            frequency points of the view, as a slice, an index, or a human
+            readable string like '50.1-75.5ghz'. Index arrays can not be
+            viewed, and are copied. Default is all frequency points.
+        m, n : int, optional
+            indices of the s-parameter s_{m+1,n+1}, to get a view of a one-port
+            sub-network. Default is all the ports.
+
+        Returns
+        --------
+        ntwk : :class:`Network`
+            view of this Network
+
+        Examples
+        ---------
+        >>> band = ntwk.view('5-10ghz')
+        >>> s21 = ntwk.view(m=1, n=0)
+        >>> s21.s = s21.s * 2  # s21 gets its own data, ntwk is unchanged
+
+        See Also
+        ---------
+        copy
+        copy_subset
+        '''
+        if key is None:
+            key = slice(None)
+        elif isinstance(key, str):
+            sliced_f = self.frequency[key].f
+            start = npy.searchsorted(self.frequency.f, sliced_f[0]) if len(sliced_f) else 0
+            key = slice(start, start + len(sliced_f))
+        elif isinstance(key, Number):
+            key = slice(key, key + 1 if key != -1 else None)
+
+        ntwk = Network(name=self.name, comments=self.comments, s_def=self.s_def,
+                       dtype=self.dtype)
+        s = self.s[key]
+        # a scalar z0 is kept as is, rather than broadcasted
+        z0 = self._z0 if self._z0.ndim == 0 else self.z0[key]
+        if m is not None and n is not None:
+            s = s[:, m:m + 1, n:n + 1]
+            z0 = z0[:, m:m + 1] if z0.ndim else z0
+            ntwk.port_names = None
+        else:
+            try:
+                ntwk.port_names = copy(self.port_names)
+            except(AttributeError):
+                ntwk.port_names = None
+        ntwk._s, ntwk._z0 = s.view(), z0.view()
+        ntwk._s.flags.writeable = False
+        ntwk._z0.flags.writeable = False
+        ntwk._frequency = self.frequency._view(key)
+        if self.noise is not None and self.noise_freq is not None:
+            ntwk.noise = self.noise.view()
+            ntwk.noise.flags.writeable = False
+            ntwk.noise_freq = self.noise_freq._view()
+        return ntwk
+
+    def _unshare(self) -> None:
+        '''
+        copies the read-only arrays that a view shares with another Network,
+        before they are modified in place.
+        '''
+        if not self._s.flags.writeable:
+            self._s = self._s.copy()
+        if not self._z0.flags.writeable:
+            self._z0 = self._z0.copy()
+
     def set_noise_a(self, noise_freq: Frequency = None, nfmin_db: float = 0,
         gamma_opt: float = 0, rn: NumberLike = 1 ) -> None:
           '''
@@ -1911,6 +2119,20 @@ class Network(object):
         if dir is not None:
             filename = os.path.join(dir, filename)
 
+        def complex_2_abs(s: npy.ndarray) -> npy.ndarray:
+            '''
+            Magnitude of `s`, as computed by npy.abs() on each of its values.
+
+            Depending on the version of numpy, npy.abs() of an array may
+            differ in the last bit from npy.abs() of each value, and hypot()
+            from both. The values where npy.abs() and hypot() do not agree
+            are thus computed one by one.
+            '''
+            mag = npy.abs(s)
+            differ = npy.nonzero(mag != npy.hypot(s.real, s.imag))
+            mag[differ] = [npy.abs(c) for c in s[differ]]
+            return mag
+
         # set internal variables according to form
         form = form.upper()
         if form == "RI":
@@ -1919,23 +2141,69 @@ class Network(object):
             funcB = npy.imag
         elif form == "DB":
             formatDic = {"labelA": "dB", "labelB": "ang"}
-            funcA = mf.complex_2_db
+            # as mf.complex_2_db
+            funcA = lambda s: mf.magnitude_2_db(complex_2_abs(s))
             funcB = mf.complex_2_degree
         elif form == "MA":
             formatDic = {"labelA": "mag", "labelB": "ang"}
-            funcA = mf.complex_2_magnitude
+            # as mf.complex_2_magnitude: the builtin abs() of a single
+            # complex number is computed with hypot
+            funcA = lambda s: npy.hypot(s.real, s.imag)
             funcB = mf.complex_2_degree
         else:
             raise ValueError('`form` must be either `db`,`ma`,`ri`')
 
-        # add formatting to funcA and funcB so we don't have to write it out many many times.
-        def c2str_A(c: NumberLike) -> str:
-            '''Function which takes a complex number for the A part of param and returns an appropriately formatted string'''
-            return format_spec_A.format(funcA(c))
+        def auto_field(format_spec: str) -> Optional[str]:
+            '''
+            Return `format_spec` with its replacement field automatically
+            numbered, so it can be joined with others into a single format
+            string, or None if it can not be rewritten this way.
+            '''
+            fields = list(Formatter().parse(format_spec))
+            if sum(field[1] is not None for field in fields) != 1:
+                return None
+            out = ''
+            for literal, name, spec, conversion in fields:
+                out += literal.replace('{', '{{').replace('}', '}}')
+                if name is None:
+                    continue
+                if name not in ('', '0') or '{' in spec:
+                    return None
+                out += '{' + ('!' + conversion if conversion else '') \
+                       + (':' + spec if spec else '') + '}'
+            return out
+
+        nports = self.number_of_ports
+        nfreqs = len(self.f)
 
-        def c2str_B(c: NumberLike) -> str:
-            '''Function which takes a complex number for B part of param and returns an appropriately formatted string'''
-            return format_spec_B.format(funcB(c))
+        # data of each frequency, in the order they are written:
+        # frequency, A and B parts of the s-parameters, and port impedances
+        if nports == 2:
+            # S21,S12 in reverse order
+            s = self.s.transpose(0, 2, 1).reshape(nfreqs, -1)
+        else:
+            s = self.s.reshape(nfreqs, -1)
+        n_s = 2 * nports**2
+        data = npy.empty((nfreqs, 1 + n_s + write_z0 * 2 * nports))
+        data[:, 0] = self.frequency.f_scaled
+        data[:, 1:1 + n_s:2] = funcA(s)
+        data[:, 2:2 + n_s:2] = funcB(s)
+        if write_z0:
+            data[:, 1 + n_s::2] = self.z0.real
+            data[:, 2 + n_s::2] = self.z0.imag
+
+        fields = [auto_field(spec) for spec in
+                  [format_spec_freq, format_spec_A, format_spec_B]]
+        if None in fields:
+            # format the values one by one, and join the strings
+            data = data.astype(object)
+            for k, spec in enumerate([format_spec_freq, format_spec_A, format_spec_B]):
+                if fields[k] is None:
+                    cols = [0] if k == 0 else slice(k, 1 + n_s, 2)
+                    data[:, cols] = npy.vectorize(spec.format, otypes=[object])(data[:, cols])
+                    fields[k] = '{}'
+        field_freq, field_A, field_B = fields
+        field_AB = ' ' + field_A + ' ' + field_B
 
         def get_buffer() -> StringIO:
             if return_string is True or type(to_archive) is zipfile.ZipFile:
@@ -1975,22 +2243,13 @@ class Network(object):
             except AttributeError:
                 pass
 
-            scaled_freq = self.frequency.f_scaled
-
+            # the format string of the lines of a single frequency point
             if self.number_of_ports == 1:
                 # write comment line for users (optional)
                 output.write('!freq {labelA}S11 {labelB}S11\n'.format(**formatDic))
-                # write out data
-                for f in range(len(self.f)):
-                    output.write(format_spec_freq.format(scaled_freq[f]) + ' ' \
-                                 + c2str_A(self.s[f, 0, 0]) + ' ' \
-                                 + c2str_B(self.s[f, 0, 0]) + '\n')
-                    # write out the z0 following hfss's convention if desired
-                    if write_z0:
-                        output.write('! Port Impedance ')
-                        for n in range(self.number_of_ports):
-                            output.write('%.14f %.14f ' % (self.z0[f, n].real, self.z0[f, n].imag))
-                        output.write('\n')
+                row_format = field_freq + field_AB + '\n'
+                # z0 following hfss's convention
+                z0_format = '! Port Impedance ' + '{:.14f} {:.14f} ' * nports + '\n'
 
             elif self.number_of_ports == 2:
                 # 2-port is a special case with
@@ -2001,23 +2260,7 @@ class Network(object):
                 output.write(
                     '!freq {labelA}S11 {labelB}S11 {labelA}S21 {labelB}S21 {labelA}S12 {labelB}S12 {labelA}S22 {labelB}S22\n'.format(
                         **formatDic))
-                # write out data
-                for f in range(len(self.f)):
-                    output.write(format_spec_freq.format(scaled_freq[f]) + ' ' \
-                                 + c2str_A(self.s[f, 0, 0]) + ' ' \
-                                 + c2str_B(self.s[f, 0, 0]) + ' ' \
-                                 + c2str_A(self.s[f, 1, 0]) + ' ' \
-                                 + c2str_B(self.s[f, 1, 0]) + ' ' \
-                                 + c2str_A(self.s[f, 0, 1]) + ' ' \
-                                 + c2str_B(self.s[f, 0, 1]) + ' ' \
-                                 + c2str_A(self.s[f, 1, 1]) + ' ' \
-                                 + c2str_B(self.s[f, 1, 1]) + '\n')
-                    # write out the z0 following hfss's convention if desired
-                    if write_z0:
-                        output.write('! Port Impedance')
-                        for n in range(2):
-                            output.write(' %.14f %.14f' % (self.z0[f, n].real, self.z0[f, n].imag))
-                        output.write('\n')
+                row_format = field_freq + field_AB * 4 + '\n'
 
             elif self.number_of_ports == 3:
                 # 3-port is written over 3 lines / matrix order
@@ -2029,20 +2272,7 @@ class Network(object):
                         output.write(" {labelA}S{m}{n} {labelB}S{m}{n}".format(m=m, n=n, **formatDic))
                     output.write('\n!')
                 output.write('\n')
-                # write out data
-                for f in range(len(self.f)):
-                    output.write(format_spec_freq.format(scaled_freq[f]))
-                    for m in range(3):
-                        for n in range(3):
-                            output.write(' ' + c2str_A(self.s[f, m, n]) + ' ' \
-                                         + c2str_B(self.s[f, m, n]))
-                        output.write('\n')
-                    # write out the z0 following hfss's convention if desired
-                    if write_z0:
-                        output.write('! Port Impedance')
-                        for n in range(3):
-                            output.write(' %.14f %.14f' % (self.z0[f, n].real, self.z0[f, n].imag))
-                        output.write('\n')
+                row_format = field_freq + (field_AB * 3 + '\n') * 3
 
             elif self.number_of_ports >= 4:
                 # general n-port
@@ -2061,24 +2291,26 @@ class Network(object):
                         output.write(" {labelA}S{m}{n} {labelB}S{m}{n}".format(m=m, n=n, **formatDic))
                     output.write('\n!')
                 output.write('\n')
-                # write out data
-                for f in range(len(self.f)):
-                    output.write(format_spec_freq.format(scaled_freq[f]))
-                    for m in range(self.number_of_ports):
-                        for n in range(self.number_of_ports):
-                            if (n > 0 and (n % 4) == 0):
-                                output.write('\n')
-                            output.write(' ' + c2str_A(self.s[f, m, n]) + ' ' \
-                                         + c2str_B(self.s[f, m, n]))
-                        output.write('\n')
-
-                    # write out the z0 following hfss's convention if desired
-                    if write_z0:
-                        output.write('! Port Impedance')
-                        for n in range(self.number_of_ports):
-                            output.write(' %.14f %.14f' % (self.z0[f, n].real, self.z0[f, n].imag))
-                        output.write('\n')
-
+                line_format = ''
+                for n in range(self.number_of_ports):
+                    if (n > 0 and (n % 4) == 0):
+                        line_format += '\n'
+                    line_format += field_AB
+                row_format = field_freq + (line_format + '\n') * nports
+
+            if self.number_of_ports > 1:
+                # z0 following hfss's convention
+                z0_format = '! Port Impedance' + ' {:.14f} {:.14f}' * nports + '\n'
+
+            # write out the z0 following hfss's convention if desired
+            if write_z0:
+                row_format += z0_format
+
+            # write out data, formatting blocks of frequency points at once
+            block = max(1, 100000 // data.shape[1])
+            for k in range(0, nfreqs, block):
+                rows = data[k:k + block]
+                output.write((row_format * len(rows)).format(*rows.ravel().tolist()))
             if type(to_archive) is zipfile.ZipFile:
                 to_archive.writestr(filename, output.getvalue())
             elif return_string is True:
@@ -2159,6 +2391,65 @@ class Network(object):
         from .io.general import read
         self.copy_from(read(*args, **kwargs))
 
+    def write_native(self, file: str, append: bool = False) -> None:
+        """
+        Write the Network to a native binary file.
+
+        The arrays are stored with their own dtype, and can be read back
+        partially, see :mod:`skrf.io.native`.
+
+        Parameters
+        -----------
+        file : str or file-object
+            filename or a file-object
+        append : bool, optional
+            if True, the Network is added after the Networks already stored
+            in `file`. Otherwise (default), `file` is overwritten.
+
+        Examples
+        ---------
+        >>> ntwk.write_native('ntwk.npz')
+        >>> ntwk2 = rf.Network.from_native('ntwk.npz')
+
+        See Also
+        ---------
+        from_native
+        skrf.io.native.write_native
+        """
+        from .io.native import write_native
+        write_native(file, self, append=append)
+
+    @classmethod
+    def from_native(cls, file: str, index: int = 0, f_slice=None,
+                    mmap: bool = True) -> 'Network':
+        """
+        Read a Network from a native binary file.
+
+        Parameters
+        -----------
+        file : str or file-object
+            file written by :meth:`write_native`
+        index : int, optional
+            index of the Network in the file. Default is 0.
+        f_slice : slice, array of int or str, optional
+            frequency points to read, as indices or as a string like
+            '1-2ghz'. If None (default), all frequency points are read.
+        mmap : bool, optional
+            read the file through memory-maps, so that only the requested
+            frequency points are read from disk. Default is True.
+
+        Examples
+        ---------
+        >>> ntwk = rf.Network.from_native('ntwk.npz', f_slice='1-2ghz')
+
+        See Also
+        ---------
+        write_native
+        skrf.io.native.read_native
+        """
+        from .io.native import read_native
+        return read_native(file, index=index, f_slice=f_slice, mmap=mmap)
+
     def write_spreadsheet(self, *args, **kwargs) -> None:
         '''
         Write contents of network to a spreadsheet, for your boss to use.
@@ -2609,6 +2900,14 @@ class Network(object):
             Units that `f_start` and `f_stop` are described in. This must be a string recognized by the Frequency
             class, e.g. 'Hz','MHz', etc. A value of `None` assumes units are same as `self`
         '''
+        ntwk = self[self._crop_slice(f_start, f_stop, unit)]
+        self.frequency, self.s, self.z0 = ntwk.frequency, ntwk.s, ntwk.z0
+
+    def _crop_slice(self, f_start: float, f_stop: float, unit: str = None) -> slice:
+        '''
+        slice of the frequency points between `f_start` and `f_stop`, see
+        :func:`crop`.
+        '''
         if f_start == None:
             f_start = -npy.inf
         if f_stop == None:
@@ -2641,20 +2940,27 @@ class Network(object):
         if stop_idx < start_idx :
             raise ValueError("Stop index/frequency lower than start: stop_idx: {}, start_idx: {}, self.frequency.f[stop_idx]: {}, self.frequency.f[start_idx]: {}"\
                                 .format(stop_idx,start_idx,self.frequency.f[stop_idx],self.frequency.f[start_idx]  ))
-        ntwk = self[start_idx:stop_idx + 1]
-        self.frequency, self.s, self.z0 = ntwk.frequency, ntwk.s, ntwk.z0
+        return slice(start_idx, stop_idx + 1)
 
-    def cropped(self, f_start: float, f_stop: float, unit: str = None) -> 'Network':
+    def cropped(self, f_start: float, f_stop: float, unit: str = None,
+                view: bool = False) -> 'Network':
         '''
         returns a cropped network, leaves self alone.
 
+        Parameters
+        -----------
+        f_start, f_stop, unit :
+            see :func:`crop`
+        view : bool, optional
+            if True, returns a read-only view of the cropped frequency
+            range rather than a copy, see :func:`view`. Default is False.
+
         See Also
         ---------
         crop
         '''
-        out = self.copy()
-        out.crop(f_start=f_start, f_stop=f_stop,unit=unit)
-        return out
+        out = self.view(self._crop_slice(f_start, f_stop, unit))
+        return out if view else out.copy()
 
     def flip(self) -> None:
         '''
@@ -2739,6 +3045,7 @@ class Network(object):
         if any(npy.unique(from_ports) != npy.unique(to_ports)):
             raise ValueError('from_ports and to_ports must have the same set of indices')
 
+        self._unshare()
         self.s[:, to_ports, :] = self.s[:, from_ports, :]  # renumber rows
         self.s[:, :, to_ports] = self.s[:, :, from_ports]  # renumber columns
         self.z0[:, to_ports] = self.z0[:, from_ports]
@@ -2977,8 +3284,8 @@ class Network(object):
 
 
         '''
-        forward = self.__getattribute__('s%i%i' % (m, n))
-        reverse = self.__getattribute__('s%i%i' % (n, m))
+        forward = getattr(self, 's%i%i' % (m, n))
+        reverse = getattr(self, 's%i%i' % (n, m))
         if normalize:
             denom = forward * reverse
             denom.s = npy.sqrt(denom.s)
@@ -3397,6 +3704,51 @@ COMPONENT_FUNC_DICT = Network.COMPONENT_FUNC_DICT
 PRIMARY_PROPERTIES = Network.PRIMARY_PROPERTIES
 Y_LABEL_DICT = Network.Y_LABEL_DICT
 
+
+def __generate_secondary_properties(cls) -> None:
+    """
+    creates numerous `secondary properties` which are various
+    different scalar projects of the primary properties. the primary
+    properties are s,z, and y.
+
+    The properties are defined once on the class, when this module is
+    imported.
+    """
+    for prop_name in cls.PRIMARY_PROPERTIES:
+        for func_name in cls.COMPONENT_FUNC_DICT:
+            func = cls.COMPONENT_FUNC_DICT[func_name]
+            name = '%s_%s' % (prop_name, func_name)
+            if 'gd' in func_name:  # scaling of gradient by frequency
+                def fget(self: 'Network', f: Callable = func, p: str = prop_name, name: str = name) -> npy.ndarray:
+                    return self._cached(name, lambda: f(getattr(self, p)) / (2 * npy.pi * self.frequency.step))
+            else:
+                def fget(self: 'Network', f: Callable = func, p: str = prop_name, name: str = name) -> npy.ndarray:
+                    return self._cached(name, lambda: f(getattr(self, p)))
+            doc = """
+            The %s component of the %s-matrix
+
+
+            See Also
+            ----------
+            %s
+            """ % (func_name, prop_name, prop_name)
+
+            setattr(cls, name, property(fget, doc=doc))
+
+__generate_secondary_properties(Network)
+
+
+@lru_cache()
+def _subnetwork_indices(nports: int) -> dict:
+    """
+    names of the one-port sub-networks of a `nports`-port Network,
+    with the indices of the s-parameter they hold.
+    """
+    # with more than 9 ports, some names are ambiguous, eg s111: the last
+    # sub-network wins
+    return {'s%i%i' % (m + 1, n + 1): (m, n)
+            for m in range(nports) for n in range(nports)}
+
 #%%
 
 ## Functions operating on Network[s]
@@ -4259,7 +4611,8 @@ def subnetwork(ntwk: Network, ports: int, offby:int = 1) -> Network:
     # forging subnetwork name
     subntwk_name = (ntwk.name or 'p') + ''.join([str(index+offby) for index in ports])
     # create a dummy Network with same frequency and z0 from the original
-    subntwk = Network(frequency=ntwk.frequency, z0=ntwk.z0[:,ports], name=subntwk_name)
+    subntwk = Network(frequency=ntwk.frequency, z0=ntwk.z0[:,ports], name=subntwk_name,
+                      dtype=ntwk.dtype)
     # keep requested rows and columns of the s-matrix. ports can be not contiguous
     subntwk.s = ntwk.s[npy.ix_(npy.arange(ntwk.s.shape[0]), ports, ports)]
     return subntwk
@@ -4655,7 +5008,9 @@ def s2z(s: npy.ndarray, z0: NumberLike = 50, s_def: str = S_DEF_DEFAULT) -> npy.
     z0 = z0.astype(dtype=npy.complex)
     z0[z0.real == 0] += ZERO
 
-    s = s.copy()  # to prevent the original array from being altered
+    # copy to prevent the original array from being altered, in double
+    # precision for the matrix inversions
+    s = npy.array(s, dtype=complex)
     s[s == -1.] = -1. + 1e-12  # solve numerical singularity
     s[s == 1.] = 1. + 1e-12  # solve numerical singularity
 
@@ -4756,7 +5111,9 @@ def s2y(s: npy.ndarray, z0:NumberLike = 50, s_def: str = S_DEF_DEFAULT) -> npy.n
     z0 = z0.astype(dtype=npy.complex)
     z0[z0.real == 0] += ZERO
 
-    s = s.copy()  # to prevent the original array from being altered
+    # copy to prevent the original array from being altered, in double
+    # precision for the matrix inversions
+    s = npy.array(s, dtype=complex)
     s[s == -1.] = -1. + 1e-12  # solve numerical singularity
     s[s == 1.] = 1. + 1e-12  # solve numerical singularity
 
@@ -4845,6 +5202,8 @@ def s2t(s: npy.ndarray) -> npy.ndarray:
     .. [#] Janusz A. Dobrowolski, "Scattering Parameter in RF and Microwave Circuit Analysis and Design",
            Artech House, 2016, pp. 65-68
     """
+    # double precision for the matrix inversion
+    s = npy.asarray(s, dtype=complex)
     z, y, x = s.shape
     # test here for even number of ports.
     # s-parameter networks are square matrix, so x and y are equal.
@@ -4856,15 +5215,14 @@ def s2t(s: npy.ndarray) -> npy.ndarray:
     # S_II,I^-1
     sinv = npy.linalg.inv(s[:, yh:y, 0:xh])
     # np.linalg.inv test for singularity (matrix not invertible)
-    for k in range(len(s)):
     # T_I,I = S_I,II - S_I,I . S_II,I^-1 . S_II,II
-        t[k, 0:yh, 0:xh] = s[k, 0:yh, xh:x] - s[k, 0:yh, 0:xh].dot(sinv[k].dot(s[k, yh:y, xh:x]))
-        # T_I,II = S_I,I . S_II,I^-1
-        t[k, 0:yh, xh:x] = s[k, 0:yh, 0:xh].dot(sinv[k])
-        # T_II,I = -S_II,I^-1 . S_II,II
-        t[k, yh:y, 0:xh] = -sinv[k].dot(s[k, yh:y, xh:x])
-        # T_II,II = S_II,I^-1
-        t[k, yh:y, xh:x] = sinv[k]
+    t[:, 0:yh, 0:xh] = s[:, 0:yh, xh:x] - npy.matmul(s[:, 0:yh, 0:xh], npy.matmul(sinv, s[:, yh:y, xh:x]))
+    # T_I,II = S_I,I . S_II,I^-1
+    t[:, 0:yh, xh:x] = npy.matmul(s[:, 0:yh, 0:xh], sinv)
+    # T_II,I = -S_II,I^-1 . S_II,II
+    t[:, yh:y, 0:xh] = -npy.matmul(sinv, s[:, yh:y, xh:x])
+    # T_II,II = S_II,I^-1
+    t[:, yh:y, xh:x] = sinv
     return t
 
 
@@ -5480,6 +5838,8 @@ def t2s(t: npy.ndarray) -> npy.ndarray:
     .. [#] Janusz A. Dobrowolski, "Scattering Parameter in RF and Microwave Circuit Analysis and Design",
            Artech House, 2016, pp. 65-68
     '''
+    # double precision for the matrix inversion
+    t = npy.asarray(t, dtype=complex)
     z, y, x = t.shape
     # test here for even number of ports.
     # t-parameter networks are square matrix, so x and y are equal.
@@ -5491,15 +5851,14 @@ def t2s(t: npy.ndarray) -> npy.ndarray:
     # T_II,II^-1
     tinv = npy.linalg.inv(t[:, yh:y, xh:x])
     # np.linalg.inv test for singularity (matrix not invertible)
-    for k in range(len(s)):
-        # S_I,I = T_I,II . T_II,II^-1
-        s[k, 0:yh, 0:xh] = t[k, 0:yh, xh:x].dot(tinv[k])
-        # S_I,II = T_I,I - T_I,I,II . T_II,II^-1 . T_II,I
-        s[k, 0:yh, xh:x] = t[k, 0:yh, 0:xh]-t[k, 0:yh, xh:x].dot(tinv[k].dot(t[k, yh:y, 0:xh]))
-        # S_II,I = T_II,II^-1
-        s[k, yh:y, 0:xh] = tinv[k]
-        # S_II,II = -T_II,II^-1 . T_II,I
-        s[k, yh:y, xh:x] = -tinv[k].dot(t[k, yh:y, 0:xh])
+    # S_I,I = T_I,II . T_II,II^-1
+    s[:, 0:yh, 0:xh] = npy.matmul(t[:, 0:yh, xh:x], tinv)
+    # S_I,II = T_I,I - T_I,I,II . T_II,II^-1 . T_II,I
+    s[:, 0:yh, xh:x] = t[:, 0:yh, 0:xh] - npy.matmul(t[:, 0:yh, xh:x], npy.matmul(tinv, t[:, yh:y, 0:xh]))
+    # S_II,I = T_II,II^-1
+    s[:, yh:y, 0:xh] = tinv
+    # S_II,II = -T_II,II^-1 . T_II,I
+    s[:, yh:y, xh:x] = -npy.matmul(tinv, t[:, yh:y, 0:xh])
     return s
 
 
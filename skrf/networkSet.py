@@ -32,6 +32,7 @@ NetworkSet Class
    :toctree: generated/
 
    NetworkSet
+   NetworkStatistics
 
 NetworkSet Utilities
 ====================
@@ -51,7 +52,7 @@ from io import StringIO, BytesIO
 from scipy.interpolate import interp1d
 from . network import Network, Frequency, PRIMARY_PROPERTIES, COMPONENT_FUNC_DICT
 from . import mathFunctions as mf
-from . util import now_string_2_dt
+from . util import now_string_2_dt, parallel_map
 
 try:
     from numpy.typing import ArrayLike
@@ -119,7 +120,8 @@ class NetworkSet(object):
 
     """
 
-    def __init__(self, ntwk_set: typing.Union[list, dict], name: str = None):
+    def __init__(self, ntwk_set: typing.Union[list, dict], name: str = None,
+                 dtype: npy.dtype = None):
         """
         Initialize for NetworkSet.
 
@@ -130,6 +132,10 @@ class NetworkSet(object):
         name : string
                 the name of the NetworkSet, given to the Networks returned
                 from properties of this class.
+        dtype : complex dtype, optional
+                if given, the Networks of the set are converted to this
+                dtype, see :attr:`dtype`. Default is None, the Networks are
+                left unchanged.
         """
         if not isinstance(ntwk_set, (list, dict)):
             raise ValueError('NetworkSet requires a list as argument')
@@ -160,6 +166,8 @@ class NetworkSet(object):
         # we are good to go
         self.ntwk_set = ntwk_set
         self.name = name
+        if dtype is not None:
+            self.dtype = dtype
 
         # create list of network properties, which we use to dynamically
         # create a statistical properties of this set
@@ -193,8 +201,30 @@ class NetworkSet(object):
                 ['__pow__','__floordiv__','__mul__','__div__','__add__','__sub__']:
             self.__add_a_operator(operator_name)
 
+    @property
+    def dtype(self) -> npy.dtype:
+        """
+        dtype of the s-parameters of the Networks of the set.
+
+        Setting it converts all the Networks of the set, see
+        :attr:`skrf.network.Network.dtype`. complex64 halves the memory used
+        by large sets of measurements.
+
+        Returns
+        --------
+        dtype : :class:`numpy.dtype`
+            the dtype of the first Network of the set
+        """
+        return self.ntwk_set[0].dtype
+
+    @dtype.setter
+    def dtype(self, dtype: npy.dtype):
+        for ntwk in self.ntwk_set:
+            ntwk.dtype = dtype
+
     @classmethod
-    def from_zip(cls, zip_file_name: str, sort_filenames: bool = True, *args, **kwargs):
+    def from_zip(cls, zip_file_name: str, sort_filenames: bool = True, *args,
+                 workers: int = 1, pool: str = 'thread', errors: dict = None, **kwargs):
         r"""
         Create a NetworkSet from a zipfile of touchstones.
 
@@ -205,6 +235,15 @@ class NetworkSet(object):
         sort_filenames: Boolean
             sort the filenames in the zip file before constructing the
             NetworkSet
+        workers : int, optional
+            number of files parsed in parallel. Default is 1 (no
+            parallelism), None uses the number of CPUs.
+            See :func:`~skrf.util.parallel_map`
+        pool : {'thread', 'process'}
+            kind of pool used when `workers` is not 1
+        errors : dict, optional
+            if not None, filled with the exceptions raised by the files
+            which could not be read, keyed by filename
         \\*args, \\*\\*kwargs : arguments
             passed to NetworkSet constructor
 
@@ -217,40 +256,26 @@ class NetworkSet(object):
         z = zipfile.ZipFile(zip_file_name)
         filename_list = z.namelist()
 
-        ntwk_list = []
-
         if sort_filenames:
             filename_list.sort()
 
+        # the archive is read here, the files are parsed by the workers
+        files = ((filename, z.read(filename)) for filename in filename_list)
+        ntwks, errs = parallel_map(_read_zipped_file, files, workers=workers,
+                                   pool=pool)
 
-        for filename in filename_list:
-            # try/except block in case not all files are touchstones
-
-            try:  # Ascii files (Touchstone, etc)
-                # convert ZipExtFile to StringIO
-                # io.StringIO doesn't have an attribute called name like in
-                # file objects created with open(). So create it as it is
-                # required for the touchstone parser.
-                fileobj = StringIO(z.open(filename).read().decode('UTF-8'))
-                fileobj.name = filename
-                n = Network(fileobj)
-                ntwk_list.append(n)
-                continue
-            except:
-                pass
-            try:  # Binary files (pickled Network)
-                fileobj = BytesIO(z.open(filename).read())
-                fileobj.name = filename                
-                n = Network(fileobj)
-                ntwk_list.append(n)
-                continue
-            except:
-                pass
+        ntwk_list = []
+        for filename, ntwk, err in zip(filename_list, ntwks, errs):
+            if err is None:
+                ntwk_list.append(ntwk)
+            elif errors is not None:
+                errors[filename] = err
 
         return cls(ntwk_list)
 
     @classmethod
-    def from_dir(cls, dir: str = '.', *args, **kwargs):
+    def from_dir(cls, dir: str = '.', *args, workers: int = 1,
+                 pool: str = 'thread', errors: dict = None, **kwargs):
         r"""
         Create a NetworkSet from a directory containing Networks.
 
@@ -262,6 +287,9 @@ class NetworkSet(object):
         ----------
         dir : str
             directory containing Network files.
+        workers, pool, errors :
+            passed to :func:`~skrf.io.general.read_all`, to read the
+            files in parallel
 
         \\*args, \\*\\*kwargs :
             passed to NetworkSet constructor
@@ -272,7 +300,8 @@ class NetworkSet(object):
 
         """
         from . io.general import read_all_networks
-        return cls(read_all_networks(dir), *args, **kwargs)
+        return cls(read_all_networks(dir, workers=workers, pool=pool,
+                                     errors=errors), *args, **kwargs)
 
 
 
@@ -865,6 +894,66 @@ class NetworkSet(object):
         write(file, self, *args, **kwargs)
 
 
+    def write_native(self, file: str, append: bool = False):
+        r"""
+        Write the NetworkSet to a native binary file.
+
+        The arrays are stored with their own dtype, and can be read back
+        partially, see :mod:`skrf.io.native`.
+
+        Parameters
+        ----------
+        file : str or file-object
+            filename or a file-object
+        append : bool, optional
+            if True, the Networks are added after the Networks already
+            stored in `file`. Otherwise (default), `file` is overwritten.
+
+        Examples
+        ---------
+        >>> ns.write_native('my_ns.npz')
+        >>> ns2 = rf.NetworkSet.from_native('my_ns.npz', index=slice(0, 10))
+
+        See Also
+        ---------
+        from_native
+        skrf.io.native.write_native
+        """
+        from . io.native import write_native
+        write_native(file, self, append=append)
+
+    @classmethod
+    def from_native(cls, file: str, index=None, f_slice=None, mmap: bool = True,
+                    *args, **kwargs):
+        r"""
+        Create a NetworkSet from a native binary file.
+
+        Parameters
+        ----------
+        file : str or file-object
+            file written by :meth:`write_native`
+        index : list of int or slice, optional
+            Networks to read. If None (default), all Networks are read.
+        f_slice : slice, array of int or str, optional
+            frequency points to read, as indices or as a string like
+            '1-2ghz'. If None (default), all frequency points are read.
+        mmap : bool, optional
+            read the file through memory-maps, so that only the requested
+            Networks and frequency points are read from disk. Default is True.
+        \\*args, \\*\\*kwargs :
+            passed to NetworkSet constructor
+
+        See Also
+        ---------
+        write_native
+        skrf.io.native.read_native
+        """
+        from . io.native import read_native
+        ntwks = read_native(file, index=index, f_slice=f_slice, mmap=mmap)
+        if isinstance(ntwks, Network):
+            ntwks = [ntwks]
+        return cls(ntwks, *args, **kwargs)
+
     def write_spreadsheet(self, *args, **kwargs):
         """
         Write contents of network to a spreadsheet, for your boss to use.
@@ -951,6 +1040,205 @@ class NetworkSet(object):
         return ntw
 
 
+class NetworkStatistics(object):
+    """
+    Running statistics of a stream of Networks.
+
+    The mean, standard deviation, minimum and maximum of network
+    properties are updated as Networks are added, so the statistics of
+    many Networks can be computed without storing them. Partial
+    statistics, like the ones computed by parallel workers, can be
+    merged.
+
+    The statistics are accessed as the ones of :class:`NetworkSet`, and
+    returned as Networks: `mean_s`, `std_s_mag`, `min_s_db`, `max_s_deg`...
+
+    Parameters
+    ----------
+    ntwks : iterable of :class:`~skrf.network.Network`, optional
+        Networks to add
+    properties : list of str, optional
+        Network properties to compute statistics of, like 's', 's_mag',
+        's_db' or 's_deg'.
+    name : str, optional
+        name of the returned Networks. If None, the name of the first
+        Network added is used.
+
+    Examples
+    --------
+    >>> stats = rf.NetworkStatistics(properties=['s', 's_db'])
+    >>> for filename in filenames:
+    ...     stats.add(rf.Network(filename))
+    >>> stats.std_s_db.plot_s_re()
+
+    See Also
+    --------
+    NetworkSet
+    """
+    functions = ['mean', 'std', 'min', 'max']
+
+    def __init__(self, ntwks=None, properties=('s', 's_mag', 's_db', 's_deg'),
+                 name=None):
+        self.properties = list(properties)
+        self.name = name
+        self.n = 0
+        self._ntwk = None
+        self._mean, self._m2, self._min, self._max = {}, {}, {}, {}
+        if ntwks is not None:
+            self.add(ntwks)
+
+    def __len__(self) -> int:
+        """
+        Return the number of Networks added.
+        """
+        return self.n
+
+    def __str__(self):
+        return '%i-Networks NetworkStatistics: %s' % (self.n, self.properties)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __getattr__(self, name):
+        func, _, attribute = name.partition('_')
+        if name.startswith('_') or func not in self.functions or \
+                attribute not in self.properties:
+            raise AttributeError(name)
+        return self.get(func, attribute)
+
+    def add(self, ntwks):
+        """
+        Add a Network, or several ones at once.
+
+        Parameters
+        ----------
+        ntwks : :class:`~skrf.network.Network`, NetworkSet or list of Networks
+        """
+        if isinstance(ntwks, Network):
+            ntwks = [ntwks]
+        ntwks = list(ntwks)
+        if len(ntwks) == 0:
+            return
+        stats = {}
+        for attribute in self.properties:
+            data = npy.array([getattr(ntwk, attribute) for ntwk in ntwks])
+            stats[attribute] = self._stats(data)
+        self._merge(len(ntwks), ntwks[0], stats)
+
+    def add_stacked(self, s, ntwk):
+        """
+        Add Networks given by their stacked s-parameters.
+
+        This avoids creating a Network for each of many results computed
+        together, like the trials of a Monte-Carlo simulation.
+
+        Parameters
+        ----------
+        s : numpy.ndarray
+            s-parameters of shape (n_ntwks, nfreq, nports, nports)
+        ntwk : :class:`~skrf.network.Network`
+            Network at the frequencies of `s`, whose other attributes, like
+            the port impedances and the name, are used
+        """
+        s = npy.asarray(s)
+        if len(s) == 0:
+            return
+        n, nfreq = s.shape[:2]
+        # the properties of all the Networks are computed at once, as the
+        # ones of a single Network over n_ntwks*nfreq points
+        frequency = Frequency.from_f(npy.tile(ntwk.frequency.f, n), unit='hz')
+        stacked = Network(frequency=frequency, s=s.reshape((n * nfreq,) + s.shape[2:]),
+                          z0=npy.tile(ntwk.z0, (n, 1)), s_def=ntwk.s_def)
+        stats = {}
+        for attribute in self.properties:
+            data = getattr(stacked, attribute)
+            stats[attribute] = self._stats(data.reshape((n, nfreq) + data.shape[1:]))
+        self._merge(n, ntwk, stats)
+
+    def merge(self, other):
+        """
+        Add the Networks of another NetworkStatistics.
+
+        Parameters
+        ----------
+        other : :class:`NetworkStatistics`
+            statistics of the same properties
+        """
+        if other.n == 0:
+            return
+        self._merge(other.n, other._ntwk,
+                    dict((k, (other._mean[k], other._m2[k], other._min[k],
+                              other._max[k])) for k in self.properties))
+
+    @staticmethod
+    def _stats(data):
+        """
+        Mean, sum of squared deviations, minimum and maximum of `data`
+        along its first axis
+        """
+        mean = npy.mean(data, axis=0)
+        return (mean, npy.sum(abs(data - mean)**2, axis=0),
+                npy.min(data, axis=0), npy.max(data, axis=0))
+
+    def _merge(self, n, ntwk, stats):
+        """
+        Merge the statistics of `n` Networks, with the pairwise update of
+        the mean and of the sum of squared deviations.
+        """
+        if self.n == 0:
+            self._ntwk = ntwk.copy()
+            for k, (mean, m2, min_, max_) in stats.items():
+                self._mean[k], self._m2[k] = mean, m2
+                self._min[k], self._max[k] = min_, max_
+        else:
+            total = self.n + n
+            for k, (mean, m2, min_, max_) in stats.items():
+                delta = mean - self._mean[k]
+                self._mean[k] = self._mean[k] + delta * n / total
+                self._m2[k] = self._m2[k] + m2 + abs(delta)**2 * self.n * n / total
+                self._min[k] = npy.minimum(self._min[k], min_)
+                self._max[k] = npy.maximum(self._max[k], max_)
+        self.n += n
+
+    def get(self, func, attribute='s'):
+        """
+        A statistic of a property, as a Network.
+
+        Parameters
+        ----------
+        func : {'mean', 'std', 'min', 'max'}
+            statistic
+        attribute : str
+            property of the Networks, one of `properties`
+
+        Returns
+        -------
+        ntwk : :class:`~skrf.network.Network`
+            Network with the statistic as s-matrix, as returned by
+            :func:`func_on_networks`
+        """
+        if self.n == 0:
+            raise ValueError('no Network was added')
+        if attribute not in self.properties:
+            raise ValueError('no statistics of %s, only of %s'
+                             % (attribute, self.properties))
+        if func == 'mean':
+            value = self._mean[attribute]
+        elif func == 'std':
+            value = npy.sqrt(self._m2[attribute] / self.n)
+        elif func == 'min':
+            value = self._min[attribute]
+        elif func == 'max':
+            value = self._max[attribute]
+        else:
+            raise ValueError('func must be one of %s' % self.functions)
+        ntwk = self._ntwk.copy()
+        ntwk.s = value
+        if self.name is not None:
+            ntwk.name = self.name
+        return ntwk
+
+
 def func_on_networks(ntwk_list, func, attribute='s',name=None, *args,\
         **kwargs):
     """
@@ -987,7 +1275,7 @@ def func_on_networks(ntwk_list, func, attribute='s',name=None, *args,\
 
     """
     data_matrix = \
-            npy.array([ntwk.__getattribute__(attribute) for ntwk in ntwk_list])
+            npy.array([getattr(ntwk, attribute) for ntwk in ntwk_list])
 
     new_ntwk = ntwk_list[0].copy()
     new_ntwk.s = func(data_matrix,axis=0,*args,**kwargs)
@@ -1057,3 +1345,24 @@ def tuner_constellation(name='tuner', singlefreq=76, Z0=50, r_lin = 9, phi_lin=2
     else :
         return x,y,g
 
+
+def _read_zipped_file(file):
+    """
+    Read a Network from a (filename, content) tuple of a zipfile
+
+    The content is tried as a touchstone file, then as a pickled Network.
+    """
+    filename, data = file
+    try:  # Ascii files (Touchstone, etc)
+        # io.StringIO doesn't have an attribute called name like in
+        # file objects created with open(). So create it as it is
+        # required for the touchstone parser.
+        fileobj = StringIO(data.decode('UTF-8'))
+        fileobj.name = filename
+        return Network(fileobj)
+    except:
+        pass
+    # Binary files (pickled Network)
+    fileobj = BytesIO(data)
+    fileobj.name = filename
+    return Network(fileobj)
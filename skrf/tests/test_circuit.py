@@ -169,6 +169,20 @@ class CircuitTestWilkinson(unittest.TestCase):
         '''
         from scipy.linalg import block_diag
         assert_array_almost_equal(self.C.X[0], block_diag(self.X1, self.X2, self.X2) )
+        # the intersections do not depend on frequency here
+        X = block_diag(self.X1, self.X2, self.X2)
+        assert_array_almost_equal(self.C.X, np.tile(X, (len(self.freq), 1, 1)))
+
+    def test_sparse_solver(self):
+        '''
+        The sparse solver should give the same network as the dense one
+        '''
+        s = self.C.network.s
+        self.C.solver = 'sparse'
+        assert_array_almost_equal(self.C.network.s, s)
+        self.C.solver = 'lu'
+        with self.assertRaises(ValueError):
+            self.C.s_external
 
     def test_sparam_circuit(self):
         '''
@@ -916,6 +930,109 @@ class CircuitTestVoltagesCurrents(unittest.TestCase):
         # (toward the Circuit's Port)
         np.testing.assert_allclose(self.I_out, -1*I_ports[:,1])
 
+    def test_sparse_solver(self):
+        '''
+        The sparse solver should give the same voltages and currents as
+        the dense one
+        '''
+        V = self.crt.voltages(self.power, self.phase)
+        I = self.crt.currents(self.power, self.phase)
+        I_ports = self.crt.currents_external(self.power, self.phase)
+        self.crt.solver = 'sparse'
+        np.testing.assert_allclose(self.crt.voltages(self.power, self.phase), V)
+        np.testing.assert_allclose(self.crt.currents(self.power, self.phase), I)
+        np.testing.assert_allclose(self.crt.currents_external(self.power, self.phase), I_ports)
+
+    def test_chunks(self):
+        '''
+        The circuit evaluated by chunks of frequency, with several threads,
+        should give the same results
+        '''
+        ntw = self.crt.network
+        V = self.crt.voltages(self.power, self.phase)
+        I = self.crt.currents(self.power, self.phase)
+        for solver in ['dense', 'sparse']:
+            crt = rf.Circuit(self.crt.connections)
+            crt.solver = solver
+            crt.chunk_size = 3
+            crt.workers = 2
+            np.testing.assert_allclose(crt.network.s, ntw.s, atol=1e-10)
+            np.testing.assert_allclose(crt.s_active([1, 0]), ntw.s_active([1, 0]), atol=1e-10)
+            np.testing.assert_allclose(crt.voltages(self.power, self.phase), V)
+            np.testing.assert_allclose(crt.currents(self.power, self.phase), I)
+            # the global scattering matrix is not computed
+            self.assertNotIn('s', crt._cache)
+            # the cached s-parameters are not shared with the networks
+            crt.network.s[:] = 0
+            np.testing.assert_allclose(crt.network.s, ntw.s, atol=1e-10)
+            crt.use_cache = False
+            np.testing.assert_allclose(crt.network.s, ntw.s, atol=1e-10)
+
+    def test_cache(self):
+        '''
+        The global scattering matrix should be solved once for the
+        external s-parameters, voltages and currents, and again when a
+        network is modified.
+        '''
+        s_ext = self.crt.s_external
+        self.crt.voltages(self.power, self.phase)
+        self.crt.currents(self.power, self.phase)
+        self.crt.voltages_external(self.power, self.phase)
+        misses = self.crt.cache_info().misses
+        self.crt.network
+        self.assertEqual(self.crt.cache_info().misses, misses)
+        self.assertGreater(self.crt.cache_info().hits, 0)
+        self.assertFalse(self.crt.s.flags.writeable)
+
+        # modified in place
+        self.line.s[:, 0, 0] += .1
+        np.testing.assert_allclose(self.crt.s_external[:, 0, 0], s_ext[:, 0, 0] + .1)
+        self.assertGreater(self.crt.cache_info().misses, misses)
+
+        self.crt.use_cache = False
+        np.testing.assert_allclose(self.crt.s_external[:, 0, 0], s_ext[:, 0, 0] + .1)
+
+    def test_clear_cache(self):
+        '''
+        The topology should be updated when the connections are modified.
+        '''
+        port3 = rf.Circuit.Port(frequency=self.freq, name='port3', z0=self.Z)
+        self.crt.s_external
+        self.crt.connections[1][0] = (port3, 0)
+        self.crt.clear_cache()
+        self.assertEqual(self.crt.cache_info().currsize, 0)
+        self.assertEqual(self.crt.port_indexes, [0, 2])
+        self.assertIn('port3', self.crt.networks_dict())
+        np.testing.assert_allclose(self.crt.s_external, self.line.s, atol=1e-12)
+
+    def test_sweep(self):
+        '''
+        The variants of a circuit solved together should be the circuits
+        built with the replaced networks.
+        '''
+        lengths = np.random.rand(5)
+        lines = [self.line_media.line(d=d, unit='m', name='line') for d in lengths]
+        ns = self.crt.sweep({'line': lines}, chunk_size=2)
+        self.assertEqual(len(ns), 5)
+        for (ntwk, line) in zip(ns, lines):
+            np.testing.assert_allclose(ntwk.s, line.s, atol=1e-12)
+            np.testing.assert_allclose(ntwk.z0, self.crt.port_z0)
+
+        # the characteristic impedance of the lines is changed
+        lines = [rf.media.DefinedGammaZ0(self.freq, z0=z0).line(d=self.L, unit='m', name='line')
+                 for z0 in [10, 20, 30]]
+        s = self.crt.sweep({'line': lines}, as_array=True)
+        for (s_k, line) in zip(s, lines):
+            port1 = rf.Circuit.Port(frequency=self.freq, name='port1', z0=self.Z)
+            port2 = rf.Circuit.Port(frequency=self.freq, name='port2', z0=self.Z)
+            crt = rf.Circuit([[(port1, 0), (line, 0)], [(port2, 0), (line, 1)]])
+            np.testing.assert_allclose(s_k, crt.s_external, atol=1e-12)
+
+        with self.assertRaises(ValueError):
+            self.crt.sweep({'port1': lines})
+        with self.assertRaises(ValueError):
+            self.crt.sweep({'line': [self.line_media.match(name='load')]})
+
 
 if __name__ == "__main__":
     # Launch all tests
@@ -175,6 +175,87 @@ class NetworkTestCase(unittest.TestCase):
         self.assertEqual(self.ntwk1, ntwk1Saved)
         os.remove(os.path.join(self.test_dir, 'ntwk1Saved.s2p'))
 
+    def test_write_touchstone(self):
+        """
+        Networks of any number of ports written to touchstone in any
+        format should be read back, and format specifications which are
+        not simple fields should give the same result.
+        """
+        freq = rf.Frequency(1, 2, 11, 'GHz')
+        for nports in [1, 2, 3, 4, 5, 9]:
+            s = npy.random.randn(11, nports, nports) \
+                + 1j * npy.random.randn(11, nports, nports)
+            z0 = npy.random.rand(11, nports) * 50 + 1
+            ntwk = rf.Network(frequency=freq, s=s, z0=z0, name='test')
+            for form in ['ri', 'ma', 'db']:
+                string = ntwk.write_touchstone(return_string=True, form=form,
+                                               write_z0=True)
+                sio = io.StringIO(string)
+                sio.name = 'test.s%ip' % nports
+                ntwk_read = rf.Network(sio)
+                npy.testing.assert_allclose(ntwk_read.s, ntwk.s)
+                self.assertEqual(
+                    ntwk.write_touchstone(return_string=True, form=form,
+                                          format_spec_A='{:.6f}',
+                                          format_spec_B='{:.3e}'),
+                    ntwk.write_touchstone(return_string=True, form=form,
+                                          format_spec_A='{0:.6f}',
+                                          format_spec_B='{0.real:.3e}'))
+
+    def test_write_touchstone_db(self):
+        """
+        The DB form should be written exactly as formatting each value
+        with complex_2_db, as the writer did value by value.
+        """
+        freq = rf.Frequency(1, 2, 101, 'GHz')
+        for nports in [1, 2]:
+            s = npy.random.randn(101, nports, nports) \
+                + 1j * npy.random.randn(101, nports, nports)
+            s *= 10 ** npy.random.uniform(-3, 1, s.shape)
+            ntwk = rf.Network(frequency=freq, s=s, name='test')
+            for spec in ['{}', '{:.12f}']:
+                string = ntwk.write_touchstone(return_string=True, form='db',
+                                               format_spec_A=spec,
+                                               format_spec_B=spec)
+                lines = [line for line in string.splitlines()
+                         if not line.startswith(('!', '#'))]
+                order = [(0, 0)] if nports == 1 else [(0, 0), (1, 0), (0, 1), (1, 1)]
+                expected = []
+                for f in range(len(freq)):
+                    line = '{}'.format(freq.f_scaled[f])
+                    for i, j in order:
+                        line += ' ' + spec.format(rf.mathFunctions.complex_2_db(ntwk.s[f, i, j])) \
+                                + ' ' + spec.format(rf.mathFunctions.complex_2_degree(ntwk.s[f, i, j]))
+                    expected.append(line)
+                self.assertEqual(lines, expected)
+
+    def test_write_touchstone_ma(self):
+        """
+        The MA form should be written exactly as formatting the builtin
+        abs() of each value, as the writer did value by value.
+        """
+        freq = rf.Frequency(1, 2, 101, 'GHz')
+        for nports in [1, 2]:
+            s = npy.random.randn(101, nports, nports) \
+                + 1j * npy.random.randn(101, nports, nports)
+            s *= 10 ** npy.random.uniform(-3, 1, s.shape)
+            ntwk = rf.Network(frequency=freq, s=s, name='test')
+            for spec in ['{}', '{:.12f}']:
+                string = ntwk.write_touchstone(return_string=True, form='ma',
+                                               format_spec_A=spec,
+                                               format_spec_B=spec)
+                lines = [line for line in string.splitlines()
+                         if not line.startswith(('!', '#'))]
+                order = [(0, 0)] if nports == 1 else [(0, 0), (1, 0), (0, 1), (1, 1)]
+                expected = []
+                for f in range(len(freq)):
+                    line = '{}'.format(freq.f_scaled[f])
+                    for i, j in order:
+                        line += ' ' + spec.format(abs(ntwk.s[f, i, j])) \
+                                + ' ' + spec.format(rf.mathFunctions.complex_2_degree(ntwk.s[f, i, j]))
+                    expected.append(line)
+                self.assertEqual(lines, expected)
+
     def test_pickling(self):
         original_ntwk = self.ntwk1
         with tempfile.NamedTemporaryFile(dir=self.test_dir, suffix='ntwk') as fid:
@@ -840,6 +921,123 @@ class NetworkTestCase(unittest.TestCase):
         # vswr_act should be equal to vswr22 if a = [0,1]
         npy.testing.assert_array_almost_equal(self.ntwk1.vswr_active([0, 1])[:,1], vswr_ref[:,1,1])
 
+    def test_one_port_subnetworks(self):
+        """
+        The one-port sub-networks s11, s21, ... should depend on the number
+        of ports of each Network.
+        """
+        tee = rf.data.tee
+        for m in range(3):
+            for n in range(3):
+                sub = getattr(tee, 's%i%i' % (m + 1, n + 1))
+                npy.testing.assert_array_equal(sub.s[:, 0, 0], tee.s[:, m, n])
+                npy.testing.assert_array_equal(sub.z0[:, 0], tee.z0[:, m])
+        self.assertTrue(hasattr(tee, 's33'))
+        self.assertFalse(hasattr(self.ntwk1, 's33'))
+        self.assertFalse(hasattr(self.ntwk1, 's0'))
+        self.assertRaises(AttributeError, getattr, self.ntwk1, 's31')
+        # secondary properties are defined once, on the class
+        self.assertIsInstance(rf.Network.__dict__['s_db'], property)
+
+    def test_cache(self):
+        """
+        Derived matrices should be cached when enabled, and recomputed
+        when s, z0 or the frequency change.
+        """
+        ntwk = self.ntwk1.copy()
+        z = ntwk.z
+        self.assertEqual(ntwk.cache_info().misses, 0)
+
+        ntwk.cache_size = 3
+        npy.testing.assert_array_equal(ntwk.z, z)
+        npy.testing.assert_array_equal(ntwk.z_re, z.real)
+        npy.testing.assert_array_equal(ntwk.z_im, z.imag)
+        self.assertEqual(ntwk.cache_info(), (2, 3, 3, 3))
+        self.assertFalse(ntwk.z.flags.writeable)
+        # least recently used are dropped
+        ntwk.y
+        self.assertEqual(ntwk.cache_info().currsize, 3)
+
+        ntwk.s[0, 0, 0] = 0.5
+        self.assertFalse(npy.array_equal(ntwk.z, z))
+        npy.testing.assert_array_equal(ntwk.z, rf.s2z(ntwk.s, ntwk.z0))
+        z = ntwk.z
+        ntwk.z0 = 25
+        npy.testing.assert_array_equal(ntwk.z, rf.s2z(ntwk.s, ntwk.z0))
+        ntwk.frequency = rf.Frequency(1, 2, len(ntwk), 'GHz')
+        misses = ntwk.cache_info().misses
+        ntwk.z
+        self.assertEqual(ntwk.cache_info().misses, misses + 1)
+
+        ntwk.clear_cache()
+        self.assertEqual(ntwk.cache_info(), (0, 0, 3, 0))
+
+    def test_view(self):
+        """
+        Views should share memory with their Network, and be read-only.
+        """
+        ntwk = self.ntwk1.copy()
+        band = ntwk.view('2-5ghz')
+        self.assertEqual(band, ntwk['2-5ghz'])
+        self.assertTrue(npy.shares_memory(band.s, ntwk.s))
+        self.assertTrue(npy.shares_memory(band.f, ntwk.f))
+        self.assertEqual(ntwk.copy_subset(slice(3, 10), view=True),
+                         ntwk.copy_subset(slice(3, 10)))
+        self.assertEqual(ntwk.cropped(2, 5, view=True), ntwk.cropped(2, 5))
+        self.assertFalse(npy.shares_memory(ntwk.cropped(2, 5).s, ntwk.s))
+
+        s21 = ntwk.view(m=1, n=0)
+        self.assertEqual(s21, ntwk.s21)
+        self.assertTrue(npy.shares_memory(s21.s, ntwk.s))
+        self.assertFalse(npy.shares_memory(ntwk.s21.s, ntwk.s))
+
+        # modifications of the Network are seen by its views
+        ntwk.s[0, 1, 0] = 0.5
+        self.assertEqual(s21.s[0, 0, 0], 0.5)
+        # views can not be modified in place, but get their own data
+        with self.assertRaises(ValueError):
+            s21.s[0, 0, 0] = 1
+        s21.s = s21.s * 2
+        self.assertEqual(ntwk.s[0, 1, 0], 0.5)
+        self.assertEqual(s21.s[0, 0, 0], 1)
+        band.renumber([0, 1], [1, 0])
+        self.assertFalse(npy.shares_memory(band.s, ntwk.s))
+        npy.testing.assert_array_equal(band.s[:, 0, 0], ntwk['2-5ghz'].s[:, 1, 1])
+
+    def test_dtype(self):
+        """
+        Single precision Networks should stay in single precision, and
+        match the double precision results.
+        """
+        ntwk = rf.Network(os.path.join(self.test_dir, 'ntwk1.s2p'),
+                          dtype=npy.complex64)
+        self.assertEqual(ntwk.s.dtype, npy.complex64)
+        self.assertEqual(ntwk.z0.dtype, npy.complex64)
+        for derived in [ntwk.copy(), ntwk ** ntwk, ntwk.interpolate(201),
+                        ntwk[2:5], ntwk.s21, ntwk.view(m=0, n=0), ntwk * ntwk,
+                        rf.subnetwork(ntwk, [0]), ntwk.subnetwork([1, 0])]:
+            self.assertEqual(derived.s.dtype, npy.complex64)
+            self.assertEqual(derived.z0.dtype, npy.complex64)
+        # inverses are computed in double precision
+        self.assertEqual(ntwk.z.dtype, npy.complex128)
+        npy.testing.assert_allclose(ntwk.z, self.ntwk1.z, rtol=1e-5)
+        npy.testing.assert_allclose((ntwk ** ntwk).s, (self.ntwk1 ** self.ntwk1).s,
+                                    atol=1e-6)
+        ntwk.z = self.ntwk1.z
+        self.assertEqual(ntwk.s.dtype, npy.complex64)
+
+        ntwk.dtype = complex
+        self.assertEqual(ntwk.s.dtype, npy.complex128)
+        self.assertEqual(ntwk.z0.dtype, npy.complex128)
+        self.assertRaises(ValueError, setattr, ntwk, 'dtype', float)
+
+        default_dtype = rf.Network.default_dtype
+        try:
+            rf.Network.default_dtype = npy.complex64
+            self.assertEqual(rf.Network(f=[1, 2], s=[0, 1]).s.dtype, npy.complex64)
+        finally:
+            rf.Network.default_dtype = default_dtype
+
     def test_subnetwork(self):
         ''' Test subnetwork creation and recombination '''
         tee = rf.data.tee # 3 port Network
@@ -66,6 +66,20 @@ class NetworkSetTestCase(unittest.TestCase):
         ntwk_set1 = rf.NetworkSet([self.ntwk_freq1_1p, self.ntwk_freq1_1p])
         ntwk_set2 = rf.NetworkSet([self.ntwk_freq2_1p, self.ntwk_freq2_1p])
 
+    def test_dtype(self):
+        """
+        Test the conversion of the Networks of a set to single precision.
+        """
+        ntwks = [self.ntwk1.copy(), self.ntwk2.copy(), self.ntwk3.copy()]
+        ns = rf.NetworkSet(ntwks, dtype=np.complex64)
+        self.assertEqual(ns.dtype, np.complex64)
+        for ntwk in ns:
+            self.assertEqual(ntwk.s.dtype, np.complex64)
+        self.assertEqual(ns.mean_s.s.dtype, np.complex64)
+        np.testing.assert_allclose(ns.mean_s.s, self.ns.mean_s.s, atol=1e-6)
+        ns.dtype = complex
+        self.assertEqual(ns[0].s.dtype, np.complex128)
+
     def test_from_zip(self):
         """
         Test the `NetworkSet.from_zip()` constructor class method.
@@ -76,6 +90,14 @@ class NetworkSetTestCase(unittest.TestCase):
         # reading a zip of pickled networks
         zip_filename2 = os.path.join(self.test_dir, 'ntwk_pickle.zip')
         ntwk_set = rf.NetworkSet.from_zip(zip_filename2)
+        # reading in parallel
+        errors = {}
+        ntwk_set2 = rf.NetworkSet.from_zip(zip_filename2, workers=2,
+                                           errors=errors)
+        self.assertEqual(len(ntwk_set2), len(ntwk_set))
+        self.assertEqual(errors, {})
+        for ntwk, ntwk2 in zip(ntwk_set, ntwk_set2):
+            self.assertEqual(ntwk, ntwk2)
 
     def test_from_dir(self):
         """
@@ -83,6 +105,8 @@ class NetworkSetTestCase(unittest.TestCase):
         """
         dir_path = os.path.join(self.test_dir, './ntwks')
         ntwk_set = rf.NetworkSet.from_dir(dir_path)
+        ntwk_set2 = rf.NetworkSet.from_dir(dir_path, workers=2, pool='process')
+        self.assertEqual(len(ntwk_set2), len(ntwk_set))
 
     def test_from_s_dict(self):
         """
@@ -214,5 +238,23 @@ class NetworkSetTestCase(unittest.TestCase):
         x0 = 1.5
         interp_ntwk = self.ns.interpolate_from_network(param, x0)
 
+    def test_network_statistics(self):
+        """
+        The running statistics should match the ones of the NetworkSet,
+        when the Networks are added one by one or merged.
+        """
+        stats = rf.NetworkStatistics([self.ntwk1])
+        stats.add(self.ntwk2)
+        other = rf.NetworkStatistics([self.ntwk3])
+        stats.merge(other)
+        self.assertEqual(len(stats), 3)
+        for attr in ['mean_s', 'std_s', 'min_s_mag', 'max_s_mag',
+                     'mean_s_db', 'std_s_deg']:
+            np.testing.assert_allclose(getattr(stats, attr).s,
+                                       getattr(self.ns, attr).s, atol=1e-12)
+        self.assertEqual(stats.mean_s.frequency, self.ntwk1.frequency)
+        self.assertRaises(AttributeError, getattr, stats, 'mean_z')
+        self.assertRaises(ValueError, rf.NetworkStatistics().get, 'mean')
+
 suite = unittest.TestLoader().loadTestsFromTestCase(NetworkSetTestCase)
 unittest.TextTestRunner(verbosity=2).run(suite)
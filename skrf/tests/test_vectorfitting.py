@@ -210,6 +210,36 @@ class VectorFittingTestCase(unittest.TestCase):
         self.assertTrue(np.allclose(vf.proportional_coeff, vf2.proportional_coeff))
         self.assertTrue(np.allclose(vf.constant_coeff, vf2.constant_coeff))
 
+    def test_rational_basis(self):
+        # one column per real pole, two columns per complex pole, in the order of the poles
+        s = 2j * np.pi * np.linspace(0.5, 1.5, 5)
+        poles = np.array([-1 + 0j, -0.1 + 2j, -2 + 0j])
+        h = np.arange(1, 6) + 1j
+        A = skrf.vectorFitting.VectorFitting._get_rational_basis(s, poles)
+        A_res = skrf.vectorFitting.VectorFitting._get_rational_basis(s, poles, h)
+        self.assertEqual(A.shape, (5, 4))
+        for k, s_k in enumerate(s):
+            expected = [1 / (s_k - poles[0]),
+                        1 / (s_k - poles[1]) + 1 / (s_k - np.conjugate(poles[1])),
+                        1j / (s_k - poles[1]) - 1j / (s_k - np.conjugate(poles[1])),
+                        1 / (s_k - poles[2])]
+            np.testing.assert_allclose(A[k], expected)
+            np.testing.assert_allclose(A_res[k], -h[k] * np.array(expected))
+
+    def test_workers(self):
+        # the fit reduced by a pool of threads should match the fit reduced in the current thread
+        nw = skrf.network.Network('./doc/source/examples/vectorfitting/190ghz_tx_measured.S2P')
+        vfs = []
+        for workers in [1, 3]:
+            vf = skrf.vectorFitting.VectorFitting(nw)
+            vf.workers = workers
+            vf.vector_fit(n_poles_real=2, n_poles_cmplx=2)
+            vfs.append(vf)
+        self.assertEqual(len(vfs[0].d_res_history), len(vfs[1].d_res_history))
+        np.testing.assert_allclose(vfs[1].poles, vfs[0].poles, rtol=1e-12)
+        np.testing.assert_allclose(vfs[1].zeros, vfs[0].zeros, rtol=1e-12)
+        np.testing.assert_allclose(vfs[1].constant_coeff, vfs[0].constant_coeff, rtol=1e-12)
+
     def test_matplotlib_missing(self):
         vf = skrf.vectorFitting.VectorFitting(skrf.data.ring_slot)
         skrf.vectorFitting.mplt = None
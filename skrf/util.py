@@ -18,6 +18,7 @@ General
    find_nearest_index
    get_fid
    get_extn
+   parallel_map
 
 """
 from __future__ import print_function
@@ -38,6 +39,7 @@ import re
 from subprocess import Popen, PIPE
 import sys
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 def now_string():
     '''
@@ -344,7 +346,7 @@ class HomoList(collections.Sequence):
 
     def __getattr__(self, name):
         return self.__class__(
-            [k.__getattribute__(name) for k in self.store])
+            [getattr(k, name) for k in self.store])
 
     def __getitem__(self, idx):
         try:
@@ -679,3 +681,65 @@ def suppress_warning_decorator(msg):
                 warnings.warn(w.message.args[0])
         return suppressed_func
     return suppress_warnings_decorated
+
+
+def _call_and_catch(func, arg):
+    """
+    Returns (func(arg), None), or (None, exception) if the call failed
+    """
+    try:
+        return func(arg), None
+    except Exception as e:
+        return None, e
+
+
+def parallel_map(func, args, workers=1, pool='thread'):
+    """
+    Apply `func` to each element of `args`, optionally with a pool of workers.
+
+    A call raising an exception does not stop the others: its result is
+    None and the exception is returned alongside.
+
+    Parameters
+    ----------
+    func : callable
+        function of a single argument. With `pool='process'`, `func`,
+        its arguments and results must be pickle-able.
+    args : iterable
+        arguments to call `func` with
+    workers : int, optional
+        number of workers. If 1 (default), the calls are made one after the
+        other in the current thread. If None, the number of CPUs is used.
+    pool : {'thread', 'process'}
+        kind of pool. Threads share memory with the caller, so results are
+        not copied, but only help if `func` releases the GIL. Processes
+        are not limited by the GIL, but results are pickled back.
+
+    Returns
+    -------
+    results : list
+        results of the calls, in the order of `args`, None for failed calls
+    errors : list
+        exceptions raised by the calls, in the order of `args`, None for
+        successful calls
+
+    Examples
+    --------
+    >>> results, errors = parallel_map(rf.Network, filenames, workers=4,
+    ...                                pool='process')
+    """
+    if workers == 1:
+        out = [_call_and_catch(func, arg) for arg in args]
+    else:
+        args = list(args)
+        if pool == 'thread':
+            executor = ThreadPoolExecutor
+        elif pool == 'process':
+            executor = ProcessPoolExecutor
+        else:
+            raise ValueError("pool must be 'thread' or 'process'")
+        with executor(max_workers=workers) as ex:
+            out = list(ex.map(_call_and_catch, [func] * len(args), args))
+    results = [r for r, e in out]
+    errors = [e for r, e in out]
+    return results, errors
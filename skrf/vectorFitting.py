@@ -22,6 +22,8 @@ except ImportError:
 
 import logging
 
+from .util import parallel_map
+
 
 def check_plotting(func):
     """
@@ -108,6 +110,11 @@ class VectorFitting:
         """ Instance variable specifying the convergence criterion in terms of relative tolerance. To be changed by the
          user before calling :func:`vector_fit`. """
 
+        self.workers = 1
+        """ Instance variable specifying the number of threads reducing the frequency responses independently with QR
+         decompositions during the pole relocation. If None, the number of CPUs is used. To be changed by the user
+         before calling :func:`vector_fit`. """
+
         self.d_res_history = []
         self.delta_max_history = []
 
@@ -154,6 +161,10 @@ class VectorFitting:
         a similar number of complex conjugate poles is required. Be careful not to use too many poles, as excessive
         poles will not only increase the computation workload during the fitting and the subsequent use of the model,
         but they can also introduce unwanted resonances at frequencies well outside the fit interval.
+
+        During the pole relocation, the frequency responses are reduced independently with QR decompositions, which
+        can be distributed over a pool of threads with :attr:`workers` to speed up the fit of networks with many
+        ports.
         """
 
         # create initial poles and space them across the frequencies in the provided Touchstone file
@@ -221,63 +232,39 @@ class VectorFitting:
             # generate coefficients of approximation function for each target frequency response
             # responses will be treated independently using QR decomposition
             # simplified coeff matrices of all responses will be stacked for least-squares solver
-            A_matrix = []
-            b_vector = []
-
-            for freq_response in freq_responses:
-                # calculate coefficients (row A_k in matrix) for each frequency sample s_k of the target response
-                # row will be appended to submatrix A_sub of complete coeff matrix A_matrix
-                # 2 rows per pole in result vector (1st for real part, 2nd for imaginary part)
-                # --> 2 columns per pole in coeff matrix
-                A_sub = []
-                b_sub = []
-                n_unused = 0
-
-                for k, f_sample in enumerate(freqs_norm):
-                    s_k = 2j * np.pi * f_sample
-                    A_k = []
-                    n_unused = 0
-
-                    # add coefficients for a pair of complex conjugate poles
-                    # part 1: first sum of rational functions (residue variable c)
-                    for pole in poles:
-                        # separate and stack real and imaginary part to preserve conjugacy of the pole pair
-                        if np.imag(pole) == 0.0:
-                            A_k.append(1 / (s_k - pole))
-                            n_unused += 1
-                        else:
-                            # complex pole of a conjugated pair
-                            A_k.append(1 / (s_k - pole) + 1 / (s_k - np.conjugate(pole)))       # real part of residue
-                            A_k.append(1j / (s_k - pole) - 1j / (s_k - np.conjugate(pole)))     # imaginary part of residue
-                            n_unused += 2
-
-                    # part 2: constant (variable d) and proportional term (variable e)
-                    if fit_constant:
-                        A_k.append(1)
-                        n_unused += 1
-                    if fit_proportional:
-                        A_k.append(s_k)
-                        n_unused += 1
-
-                    # part 3: second sum of rational functions (variable c_res)
-                    for pole in poles:
-                        # separate and stack real and imaginary part to preserve conjugacy of the pole pair
-                        if np.imag(pole) == 0.0:
-                            A_k.append(-1 * freq_response[k] / (s_k - pole))
-                        else:
-                            # complex pole of a conjugated pair
-                            A_k.append(-1 * freq_response[k] / (s_k - pole)
-                                       - freq_response[k] / (s_k - np.conjugate(pole)))
-                            A_k.append(-1j * freq_response[k] / (s_k - pole)
-                                       + 1j * freq_response[k] / (s_k - np.conjugate(pole)))
-
-                    # part 4: constant (variable d_res)
-                    A_k.append(-1 * freq_response[k])
 
-                    A_sub.append(np.sqrt(weight_regular) * np.real(A_k))
-                    A_sub.append(np.sqrt(weight_regular) * np.imag(A_k))
-                    b_sub.append(np.sqrt(weight_regular) * 0.0)
-                    b_sub.append(np.sqrt(weight_regular) * 0.0)
+            # calculate the coefficients (rows A_k in matrix) of all frequency samples s_k at once
+            # 2 rows per sample in coeff matrix (1st for real part, 2nd for imaginary part)
+            # --> 2 columns per complex pole in coeff matrix
+            # part 1: first sum of rational functions (residue variable c), common to all responses
+            s = 2j * np.pi * freqs_norm
+            A_res = self._get_rational_basis(s, poles)
+
+            # part 2: constant (variable d) and proportional term (variable e)
+            A_const = []
+            if fit_constant:
+                A_const.append(np.ones_like(s))
+            if fit_proportional:
+                A_const.append(s)
+            n_unused = A_res.shape[1] + len(A_const)
+
+            # extra equation to avoid trivial solution, equal for all responses apart from its weight
+            # part 3: second sum of rational functions (variable c_res); part 4: constant (d_res)
+            A_extra = np.append(np.sum(np.real(A_res), axis=0), float(len(freqs_norm)))
+
+            def reduce_response(freq_response):
+                # part 3: second sum of rational functions (variable c_res)
+                # part 4: constant (variable d_res)
+                A_k = np.hstack([A_res] + [a[:, None] for a in A_const] +
+                                [self._get_rational_basis(s, poles, freq_response),
+                                 -1 * freq_response[:, None]])
+
+                # interleave the rows of the real and imaginary parts
+                A_sub = np.empty((len(s), 2, A_k.shape[1]))
+                A_sub[:, 0] = np.sqrt(weight_regular) * np.real(A_k)
+                A_sub[:, 1] = np.sqrt(weight_regular) * np.imag(A_k)
+                A_sub = A_sub.reshape(2 * len(s), A_k.shape[1])
+                b_sub = np.full(2 * len(s), np.sqrt(weight_regular) * 0.0)
 
                 # QR decomposition
                 Q, R = np.linalg.qr(A_sub, 'reduced')
@@ -287,37 +274,20 @@ class VectorFitting:
                 # similarly, only right half of Q is required
                 Q2 = Q[:, n_unused:]
 
-                if len(A_matrix) == 0:
-                    A_matrix = R22
-                    b_vector = np.matmul(np.transpose(Q2), b_sub)
-                else:
-                    A_matrix = np.vstack((A_matrix, R22))
-                    b_vector = np.append(b_vector, np.matmul(np.transpose(Q2), b_sub))
-
                 # add extra equation to avoid trivial solution
                 # use weight=1 for all equations, except for this extra equation
                 weight_extra = np.linalg.norm(weight_regular * freq_response) / len(freq_response)
-                A_k = np.zeros(np.shape(A_matrix)[1])
-                for k, f_sample in enumerate(freqs_norm):
-                    s_k = 2j * np.pi * f_sample
-                    i = 0
-
-                    # part 3: second sum of rational functions (variable c_res)
-                    for pole in poles:
-                        if np.imag(pole) == 0.0:
-                            # real pole
-                            A_k[i] += np.real(1 / (s_k - pole))
-                            i += 1
-                        else:
-                            # complex pole of a conjugated pair
-                            A_k[i] += np.real(1 / (s_k - pole) + 1 / (s_k - np.conjugate(pole)))
-                            A_k[i+1] += np.real(1j / (s_k - pole) - 1j / (s_k - np.conjugate(pole)))
-                            i += 2
-                    # part 4: constant (d_res)
-                    A_k[i] += 1
-
-                A_matrix = np.vstack((A_matrix, np.sqrt(weight_extra) * A_k))
-                b_vector = np.append(b_vector, np.sqrt(weight_extra) * len(freqs_norm))
+                A_reduced = np.vstack((R22, np.sqrt(weight_extra) * A_extra))
+                b_reduced = np.append(np.matmul(np.transpose(Q2), b_sub), np.sqrt(weight_extra) * len(freqs_norm))
+                return A_reduced, b_reduced
+
+            # the responses are reduced independently, optionally by a pool of threads
+            results, errors = parallel_map(reduce_response, freq_responses, workers=self.workers, pool='thread')
+            for error in errors:
+                if error is not None:
+                    raise error
+            A_matrix = np.vstack([A_reduced for A_reduced, b_reduced in results])
+            b_vector = np.concatenate([b_reduced for A_reduced, b_reduced in results])
 
             logging.info('A_matrix: condition number = {}'.format(np.linalg.cond(A_matrix)))
 
@@ -421,44 +391,30 @@ class VectorFitting:
         constant_coeff = []
         proportional_coeff = []
 
-        for freq_response in freq_responses:
-            # calculate coefficients (row A_k in matrix) for each frequency sample s_k of the target response
-            # row will be appended to submatrix A_sub of complete coeff matrix A_matrix
-            # 2 rows per pole in result vector (1st for real part, 2nd for imaginary part)
-            # --> 2 columns per pole in coeff matrix
-            A_matrix = []
-            b_vector = []
-
-            for k, f_sample in enumerate(freqs_norm):
-                s_k = 2j * np.pi * f_sample
-                A_k = []
-                # add coefficients for a pair of complex conjugate poles
-                # part 1: first sum of rational functions (residue variable c)
-                for pole in poles:
-                    # separate and stack real and imaginary part to preserve conjugacy of the pole pair
-                    if np.imag(pole) == 0.0:
-                        A_k.append(1 / (s_k - pole))
-                    else:
-                        A_k.append(1 / (s_k - pole) + 1 / (s_k - np.conjugate(pole)))       # real part of residue
-                        A_k.append(1j / (s_k - pole) - 1j / (s_k - np.conjugate(pole)))     # imaginary part of residue
-
-                # part 2: constant (variable d) and proportional term (variable e)
-                if fit_constant:
-                    A_k.append(1.0)
-                if fit_proportional:
-                    A_k.append(s_k)
-
-                A_matrix.append(np.array(A_k))
-                b_vector.append(np.array(freq_response[k]))
-
-            A_matrix = np.vstack((np.real(A_matrix), np.imag(A_matrix)))
-            b_vector = np.append(np.real(b_vector), np.imag(b_vector))
+        # calculate coefficients (row A_k in matrix) for each frequency sample s_k, common to all responses
+        # 2 rows per pole in result vector (1st for real part, 2nd for imaginary part)
+        # --> 2 columns per pole in coeff matrix
+        s = 2j * np.pi * freqs_norm
 
-            logging.info('A_matrix: condition number = {}'.format(np.linalg.cond(A_matrix)))
+        # part 1: first sum of rational functions (residue variable c)
+        # part 2: constant (variable d) and proportional term (variable e)
+        A_k = [self._get_rational_basis(s, poles)]
+        if fit_constant:
+            A_k.append(np.ones((len(s), 1)))
+        if fit_proportional:
+            A_k.append(s[:, None])
+        A_matrix = np.hstack(A_k)
+        A_matrix = np.vstack((np.real(A_matrix), np.imag(A_matrix)))
 
-            # solve least squares and obtain results as stack of real part vector and imaginary part vector
-            x, residuals, rank, singular_vals = np.linalg.lstsq(A_matrix, b_vector, rcond=None)
+        # one right-hand side per response
+        b_vector = np.vstack((np.real(freq_responses.T), np.imag(freq_responses.T)))
+
+        logging.info('A_matrix: condition number = {}'.format(np.linalg.cond(A_matrix)))
+
+        # solve least squares and obtain results as stack of real part vector and imaginary part vector
+        x_responses, residuals, rank, singular_vals = np.linalg.lstsq(A_matrix, b_vector, rcond=None)
 
+        for x in x_responses.T:
             i = 0
             zeros_response = []
             for pole in poles:
@@ -495,6 +451,38 @@ class VectorFitting:
 
         logging.info('\n### Vector fitting finished.\n')
 
+    @staticmethod
+    def _get_rational_basis(s, poles, freq_response=None):
+        """
+        Returns the coefficients of the sum of rational functions of the poles for all samples s_k (rows). Without
+        `freq_response`, these are the coefficients of the residues c; otherwise, they are the coefficients of the
+        residues c_res, weighted by the negative frequency response. Real poles have one column, complex poles of a
+        conjugated pair have two columns, for the real and imaginary parts of their residue.
+        """
+
+        is_real = np.imag(poles) == 0.0
+        n_cols = np.where(is_real, 1, 2)
+        cols = np.cumsum(n_cols) - n_cols
+        col_real = cols[is_real]
+        col_cmplx = cols[~is_real]
+
+        d_real = s[:, None] - poles[is_real]
+        d_cmplx = s[:, None] - poles[~is_real]
+        d_cmplx_conj = s[:, None] - np.conjugate(poles[~is_real])
+
+        A = np.empty((len(s), np.sum(n_cols)), dtype=complex)
+        # separate and stack real and imaginary part to preserve conjugacy of the pole pair
+        if freq_response is None:
+            A[:, col_real] = 1 / d_real
+            A[:, col_cmplx] = 1 / d_cmplx + 1 / d_cmplx_conj                # real part of residue
+            A[:, col_cmplx + 1] = 1j / d_cmplx - 1j / d_cmplx_conj          # imaginary part of residue
+        else:
+            h = freq_response[:, None]
+            A[:, col_real] = -1 * h / d_real
+            A[:, col_cmplx] = -1 * h / d_cmplx - h / d_cmplx_conj
+            A[:, col_cmplx + 1] = -1j * h / d_cmplx + 1j * h / d_cmplx_conj
+        return A
+
     def write_npz(self, path):
         """
         Writes the model parameters in :attr:`poles`, :attr:`zeros`,